@@ -0,0 +1,66 @@
+import time
+from argparse import ArgumentParser
+
+from interpreting.bytecode.vm import VirtualMachine
+from interpreting.values.basic_values import Value
+from interpreting.visitator import Visitator
+from lexer.lexer import StringLexer
+from parsing.parser import Parser
+
+COUNTING_LOOP_PROGRAM = """
+int counter = 0;
+double total = 0.0;
+while (counter < {size}) {{
+    total = total + counter * 0.5;
+    counter = counter + 1;
+}}
+total;
+"""
+
+ENGINE_FACTORIES = {
+    'visitor': Visitator,
+    'bytecode (boxed)': lambda: VirtualMachine(unbox=False),
+    'bytecode': VirtualMachine,
+}
+
+
+class ValueAllocationCounter:
+    """
+    Counts Value objects created while active by wrapping Value.__init__, which every value type calls.
+    """
+    def __init__(self):
+        self.allocations = 0
+        self.original_init = Value.__init__
+
+    def __enter__(self):
+        original_init = self.original_init
+
+        def counting_init(value, *args, **kwargs):
+            self.allocations += 1
+            original_init(value, *args, **kwargs)
+        Value.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc_info):
+        Value.__init__ = self.original_init
+
+
+def main(args):
+    program = COUNTING_LOOP_PROGRAM.format(size=args.size)
+    print(f'counting loop (size {args.size}):')
+    for engine_name, engine_factory in ENGINE_FACTORIES.items():
+        ast = Parser(StringLexer(program)).parse()
+        engine = engine_factory()
+        with ValueAllocationCounter() as counter:
+            start = time.perf_counter()
+            result = engine.perform_visiting(ast)
+            elapsed = time.perf_counter() - start
+        print(f'{engine_name:>17}: {counter.allocations} values allocated '
+              f'({counter.allocations / args.size:.1f} per iteration), {elapsed:.3f}s (result: {result})')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=100000, required=False)
+    args = parser.parse_args()
+    main(args)
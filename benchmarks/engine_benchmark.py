@@ -0,0 +1,80 @@
+import time
+from argparse import ArgumentParser
+
+from interpreting.interpreter import ENGINES, Interpreter
+from lexer.lexer import StringLexer
+from parsing.parser import Parser
+
+LOOP_PROGRAM = """
+int counter = 0;
+int total = 0;
+double distance = 0.0;
+while (counter < {size}) {{
+    total = total + counter * 2;
+    distance = distance + 0.5;
+    counter = counter + 1;
+}}
+total;
+"""
+
+CALL_PROGRAM = """
+function fib(n:int) -> int {{
+    if (n < 2) {{
+        return n;
+    }}
+    return fib(n - 1) + fib(n - 2);
+}}
+fib({size});
+"""
+
+MANY_FUNCTIONS_PROGRAM = ''.join(
+    f'function unused_{index}(a:int) -> int {{{{ return a; }}}}\n' for index in range(300)) + """
+function add(a:int, b:int) -> int {{
+    return a + b;
+}}
+int counter = 0;
+while (counter < {size}) {{
+    counter = add(counter, 1);
+}}
+counter;
+"""
+
+PROGRAMS = {
+    'loop': (LOOP_PROGRAM, 20000),
+    'call': (CALL_PROGRAM, 16),
+    'many functions': (MANY_FUNCTIONS_PROGRAM, 5000),
+}
+
+
+def parse(text):
+    return Parser(StringLexer(text)).parse()
+
+
+def time_engine(engine, ast, repeats):
+    best = None
+    result = None
+    for _ in range(repeats):
+        interpreter = Interpreter(engine)
+        start = time.perf_counter()
+        result = interpreter.interpret(ast)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main(args):
+    engines = args.engines or list(ENGINES)
+    for program_name, (program, size) in PROGRAMS.items():
+        ast = parse(program.format(size=size))
+        print(f'{program_name} (size {size}):')
+        for engine in engines:
+            result, elapsed = time_engine(engine, ast, args.repeats)
+            print(f'{engine:>10}: {elapsed:.3f}s (result: {result})')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--engines', type=str, nargs='*', choices=list(ENGINES), required=False)
+    parser.add_argument('--repeats', type=int, default=3, required=False)
+    args = parser.parse_args()
+    main(args)
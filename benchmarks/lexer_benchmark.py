@@ -0,0 +1,54 @@
+import re
+import time
+from argparse import ArgumentParser
+
+from lexer.lexer import LexerBase
+from lexer.regex2token import regex2token, keyword2token
+
+IDENTIFIERS = ['velocity', 'interval', 'iffy', 'doubled', 'integer', 'orbit', 'notes', 'unit_count', 'x', 'phys_dt']
+
+
+class PerKeywordRegexLexer(LexerBase):
+    """
+    Lexer with one `word(?![\\w\\d])` pattern per keyword tried before the identifier rule,
+    used as the baseline for comparison.
+    """
+    def __init__(self, source=None):
+        super().__init__(source)
+        alternatives = []
+        self.group2token = {}
+        keyword_patterns = {rf'{keyword}(?![\w\d])': token_type for keyword, token_type in keyword2token.items()}
+        for index, (regex, token_type) in enumerate({**keyword_patterns, **regex2token}.items()):
+            self.group2token[f'T{index}'] = token_type
+            alternatives.append(f'(?P<T{index}>{regex})')
+        self.master_regex = re.compile('|'.join(alternatives))
+
+
+def generate_lines(lines_amount):
+    lines = []
+    for row in range(lines_amount):
+        names = [IDENTIFIERS[(row + offset) % len(IDENTIFIERS)] for offset in range(4)]
+        lines.append(f'{names[0]} = {names[1]} + {names[2]} * {names[3]};\n')
+    return lines
+
+
+def time_lexing(lexer, lines):
+    start = time.perf_counter()
+    tokens_amount = 0
+    for line in lines:
+        tokens_amount += len(lexer._get_tokens_from_line(line))
+    return tokens_amount, time.perf_counter() - start
+
+
+def main(args):
+    lines = generate_lines(args.lines)
+    for name, lexer in (('per-keyword regex', PerKeywordRegexLexer()), ('keyword lookup', LexerBase())):
+        tokens_amount, elapsed = time_lexing(lexer, lines)
+        print(f'{name:>18}: {tokens_amount} tokens in {elapsed:.3f}s ({tokens_amount / elapsed:,.0f} tokens/s)')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--lines', type=int, default=50000, required=False)
+    args = parser.parse_args()
+    main(args)
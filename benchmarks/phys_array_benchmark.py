@@ -0,0 +1,59 @@
+import time
+from argparse import ArgumentParser
+
+from interpreting.interpreter import ENGINES, Interpreter
+from lexer.lexer import StringLexer
+from parsing.parser import Parser
+
+SCALAR_PROGRAM = """
+phys offset = 0.25&|m|;
+phys drift = 0.1&|m/s|;
+phys speed = 0.0&|m/s|;
+int sample = 0;
+while (sample < {size}) {{
+    speed = (1.5&|m| + offset) / 0.5&|s| - drift;
+    sample = sample + 1;
+}}
+speed;
+"""
+
+ARRAY_PROGRAM = """
+phys offset = 0.25&|m|;
+phys drift = 0.1&|m/s|;
+phys[] distances = [{distances}]&|m|;
+phys[] times = [{times}]&|s|;
+phys[] speeds = (distances + offset) / times - drift;
+speeds == speeds;
+"""
+
+
+def parse(text):
+    return Parser(StringLexer(text)).parse()
+
+
+def time_engine(engine, ast):
+    interpreter = Interpreter(engine)
+    start = time.perf_counter()
+    result = interpreter.interpret(ast)
+    return result, time.perf_counter() - start
+
+
+def main(args):
+    programs = {
+        'while loop over phys': SCALAR_PROGRAM.format(size=args.size),
+        'phys[] operations': ARRAY_PROGRAM.format(distances=', '.join(['1.5'] * args.size),
+                                                  times=', '.join(['0.5'] * args.size)),
+    }
+    for program_name, program in programs.items():
+        ast = parse(program)
+        print(f'{program_name} ({args.size} samples):')
+        for engine in ENGINES:
+            result, elapsed = time_engine(engine, ast)
+            print(f'{engine:>10}: {elapsed:.3f}s (result: {result})')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--size', type=int, default=20000, required=False)
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,72 @@
+import time
+from argparse import ArgumentParser
+
+from interpreting.interpreter import ENGINES, Interpreter
+from lexer.lexer import StringLexer
+from parsing.parser import Parser
+
+SUM_PROGRAM = """
+function sum_to(n:int) -> int {{
+    if (n == 0) {{
+        return 0;
+    }}
+    return n + sum_to(n - 1);
+}}
+sum_to({size});
+"""
+
+TAIL_PROGRAM = """
+function count_down(n:int, total:int) -> int {{
+    if (n == 0) {{
+        return total;
+    }}
+    return count_down(n - 1, total + n);
+}}
+count_down({size}, 0);
+"""
+
+ACKERMANN_PROGRAM = """
+function ack(m:int, n:int) -> int {{
+    if (m == 0) {{
+        return n + 1;
+    }}
+    if (n == 0) {{
+        return ack(m - 1, 1);
+    }}
+    return ack(m - 1, ack(m, n - 1));
+}}
+ack(2, {size});
+"""
+
+PROGRAMS = {
+    'deep sum': (SUM_PROGRAM, 20000),
+    'tail count down': (TAIL_PROGRAM, 50000),
+    'ackermann(2, n)': (ACKERMANN_PROGRAM, 100),
+}
+
+
+def time_engine(engine, ast):
+    interpreter = Interpreter(engine)
+    start = time.perf_counter()
+    try:
+        result = interpreter.interpret(ast)
+    except RecursionError:
+        result = 'RecursionError'
+    return result, time.perf_counter() - start
+
+
+def main(args):
+    engines = args.engines or list(ENGINES)
+    for program_name, (program, size) in PROGRAMS.items():
+        print(f'{program_name} (size {size}):')
+        for engine in engines:
+            ast = Parser(StringLexer(program.format(size=size))).parse()
+            result, elapsed = time_engine(engine, ast)
+            print(f'{engine:>10}: {elapsed:.3f}s (result: {result})')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--engines', type=str, nargs='*', choices=list(ENGINES), required=False)
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from interpreting.interpreter import ENGINES
+
+PROGRAMS = [
+    'int a = 2; a * 21;',
+    'phys v = 3&|m/s|; v * 2&|s|;',
+    """
+    function fib(n:int)->int{
+        if (n < 2){
+            return n;
+        }
+        return fib(n - 1) + fib(n - 2);
+    }
+    fib(12);
+    """,
+    """
+    int counter = 0;
+    while (counter < 200) {
+        counter = counter + 1;
+    }
+    counter;
+    """,
+]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def report(name, latencies, total_time):
+    latencies = sorted(latencies)
+    print(f'{name}: {len(latencies) / total_time:.1f} requests/s, '
+          f'p50 {percentile(latencies, 0.5) * 1000:.2f}ms, p99 {percentile(latencies, 0.99) * 1000:.2f}ms')
+
+
+def run_server_load(args):
+    server = subprocess.Popen([sys.executable, '-m', 'interpreting.server', '--engine', args.engine],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+    latencies = []
+    try:
+        start = time.perf_counter()
+        for request_id in range(args.requests):
+            request_start = time.perf_counter()
+            server.stdin.write(json.dumps({'id': request_id, 'source': PROGRAMS[request_id % len(PROGRAMS)]}) + '\n')
+            response = json.loads(server.stdout.readline())
+            latencies.append(time.perf_counter() - request_start)
+            if not response['ok']:
+                raise RuntimeError(f'Request {request_id} failed: {response["error"]}')
+        total_time = time.perf_counter() - start
+    finally:
+        server.stdin.close()
+        server.wait()
+    report('server', latencies, total_time)
+
+
+def run_process_per_script(args):
+    latencies = []
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index, program in enumerate(PROGRAMS):
+            paths.append(os.path.join(directory, f'program_{index}.txt'))
+            with open(paths[-1], 'w') as program_file:
+                program_file.write(program)
+        start = time.perf_counter()
+        for run in range(args.process_runs):
+            run_start = time.perf_counter()
+            subprocess.run([sys.executable, '-m', 'interpreting.interpreter', '--engine', args.engine,
+                            '--file_path', paths[run % len(paths)]], check=True, stdout=subprocess.DEVNULL)
+            latencies.append(time.perf_counter() - run_start)
+        total_time = time.perf_counter() - start
+    report('process per script', latencies, total_time)
+
+
+def main(args):
+    run_server_load(args)
+    if args.process_runs:
+        run_process_per_script(args)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000, required=False)
+    parser.add_argument('--process_runs', type=int, default=20, required=False)
+    parser.add_argument('--engine', type=str, choices=list(ENGINES), default='visitor')
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import tracemalloc
+from argparse import ArgumentParser
+
+from lexer.lexer import FileLexer
+from lexer.token.token_type import TokenType
+from lexer.token.tokens import BaseToken, ValueToken, Position
+
+TOKENS_PER_LINE = 7
+
+
+# Copies of Position, BaseToken and ValueToken as they were before __slots__, measured as the baseline.
+class UnslottedPosition:
+    def __init__(self, row, column):
+        self.row = row
+        self.column = column
+
+    def __repr__(self):
+        return f'({self.row}:{self.column})'
+
+    def print_location(self):
+        return f'({self.row}:{self.column})'
+
+    def copy(self):
+        return UnslottedPosition(self.row, self.column)
+
+
+class UnslottedBaseToken:
+    def __init__(self, type_: TokenType, pos_start: UnslottedPosition = None, pos_end: UnslottedPosition = None):
+        self.type = type_
+        self.pos_start = pos_start
+        self.pos_end = pos_end
+
+    def __repr__(self):
+        return self.type.as_string()
+
+    def __eq__(self, other):
+        return True if self.type == other.type else False
+
+    def print_location(self):
+        if self.pos_start is not None and self.pos_end is not None:
+            return f'Pos_start: {self.pos_start.print_location()} Pos_end: {self.pos_end.print_location()}'
+        return 'Unspecified position'
+
+
+class UnslottedValueToken(UnslottedBaseToken):
+    def __init__(self, type_: TokenType, value, pos_start: UnslottedPosition = None,
+                 pos_end: UnslottedPosition = None):
+        super().__init__(type_, pos_start, pos_end)
+        self.value = value
+
+    def __repr__(self):
+        return f'{self.type.as_string()}:{self.value}'
+
+    def __eq__(self, other):
+        if self.type == other.type and self.value == other.value:
+            return True
+        return False
+
+
+def generate_program(tokens_amount):
+    lines = []
+    for row in range(tokens_amount // TOKENS_PER_LINE):
+        lines.append(f'int var_{row} = {row} + x;\n')
+    return ''.join(lines)
+
+
+def clone_token(token, position_class, base_token_class, value_token_class):
+    pos_start = position_class(token.pos_start.row, token.pos_start.column)
+    pos_end = position_class(token.pos_end.row, token.pos_end.column)
+    if isinstance(token, ValueToken):
+        return value_token_class(token.type, token.value, pos_start, pos_end)
+    return base_token_class(token.type, pos_start, pos_end)
+
+
+def measure_bytes_per_token(tokens, position_class, base_token_class, value_token_class):
+    tracemalloc.start()
+    clones = [clone_token(token, position_class, base_token_class, value_token_class) for token in tokens]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / len(clones)
+
+
+def main(args):
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as program:
+        program.write(generate_program(args.tokens))
+    try:
+        tokens = FileLexer(program.name).all_tokens
+    finally:
+        os.remove(program.name)
+
+    before = measure_bytes_per_token(tokens, UnslottedPosition, UnslottedBaseToken, UnslottedValueToken)
+    after = measure_bytes_per_token(tokens, Position, BaseToken, ValueToken)
+    print(f'tokens: {len(tokens)}')
+    print(f'before (__dict__): {before:.1f} bytes per token')
+    print(f' after (__slots__): {after:.1f} bytes per token')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--tokens', type=int, default=1000000, required=False)
+    args = parser.parse_args()
+    main(args)
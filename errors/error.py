@@ -1,7 +1,29 @@
 import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from lexer.token.tokens import Position
 
+_exit_on_error = ContextVar('exit_on_error', default=True)
+
+
+@contextmanager
+def raising_errors():
+    """
+    Inside the block, language errors propagate as exceptions instead of being printed before exit().
+    """
+    token = _exit_on_error.set(False)
+    try:
+        yield
+    finally:
+        _exit_on_error.reset(token)
+
+
+def report_error(error):
+    if _exit_on_error.get():
+        error.print_error_and_exit()
+    raise error
+
 
 def run_with_exception_safety(func):
     @functools.wraps(func)
@@ -9,41 +31,76 @@ def run_with_exception_safety(func):
         result = None
         try:
             result = func(*args, **kwargs)
-        except (RunTimeError, InvalidSyntaxError, LexerError) as e:
-            e.print_error_and_exit()
+        except LanguageError as e:
+            report_error(e)
         return result
 
     return wrapper
 
 
-class LexerError(Exception):
-    def __init__(self, illegal_char, position: Position):
-        self.illegal_char = illegal_char
-        self.position = position
+class LanguageError(Exception):
+    """
+    Error in the interpreted program, reported at a position of its source.
+    """
+    kind = None
+
+    @property
+    def position(self) -> Position:
+        return self.pos_start
+
+    def describe(self):
+        location = self.position.print_location() if self.position is not None else '(unknown position)'
+        return f'Error: {self.message} at: {location}'
+
+    def get_traceback(self):
+        return None
+
+    def to_dict(self):
+        return {'kind': self.kind,
+                'message': self.message,
+                'row': self.position.row if self.position is not None else None,
+                'column': self.position.column if self.position is not None else None,
+                'traceback': self.get_traceback()}
 
     def print_error_and_exit(self):
-        print(f'Error: unexpected character: {self.illegal_char} at: {self.position.print_location()}')
+        print(self.describe())
         exit()
 
 
-class InvalidSyntaxError(Exception):
+class LexerError(LanguageError):
+    kind = 'lexer'
+
+    def __init__(self, illegal_char, position: Position):
+        super().__init__(illegal_char, position)
+        self.illegal_char = illegal_char
+        self.pos_start = position
+        self.message = f'unexpected character: {illegal_char}'
+
+
+class InvalidSyntaxError(LanguageError):
+    kind = 'syntax'
+
     def __init__(self, position: Position, message):
+        super().__init__(position, message)
         self.pos_start = position
         self.message = message
 
-    def print_error_and_exit(self):
-        print(f'Error: invalid syntax at: {self.pos_start.print_location()} {self.message}')
-        exit()
+    def describe(self):
+        location = self.position.print_location() if self.position is not None else '(unknown position)'
+        return f'Error: invalid syntax at: {location} {self.message}'
 
 
-class RunTimeError(Exception):
+class RunTimeError(LanguageError):
+    kind = 'runtime'
+
     def __init__(self, position: Position, message, context):
+        super().__init__(position, message, context)
         self.pos_start = position
         self.message = message
         self.context = context
 
     def print_error_and_exit(self):
-        print(f'Error: {self.message} at: {self.pos_start.print_location()}')
+        print(self.describe())
         print(self.get_traceback())
         exit()
 
@@ -53,10 +110,40 @@ class RunTimeError(Exception):
         context = self.context
 
         while True:
-            traceback = f'Line: {str(position.row)}, in {context.name}\n' + traceback
+            row = str(position.row) if position is not None else 'unknown'
+            traceback = f'Line: {row}, in {context.name}\n' + traceback
+            if context.replaced_frames:
+                traceback = context.replaced_frames.format_traceback() + traceback
             if context.parent:
                 context = context.parent
                 position = context.position
             else:
                 break
         return 'Traceback (most recent call last): \n' + traceback
+
+
+class InternalError(LanguageError):
+    """
+    Unexpected exception of the interpreter itself while running a program. Evaluator.evaluate_source returns it
+    like a language error, so a bug hit by one program does not escape into the process embedding the evaluator.
+    """
+    kind = 'internal'
+
+    def __init__(self, exception: Exception, position: Position = None):
+        super().__init__(exception, position)
+        self.exception = exception
+        self.pos_start = position
+        self.message = f'{type(exception).__name__}: {exception}'
+
+
+class OperationError(Exception):
+    """
+    Raised by value operations, which do not know where their operands come from.
+    Interpreters turn it into a RunTimeError at the position of the left operand, or of the right one if on_right.
+    """
+    def __init__(self, message, on_right=False):
+        self.message = message
+        self.on_right = on_right
+
+    def at(self, left_position: Position, right_position: Position, context):
+        return RunTimeError(right_position if self.on_right else left_position, self.message, context)
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+AST_FORMAT_VERSION = 4
+GRAMMAR_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'parsing', 'grammar.txt')
+
+
+def _grammar_fingerprint():
+    with open(GRAMMAR_PATH, 'rb') as grammar:
+        return hashlib.sha256(grammar.read()).hexdigest()
+
+
+class AstCache:
+    """
+    Stores parsed ASTs on disk under a hash of the source text, the AST format version and the grammar.
+    Entries that cannot be read back are treated as misses and get overwritten.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.version_key = f'{AST_FORMAT_VERSION}:{pickle.HIGHEST_PROTOCOL}:{_grammar_fingerprint()}'.encode()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def load(self, source):
+        entry_path = self._entry_path(source)
+        try:
+            with open(entry_path, 'rb') as entry:
+                data = entry.read()
+        except OSError:
+            return None
+        try:
+            return pickle.loads(data)
+        except Exception:
+            # a truncated or corrupt entry can fail in many ways, drop it so the next store writes it again
+            self._remove_file(entry_path)
+            return None
+
+    def store(self, source, ast):
+        if ast is None:
+            return
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as entry:
+                pickle.dump(ast, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(source))
+        except (OSError, pickle.PicklingError, RecursionError):
+            # an AST that cannot be cached is parsed again next time, the evaluation itself goes on
+            self._remove_file(temp_path)
+        except BaseException:
+            self._remove_file(temp_path)
+            raise
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entry_path(self, source):
+        key = hashlib.sha256(self.version_key + b'\0' + source).hexdigest()
+        return os.path.join(self.cache_dir, f'{key}.ast')
+
+
+class MemoryAstCache:
+    """
+    Keeps pickled ASTs of recently evaluated sources in memory, for processes that evaluate many programs.
+    Every load unpickles a new copy, since interpreting a program annotates its AST.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def load(self, source):
+        entry = self.entries.get(source)
+        if entry is None:
+            return None
+        self.entries.move_to_end(source)
+        return pickle.loads(entry)
+
+    def store(self, source, ast):
+        if ast is None:
+            return
+        try:
+            self.entries[source] = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError):
+            return
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
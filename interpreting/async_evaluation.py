@@ -0,0 +1,51 @@
+import asyncio
+
+from errors.error import LanguageError, raising_errors
+from interpreting.bytecode.vm import VirtualMachine
+from interpreting.interpreter import Result
+from interpreting.optimizer import AstOptimizer
+from lexer.lexer import StringLexer
+from parsing.parser import Parser
+
+DEFAULT_SLICE_STEPS = 1000
+
+
+async def evaluate(text, step_budget=None, timeout=None, slice_steps=DEFAULT_SLICE_STEPS, memoize=False,
+                   optimize=True) -> Result:
+    """
+    Runs a program given as text on its own VirtualMachine and yields to the event loop after every
+    slice_steps steps, so one event loop can interleave many programs. A step is one loop iteration or one
+    function call. The program is stopped with a RunTimeError when it takes more than step_budget steps
+    or runs longer than timeout seconds. Cancelling the task stops the program at its next slice.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout is not None else None
+    with raising_errors():
+        try:
+            ast = Parser(StringLexer(text)).parse()
+            if ast is None:
+                return Result()
+            if optimize:
+                ast = AstOptimizer().optimize(ast)
+            vm = VirtualMachine(memoize=memoize)
+            execution = vm.execute(vm.compile(ast, checkpoints=True))
+        except LanguageError as error:
+            return Result(error=error)
+        steps = 0
+        stop_message = None
+        try:
+            while True:
+                execution.send(stop_message)
+                steps += 1
+                if step_budget is not None and steps > step_budget:
+                    stop_message = f'Step budget of {step_budget} exceeded.'
+                elif steps % slice_steps == 0:
+                    await asyncio.sleep(0)
+                    if deadline is not None and loop.time() > deadline:
+                        stop_message = f'Deadline of {timeout}s exceeded.'
+        except StopIteration as stop:
+            return Result(stop.value)
+        except LanguageError as error:
+            return Result(error=error)
+        finally:
+            execution.close()
@@ -0,0 +1,125 @@
+import glob
+import json
+import os
+import signal
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from interpreting.interpreter import ENGINES, Evaluator
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CHUNK_SIZE = 8
+
+_evaluator = None
+# SIGALRM only interrupts the script while this is set, so a late alarm cannot escape from evaluate_file
+_timer_armed = False
+
+
+class ScriptTimeout(BaseException):
+    # not an Exception, so Evaluator.evaluate_source does not return it as an internal error of the program
+    pass
+
+
+def collect_paths(patterns):
+    """
+    Expands directories to the .txt files below them and everything else as a glob pattern.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, '**', '*.txt'), recursive=True)))
+        else:
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+    return paths
+
+
+def init_worker(engine, memoize, optimize):
+    global _evaluator
+    _evaluator = Evaluator(engine=engine, memoize=memoize, optimize=optimize)
+
+
+def evaluate_files(paths, timeout):
+    return [evaluate_file(path, timeout) for path in paths]
+
+
+def evaluate_file(path, timeout):
+    """
+    Evaluates one script with the warm evaluator of this worker. The timeout is enforced with SIGALRM,
+    which interrupts the interpreter loop of the worker's main thread.
+    """
+    global _timer_armed
+    start = time.perf_counter()
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    try:
+        try:
+            _timer_armed = True
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+            with open(path, encoding='utf-8') as source_file:
+                text = source_file.read()
+            result = _evaluator.evaluate_source(text).to_dict()
+        finally:
+            _timer_armed = False
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except ScriptTimeout:
+        result = {'ok': False, 'error': {'kind': 'timeout', 'message': f'Timed out after {timeout}s.'}}
+    except Exception as e:
+        result = {'ok': False, 'error': {'kind': 'internal', 'message': f'{type(e).__name__}: {e}'}}
+    finally:
+        signal.signal(signal.SIGALRM, previous_handler)
+    return {'path': path, **result, 'seconds': round(time.perf_counter() - start, 6)}
+
+
+def _raise_timeout(signum, frame):
+    if _timer_armed:
+        raise ScriptTimeout()
+
+
+def run_batch(paths, workers=None, timeout=DEFAULT_TIMEOUT, chunk_size=DEFAULT_CHUNK_SIZE, engine='visitor',
+              memoize=False, optimize=True):
+    """
+    Fans the scripts out over a process pool in chunks and yields their results in completion order.
+    """
+    chunks = [paths[index:index + chunk_size] for index in range(0, len(paths), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(engine, memoize, optimize)) as executor:
+        futures = {executor.submit(evaluate_files, chunk, timeout): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except BrokenProcessPool as e:
+                # a crashed worker breaks the pool, every unfinished chunk is reported as failed
+                for path in futures[future]:
+                    yield {'path': path, 'ok': False, 'error': {'kind': 'internal', 'message': f'Worker crashed: {e}'},
+                           'seconds': None}
+
+
+def main(args):
+    paths = collect_paths(args.paths)
+    start = time.perf_counter()
+    counts = {'ok': 0, 'error': 0, 'timeout': 0}
+    for result in run_batch(paths, args.workers, args.timeout, args.chunk_size, args.engine, args.memoize,
+                            not args.no_optimize):
+        if result['ok']:
+            counts['ok'] += 1
+        else:
+            counts['timeout' if result['error']['kind'] == 'timeout' else 'error'] += 1
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+    print(f'{len(paths)} scripts in {time.perf_counter() - start:.2f}s: {counts["ok"]} ok, '
+          f'{counts["error"]} failed, {counts["timeout"]} timed out', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('paths', type=str, nargs='+')
+    parser.add_argument('--workers', type=int, default=None, required=False)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, required=False)
+    parser.add_argument('--chunk_size', type=int, default=DEFAULT_CHUNK_SIZE, required=False)
+    parser.add_argument('--engine', type=str, choices=list(ENGINES), default='visitor')
+    parser.add_argument('--memoize', action='store_true')
+    parser.add_argument('--no_optimize', action='store_true')
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,371 @@
+import operator
+from array import array
+
+from errors.error import RunTimeError, OperationError
+from interpreting.bytecode.opcodes import OpCode
+from interpreting.utils import BINARY_OPERATIONS
+from interpreting.values.basic_values import DoubleValue, StringValue, int_value, bool_value
+from interpreting.values.function_values import FunctionArgument
+from interpreting.values.keyword_values import KeywordValue
+from interpreting.values.physical_values import UnitValue, PhysArrayValue
+from lexer.token.token_type import TokenType
+from parsing import nodes
+from parsing.nodes import *
+
+COMPILE_METHOD_PREFIX = '_compile_'
+
+RAW_ARITHMETIC_OPERATIONS = {
+    TokenType.T_PLUS: operator.add,
+    TokenType.T_MINUS: operator.sub,
+    TokenType.T_MUL: operator.mul,
+}
+
+RAW_COMPARISONS = {
+    TokenType.T_LESS: operator.lt,
+    TokenType.T_LESS_OR_EQ: operator.le,
+    TokenType.T_GREATER: operator.gt,
+    TokenType.T_GREATER_OR_EQ: operator.ge,
+    TokenType.T_EQ: operator.eq,
+    TokenType.T_NOT_EQ: operator.ne,
+}
+
+NUMBER_TYPES = ('int', 'double')
+VALUE_TYPES = {'int': int_value, 'double': DoubleValue, 'bool': bool_value}
+
+
+class CodeObject:
+    """
+    Compiled body of the program or of one function.
+    opcodes and arguments are parallel arrays indexed by pc, positions maps every pc to (pos_start, pos_end)
+    of the node the instruction was compiled from.
+    """
+    def __init__(self, name, frame_size=0, argument_slots=(), slot_types=None):
+        self.name = name
+        self.frame_size = frame_size
+        self.slot_names = [None] * frame_size
+        self.argument_slots = list(argument_slots)
+        # slots holding raw int/float instead of Values
+        self.slot_types = slot_types or {}
+        self.opcodes = array('B')
+        self.arguments = array('i')
+        self.positions = []
+        self.constants = []
+        self.constant_indices = {}
+        # divisor positions of BINARY_OP instructions, used to report division by zero
+        self.right_operand_positions = {}
+
+    def emit(self, opcode: OpCode, argument=0, node=None):
+        self.opcodes.append(opcode)
+        self.arguments.append(argument)
+        self.positions.append((node.pos_start, node.pos_end) if node else (None, None))
+        return len(self.opcodes) - 1
+
+    def add_constant(self, constant):
+        try:
+            key = (type(constant), constant)
+            hash(key)
+        except TypeError:
+            key = id(constant)
+        if key not in self.constant_indices:
+            self.constant_indices[key] = len(self.constants)
+            self.constants.append(constant)
+        return self.constant_indices[key]
+
+    def add_value(self, value_type, raw_value):
+        key = (value_type, type(raw_value), raw_value)
+        if key not in self.constant_indices:
+            self.constant_indices[key] = len(self.constants)
+            self.constants.append(value_type(raw_value))
+        return self.constant_indices[key]
+
+    def patch_jump(self, pc, target=None):
+        self.arguments[pc] = len(self.opcodes) if target is None else target
+
+    def disassemble(self):
+        lines = [f'<code {self.name}>']
+        for pc, (opcode, argument) in enumerate(zip(self.opcodes, self.arguments)):
+            pos_start = self.positions[pc][0]
+            location = pos_start.print_location() if pos_start else ''
+            lines.append(f'{pc:>5} {OpCode(opcode).name:<14}{argument:>5} {location}')
+        return '\n'.join(lines)
+
+
+class Loop:
+    def __init__(self, start):
+        self.start = start
+        self.break_jumps = []
+
+
+class BytecodeCompiler:
+    """
+    Compiles the AST into CodeObjects run by VirtualMachine.
+    Every statement leaves exactly one value on the stack, which mirrors the statement results of Visitator.
+    Expressions over numeric literals and unboxed slots are compiled to RAW_ instructions working on Python numbers,
+    which get boxed into Values only where a Value is needed: statement results, function arguments and returns,
+    phys literals and operations on other types.
+    With checkpoints every loop iteration and every function entry starts with a CHECKPOINT instruction,
+    where VirtualMachine.execute suspends so the caller can interleave programs and stop runaway ones.
+    """
+    def __init__(self, context=None, unbox=True, checkpoints=False):
+        self.context = context
+        self.unbox = unbox
+        self.checkpoints = checkpoints
+        self.compile_methods = self._build_compile_methods()
+        self.loops = []
+        self.function_depth = 0
+
+    def compile(self, ast_root, name='<main>', frame_size=None, argument_slots=(), slot_types=None):
+        if frame_size is None:
+            frame_size, slot_types = ast_root.frame_size, ast_root.slot_types
+        code = CodeObject(name, frame_size or 0, argument_slots, slot_types if self.unbox else None)
+        if self.checkpoints and self.function_depth:
+            code.emit(OpCode.CHECKPOINT, node=ast_root)
+        self._compile(ast_root, code)
+        code.emit(OpCode.RETURN, node=ast_root)
+        return code
+
+    def _build_compile_methods(self):
+        compile_methods = {}
+        for method_name in dir(type(self)):
+            if method_name.startswith(COMPILE_METHOD_PREFIX):
+                node_type = getattr(nodes, method_name[len(COMPILE_METHOD_PREFIX):], None)
+                if isinstance(node_type, type):
+                    compile_methods[node_type] = getattr(self, method_name)
+        return compile_methods
+
+    def _compile(self, node, code: CodeObject):
+        compile_method = self.compile_methods.get(type(node))
+        if compile_method is None:
+            raise RunTimeError(node.pos_start, f'Could not find method for node: {type(node).__name__}',
+                               self.context)
+        compile_method(node, code)
+
+    def _compile_IntNode(self, node: IntNode, code: CodeObject):
+        code.emit(OpCode.LOAD_CONST, code.add_value(int_value, node.token.value), node)
+
+    def _compile_DoubleNode(self, node: DoubleNode, code: CodeObject):
+        code.emit(OpCode.LOAD_CONST, code.add_value(DoubleValue, node.token.value), node)
+
+    def _compile_StringNode(self, node: StringNode, code: CodeObject):
+        code.emit(OpCode.LOAD_CONST, code.add_value(StringValue, node.token.value), node)
+
+    def _compile_BoolNode(self, node: BoolNode, code: CodeObject):
+        code.emit(OpCode.LOAD_CONST, code.add_value(bool_value, node.token.type == TokenType.T_TRUE), node)
+
+    def _compile_StatementsNode(self, node: StatementsNode, code: CodeObject):
+        if not node.statements:
+            code.emit(OpCode.LOAD_CONST, code.add_constant(None))
+        for index, statement in enumerate(node.statements):
+            if index:
+                code.emit(OpCode.POP)
+            self._compile(statement, code)
+
+    def _get_raw_type(self, node, code: CodeObject):
+        """
+        Returns the type of the raw Python value the node compiles to with _compile_raw, None if it needs Values.
+        """
+        if isinstance(node, IntNode):
+            return 'int'
+        if isinstance(node, DoubleNode):
+            return 'double'
+        if isinstance(node, VariableAccessNode):
+            return code.slot_types.get(node.slot)
+        if isinstance(node, UnaryOperationNode):
+            operand_type = self._get_raw_type(node.node, code)
+            if node.operation.type in (TokenType.T_MINUS, TokenType.T_PLUS) and operand_type in NUMBER_TYPES:
+                return operand_type
+            return None
+        if isinstance(node, BinaryOperationNode):
+            left_type = self._get_raw_type(node.left, code)
+            if left_type not in NUMBER_TYPES:
+                return None
+            right_type = self._get_raw_type(node.right, code)
+            if right_type not in NUMBER_TYPES:
+                return None
+            if node.operation.type in RAW_COMPARISONS:
+                return 'bool'
+            if node.operation.type in RAW_ARITHMETIC_OPERATIONS or node.operation.type == TokenType.T_DIV:
+                return 'int' if left_type == right_type == 'int' else 'double'
+        return None
+
+    def _compile_raw(self, node, code: CodeObject):
+        if isinstance(node, (IntNode, DoubleNode)):
+            code.emit(OpCode.LOAD_CONST, code.add_constant(node.token.value), node)
+        elif isinstance(node, VariableAccessNode):
+            code.slot_names[node.slot] = node.name.value
+            code.emit(OpCode.LOAD_RAW_SLOT, node.slot, node)
+        elif isinstance(node, UnaryOperationNode):
+            self._compile_raw(node.node, code)
+            if node.operation.type == TokenType.T_MINUS:
+                code.emit(OpCode.RAW_NEGATE, node=node)
+        else:
+            self._compile_raw(node.left, code)
+            self._compile_raw(node.right, code)
+            operation_type = node.operation.type
+            if operation_type == TokenType.T_DIV:
+                is_int_division = self._get_raw_type(node, code) == 'int'
+                operation = operator.floordiv if is_int_division else operator.truediv
+                # division by zero is reported at the divisor like IntValue.divide does
+                code.emit(OpCode.RAW_BINARY_OP, code.add_constant(operation), node.right)
+            else:
+                operation = RAW_ARITHMETIC_OPERATIONS.get(operation_type) or RAW_COMPARISONS[operation_type]
+                code.emit(OpCode.RAW_BINARY_OP, code.add_constant(operation), node)
+
+    def _compile_boxed(self, node, raw_type, code: CodeObject):
+        self._compile_raw(node, code)
+        code.emit(OpCode.BOX, code.add_constant(VALUE_TYPES[raw_type]), node)
+
+    def _compile_condition(self, node, code: CodeObject):
+        if self._get_raw_type(node, code):
+            self._compile_raw(node, code)
+            return code.emit(OpCode.JUMP_IF_FALSE_RAW, node=node)
+        self._compile(node, code)
+        return code.emit(OpCode.JUMP_IF_FALSE, node=node)
+
+    def _compile_UnaryOperationNode(self, node: UnaryOperationNode, code: CodeObject):
+        raw_type = self._get_raw_type(node, code)
+        if raw_type:
+            self._compile_boxed(node, raw_type, code)
+            return
+        self._compile(node.node, code)
+        if node.operation.type == TokenType.T_MINUS:
+            code.emit(OpCode.NEGATE, node=node.node)
+        elif node.operation.type == TokenType.T_NOT:
+            code.emit(OpCode.NOT, node=node.node)
+
+    def _compile_BinaryOperationNode(self, node: BinaryOperationNode, code: CodeObject):
+        raw_type = self._get_raw_type(node, code)
+        if raw_type:
+            self._compile_boxed(node, raw_type, code)
+            return
+        self._compile(node.left, code)
+        self._compile(node.right, code)
+        pc = code.emit(OpCode.BINARY_OP, code.add_constant(BINARY_OPERATIONS[node.operation.type]), node)
+        code.right_operand_positions[pc] = node.right.pos_start
+
+    def _compile_VariableAccessNode(self, node: VariableAccessNode, code: CodeObject):
+        if node.slot is None:
+            code.emit(OpCode.LOAD_VAR, code.add_constant(node.name), node)
+        elif node.slot in code.slot_types:
+            self._compile_boxed(node, code.slot_types[node.slot], code)
+        else:
+            code.slot_names[node.slot] = node.name.value
+            code.emit(OpCode.LOAD_SLOT, node.slot, node)
+
+    def _compile_VariableAssignmentNode(self, node: VariableAssignmentNode, code: CodeObject):
+        slot_type = code.slot_types.get(node.slot)
+        if slot_type:
+            code.slot_names[node.slot] = node.name.value
+            if self._get_raw_type(node.value, code) == slot_type:
+                self._compile_raw(node.value, code)
+                code.emit(OpCode.STORE_RAW_SLOT, code.add_constant((node.slot, node.name, node.type is not None)),
+                          node)
+            else:
+                self._compile(node.value, code)
+                code.emit(OpCode.STORE_UNBOXED_SLOT, code.add_constant((node.slot, node.name, node.type,
+                                                                        node.check_type, VALUE_TYPES[slot_type],
+                                                                        node.value.pos_start)), node)
+            return
+        self._compile(node.value, code)
+        if node.slot is None:
+            code.emit(OpCode.STORE_VAR, code.add_constant((node.name, node.type, node.value.pos_start)), node)
+        else:
+            code.slot_names[node.slot] = node.name.value
+            code.emit(OpCode.STORE_SLOT, code.add_constant((node.slot, node.name, node.type, node.check_type,
+                                                            node.value.pos_start)), node)
+
+    def _compile_IfNode(self, node: IfNode, code: CodeObject):
+        end_jumps = []
+        for condition, statement in node.cases:
+            next_case_jump = self._compile_condition(condition, code)
+            self._compile(statement, code)
+            end_jumps.append(code.emit(OpCode.JUMP))
+            code.patch_jump(next_case_jump)
+        if node.else_case:
+            self._compile(node.else_case, code)
+        else:
+            code.emit(OpCode.LOAD_CONST, code.add_constant(None))
+        for jump in end_jumps:
+            code.patch_jump(jump)
+
+    def _compile_WhileNode(self, node: WhileNode, code: CodeObject):
+        loop = Loop(start=len(code.opcodes))
+        self.loops.append(loop)
+        if self.checkpoints:
+            code.emit(OpCode.CHECKPOINT, node=node)
+        exit_jump = self._compile_condition(node.condition_node, code)
+        self._compile(node.body_node, code)
+        code.emit(OpCode.POP)
+        code.emit(OpCode.JUMP, loop.start)
+        self.loops.pop()
+        code.patch_jump(exit_jump)
+        for jump in loop.break_jumps:
+            code.patch_jump(jump)
+        code.emit(OpCode.LOAD_CONST, code.add_constant(None))
+
+    def _compile_KeywordNode(self, node: KeywordNode, code: CodeObject):
+        if not self.loops:
+            # outside of a loop the keyword ends the enclosing function like in Visitator
+            code.emit(OpCode.LOAD_CONST, code.add_value(KeywordValue, node.value), node)
+            code.emit(OpCode.RETURN, node=node)
+        elif node.value == 'break':
+            self.loops[-1].break_jumps.append(code.emit(OpCode.JUMP, node=node))
+        else:
+            code.emit(OpCode.JUMP, self.loops[-1].start, node)
+
+    def _compile_ReturnNode(self, node: ReturnNode, code: CodeObject):
+        if isinstance(node.node, CallFunctionNode) and self.function_depth:
+            # call in tail position replaces the current frame instead of growing the frame stack
+            self._compile_call(node.node, code, OpCode.TAIL_CALL)
+            return
+        if node.node:
+            self._compile(node.node, code)
+        else:
+            code.emit(OpCode.LOAD_CONST, code.add_constant(None))
+        code.emit(OpCode.RETURN, node=node)
+
+    def _compile_FunctionDefinitionNode(self, node: FunctionDefinitionNode, code: CodeObject):
+        enclosing_loops, self.loops = self.loops, []
+        argument_slots = [argument.slot for argument in node.arguments]
+        self.function_depth += 1
+        body = self.compile(node.body, node.function_name.value, node.frame_size, argument_slots, node.slot_types)
+        self.function_depth -= 1
+        for argument in node.arguments:
+            if argument.slot is not None:
+                body.slot_names[argument.slot] = argument.name.value
+        self.loops = enclosing_loops
+        arguments = [FunctionArgument(argument.name.value, argument.type.type) for argument in node.arguments]
+        code.emit(OpCode.MAKE_FUNCTION, code.add_constant((node.function_name.value, arguments, body,
+                                                           node.return_type_node, node.is_pure)), node)
+
+    def _compile_CallFunctionNode(self, node: CallFunctionNode, code: CodeObject):
+        self._compile_call(node, code, OpCode.CALL)
+
+    def _compile_call(self, node: CallFunctionNode, code: CodeObject, opcode: OpCode):
+        for argument in node.arguments:
+            self._compile(argument, code)
+        code.emit(opcode, code.add_constant((node.function_name, len(node.arguments))), node)
+
+    def _compile_UnitNode(self, node: UnitNode, code: CodeObject):
+        code.emit(OpCode.LOAD_CONST, code.add_constant(UnitValue(node.fraction)), node)
+
+    def _compile_PhysNode(self, node: PhysNode, code: CodeObject):
+        self._compile(node.unit, code)
+        self._compile(node.value, code)
+        code.emit(OpCode.MAKE_PHYS, node=node)
+
+    def _compile_PhysArrayNode(self, node: PhysArrayNode, code: CodeObject):
+        if all(isinstance(element, (IntNode, DoubleNode)) for element in node.elements):
+            elements = [DoubleValue(element.token.value) for element in node.elements]
+            try:
+                phys_array = PhysArrayValue.from_values(elements, UnitValue(node.unit.fraction))
+            except OperationError:
+                # without numpy the literal is left to fail when it is evaluated, like any other phys[]
+                phys_array = None
+            if phys_array is not None:
+                code.emit(OpCode.LOAD_CONST, code.add_constant(phys_array), node)
+                return
+        for element in node.elements:
+            self._compile(element, code)
+        self._compile(node.unit, code)
+        code.emit(OpCode.MAKE_PHYS_ARRAY, len(node.elements), node)
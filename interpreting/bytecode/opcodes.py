@@ -0,0 +1,36 @@
+from enum import IntEnum, auto
+
+
+class OpCode(IntEnum):
+    # stack
+    LOAD_CONST = auto()
+    POP = auto()
+
+    # variables
+    LOAD_VAR = auto()
+    STORE_VAR = auto()
+    LOAD_SLOT = auto()
+    STORE_SLOT = auto()
+    LOAD_RAW_SLOT = auto()
+    STORE_RAW_SLOT = auto()
+    STORE_UNBOXED_SLOT = auto()
+
+    # operations
+    BINARY_OP = auto()
+    NEGATE = auto()
+    NOT = auto()
+    MAKE_PHYS = auto()
+    MAKE_PHYS_ARRAY = auto()
+    RAW_BINARY_OP = auto()
+    RAW_NEGATE = auto()
+    BOX = auto()
+
+    # control flow
+    JUMP = auto()
+    JUMP_IF_FALSE = auto()
+    JUMP_IF_FALSE_RAW = auto()
+    MAKE_FUNCTION = auto()
+    CALL = auto()
+    TAIL_CALL = auto()
+    RETURN = auto()
+    CHECKPOINT = auto()
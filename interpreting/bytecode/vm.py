@@ -0,0 +1,312 @@
+from errors.error import RunTimeError, OperationError, run_with_exception_safety
+from interpreting.bytecode.compiler import BytecodeCompiler, CodeObject
+from interpreting.bytecode.opcodes import OpCode
+from interpreting.context import Context, ContextManager, ReplacedFrames
+from interpreting.memoization import MISSING, FunctionResultCache
+from interpreting.resolver import Resolver
+from interpreting.utils import check_argument_correctness, check_return_type, check_slot_assignment
+from interpreting.values.basic_values import int_value
+from interpreting.values.function_values import FunctionDefinition
+from interpreting.values.physical_values import PhysValue, PhysArrayValue
+
+MINUS_ONE = int_value(-1)
+# result cache keys kept by a frame replaced through tail calls, the chain shares one result
+MAX_TAIL_CALL_CACHE_KEYS = 16
+
+LOAD_CONST = OpCode.LOAD_CONST.value
+POP = OpCode.POP.value
+LOAD_VAR = OpCode.LOAD_VAR.value
+STORE_VAR = OpCode.STORE_VAR.value
+LOAD_SLOT = OpCode.LOAD_SLOT.value
+STORE_SLOT = OpCode.STORE_SLOT.value
+LOAD_RAW_SLOT = OpCode.LOAD_RAW_SLOT.value
+STORE_RAW_SLOT = OpCode.STORE_RAW_SLOT.value
+STORE_UNBOXED_SLOT = OpCode.STORE_UNBOXED_SLOT.value
+BINARY_OP = OpCode.BINARY_OP.value
+NEGATE = OpCode.NEGATE.value
+NOT = OpCode.NOT.value
+MAKE_PHYS = OpCode.MAKE_PHYS.value
+MAKE_PHYS_ARRAY = OpCode.MAKE_PHYS_ARRAY.value
+RAW_BINARY_OP = OpCode.RAW_BINARY_OP.value
+RAW_NEGATE = OpCode.RAW_NEGATE.value
+BOX = OpCode.BOX.value
+JUMP = OpCode.JUMP.value
+JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+JUMP_IF_FALSE_RAW = OpCode.JUMP_IF_FALSE_RAW.value
+MAKE_FUNCTION = OpCode.MAKE_FUNCTION.value
+CALL = OpCode.CALL.value
+TAIL_CALL = OpCode.TAIL_CALL.value
+RETURN = OpCode.RETURN.value
+CHECKPOINT = OpCode.CHECKPOINT.value
+
+
+class Frame:
+    def __init__(self, code: CodeObject, function: FunctionDefinition = None, return_checks=()):
+        self.code = code
+        self.function = function
+        # functions whose return type the result must match, more than one after tail calls
+        self.return_checks = return_checks
+        # result cache keys of the pure calls this frame returns for, the outermost ones and the innermost one
+        self.cache_keys = None
+        self.pc = 0
+        self.stack = []
+        self.slots = [None] * code.frame_size
+
+
+class VirtualMachine:
+    """
+    Stack based engine running CodeObjects produced by BytecodeCompiler.
+    Function calls push a Frame on an explicit frame stack instead of recursing on the Python stack,
+    so recursion depth is not limited by Python, and calls in tail position reuse the frame stack slot.
+    Semantics follow Visitator, which stays as the reference implementation. Tracebacks still show the functions
+    which returned through a tail call, but repeated calls from one line are condensed into a single line and only
+    the innermost MAX_REPLACED_FRAMES replaced frames are listed.
+    """
+    def __init__(self, memoize=False, unbox=True):
+        self.context_manager = ContextManager()
+        self.unbox = unbox
+        self.function_cache = FunctionResultCache() if memoize else None
+
+    @run_with_exception_safety
+    def perform_visiting(self, ast_root):
+        return self.run(self.compile(ast_root))
+
+    def compile(self, ast_root, checkpoints=False) -> CodeObject:
+        context = self.context_manager.current_context
+        if self.function_cache:
+            self.function_cache.analyze(ast_root)
+        Resolver(context).resolve(ast_root)
+        return BytecodeCompiler(context, self.unbox, checkpoints).compile(ast_root)
+
+    def run(self, code: CodeObject):
+        execution = self.execute(code)
+        try:
+            while True:
+                next(execution)
+        except StopIteration as stop:
+            return stop.value
+
+    def execute(self, code: CodeObject):
+        """
+        Generator running the code, which suspends at every CHECKPOINT instruction and returns the program result.
+        Sending a message into the suspended execution stops the program with a RunTimeError carrying that message.
+        """
+        context_manager = self.context_manager
+        function_cache = self.function_cache
+        frames = []
+        frame = Frame(code)
+        opcodes, arguments, constants, positions = code.opcodes, code.arguments, code.constants, code.positions
+        stack = frame.stack
+        slots = frame.slots
+        pc = 0
+        while True:
+            opcode = opcodes[pc]
+            argument = arguments[pc]
+            pc += 1
+            try:
+                if opcode == LOAD_RAW_SLOT:
+                    value = slots[argument]
+                    if value is None:
+                        raise RunTimeError(positions[pc - 1][0], f'{frame.code.slot_names[argument]} not defined.',
+                                           context_manager.current_context)
+                    stack.append(value)
+                elif opcode == RAW_BINARY_OP:
+                    right = stack.pop()
+                    stack[-1] = constants[argument](stack[-1], right)
+                elif opcode == STORE_RAW_SLOT:
+                    slot, variable_name, is_declaration = constants[argument]
+                    if not is_declaration and slots[slot] is None:
+                        raise RunTimeError(variable_name.pos_start, f'{variable_name.value} not defined.',
+                                           context_manager.current_context)
+                    slots[slot] = stack.pop()
+                    stack.append(None)
+                elif opcode == JUMP_IF_FALSE_RAW:
+                    if not stack.pop():
+                        pc = argument
+                elif opcode == BOX:
+                    stack[-1] = constants[argument](stack[-1])
+                elif opcode == RAW_NEGATE:
+                    stack[-1] = -stack[-1]
+                elif opcode == LOAD_SLOT:
+                    value = slots[argument]
+                    if value is None:
+                        raise RunTimeError(positions[pc - 1][0], f'{frame.code.slot_names[argument]} not defined.',
+                                           context_manager.current_context)
+                    stack.append(value)
+                elif opcode == STORE_SLOT:
+                    slot, variable_name, variable_type, check_type, value_position = constants[argument]
+                    value = stack.pop()
+                    check_slot_assignment(variable_name, slots[slot], value, value_position, variable_type, check_type,
+                                          context_manager.current_context)
+                    slots[slot] = value
+                    stack.append(None)
+                elif opcode == STORE_UNBOXED_SLOT:
+                    slot, variable_name, variable_type, check_type, value_type, value_position = constants[argument]
+                    value = stack.pop()
+                    current_value = slots[slot]
+                    if current_value is not None:
+                        current_value = value_type(current_value)
+                    check_slot_assignment(variable_name, current_value, value, value_position, variable_type,
+                                          check_type, context_manager.current_context)
+                    slots[slot] = value.value if value is not None else None
+                    stack.append(None)
+                elif opcode == LOAD_VAR:
+                    stack.append(context_manager.get_variable(constants[argument]))
+                elif opcode == BINARY_OP:
+                    right = stack.pop()
+                    stack[-1] = getattr(stack[-1], constants[argument])(right)
+                elif opcode == JUMP_IF_FALSE:
+                    if not stack.pop().value:
+                        pc = argument
+                elif opcode == JUMP:
+                    pc = argument
+                elif opcode == POP:
+                    stack.pop()
+                elif opcode == STORE_VAR:
+                    variable_name, variable_type, value_position = constants[argument]
+                    context_manager.add_variable(variable_name, stack.pop(), variable_type, value_position)
+                    stack.append(None)
+                elif opcode == LOAD_CONST:
+                    stack.append(constants[argument])
+                elif opcode == CALL:
+                    function_name, arguments_amount = constants[argument]
+                    function = context_manager.get_function(function_name)
+                    call_arguments = stack[len(stack) - arguments_amount:]
+                    del stack[len(stack) - arguments_amount:]
+                    context_manager.current_context.position = positions[pc - 1][0].copy()
+                    cache_key = None
+                    if function_cache and function_cache.is_cacheable(function):
+                        check_argument_correctness(function, call_arguments, context_manager.current_context)
+                        cache_key = function_cache.make_key(function, call_arguments)
+                        result = function_cache.get(cache_key)
+                        if result is not MISSING:
+                            stack.append(result)
+                            continue
+                    frame.pc = pc
+                    frames.append(frame)
+                    frame = self._enter_function(function, call_arguments)
+                    if cache_key is not None:
+                        frame.cache_keys = [cache_key]
+                    opcodes, arguments, constants, positions = (frame.code.opcodes, frame.code.arguments,
+                                                                frame.code.constants, frame.code.positions)
+                    stack = frame.stack
+                    slots = frame.slots
+                    pc = 0
+                elif opcode == TAIL_CALL:
+                    function_name, arguments_amount = constants[argument]
+                    function = context_manager.get_function(function_name)
+                    call_arguments = stack[len(stack) - arguments_amount:]
+                    context_manager.current_context.position = positions[pc - 1][0].copy()
+                    cache_key = None
+                    if function_cache and function_cache.is_cacheable(function):
+                        check_argument_correctness(function, call_arguments, context_manager.current_context)
+                        cache_key = function_cache.make_key(function, call_arguments)
+                        result = function_cache.get(cache_key)
+                        if result is not MISSING:
+                            # return the cached result through the RETURN ending every function body
+                            del stack[len(stack) - arguments_amount:]
+                            stack.append(result)
+                            pc = len(opcodes) - 1
+                            continue
+                    frame = self._enter_function(function, call_arguments, frame)
+                    if cache_key is not None:
+                        cache_keys = frame.cache_keys
+                        if cache_keys is None:
+                            frame.cache_keys = [cache_key]
+                        elif len(cache_keys) < MAX_TAIL_CALL_CACHE_KEYS:
+                            cache_keys.append(cache_key)
+                        else:
+                            cache_keys[-1] = cache_key
+                    opcodes, arguments, constants, positions = (frame.code.opcodes, frame.code.arguments,
+                                                                frame.code.constants, frame.code.positions)
+                    stack = frame.stack
+                    slots = frame.slots
+                    pc = 0
+                elif opcode == RETURN:
+                    result = stack.pop()
+                    if not frames:
+                        return result
+                    self._check_return_types(frame, result)
+                    if frame.cache_keys:
+                        for cache_key in frame.cache_keys:
+                            function_cache.put(cache_key, result)
+                    context_manager.switch_to_parent_context()
+                    frame = frames.pop()
+                    opcodes, arguments, constants, positions = (frame.code.opcodes, frame.code.arguments,
+                                                                frame.code.constants, frame.code.positions)
+                    stack = frame.stack
+                    slots = frame.slots
+                    pc = frame.pc
+                    stack.append(result)
+                elif opcode == NEGATE:
+                    stack[-1] = stack[-1].multiply(MINUS_ONE)
+                elif opcode == NOT:
+                    stack[-1] = stack[-1].not_()
+                elif opcode == MAKE_PHYS:
+                    value = stack.pop()
+                    stack[-1] = PhysValue(value, stack[-1])
+                elif opcode == MAKE_PHYS_ARRAY:
+                    unit = stack.pop()
+                    elements = stack[len(stack) - argument:]
+                    del stack[len(stack) - argument:]
+                    stack.append(PhysArrayValue.from_values(elements, unit))
+                elif opcode == CHECKPOINT:
+                    stop_message = yield
+                    if stop_message:
+                        raise RunTimeError(positions[pc - 1][0], stop_message, context_manager.current_context)
+                elif opcode == MAKE_FUNCTION:
+                    function_name, function_arguments, body, return_type, is_pure = constants[argument]
+                    pos_start, pos_end = positions[pc - 1]
+                    function = FunctionDefinition(function_name, function_arguments, body, return_type,
+                                                  pos_start, pos_end, is_pure)
+                    context_manager.add_function(function_name, function)
+                    stack.append(None)
+                else:
+                    raise RunTimeError(positions[pc - 1][0], f'Unknown opcode: {opcode}',
+                                       context_manager.current_context)
+            except OperationError as e:
+                pos_start = positions[pc - 1][0]
+                raise e.at(pos_start, frame.code.right_operand_positions.get(pc - 1, pos_start),
+                           context_manager.current_context) from e
+            except ZeroDivisionError as e:
+                raise RunTimeError(positions[pc - 1][0], 'Division by zero.', context_manager.current_context) from e
+
+    def _check_return_types(self, frame: Frame, result):
+        context = self.context_manager.current_context
+        for function in frame.return_checks:
+            if function is frame.function:
+                check_return_type(function, result, context)
+                continue
+            try:
+                check_return_type(function, result, context)
+            except RunTimeError as e:
+                # the frame of the function returning with a tail call was replaced, report the error in its name
+                raise RunTimeError(e.pos_start, e.message,
+                                   Context(function.name, context.parent, function.pos_start.copy())) from e
+
+    def _enter_function(self, function: FunctionDefinition, arguments, replaced_frame: Frame = None):
+        context_manager = self.context_manager
+        check_argument_correctness(function, arguments, context_manager.current_context)
+        return_checks = (function,)
+        replaced_frames = None
+        if replaced_frame:
+            replaced_context = context_manager.current_context
+            replaced_frames = replaced_context.replaced_frames or ReplacedFrames()
+            replaced_frames.add(replaced_context)
+            context_manager.switch_to_parent_context()
+            return_checks += tuple(checked for checked in replaced_frame.return_checks if checked is not function)
+        context_manager.switch_context_to(function)
+        context_manager.current_context.replaced_frames = replaced_frames
+        frame = Frame(function.body, function, return_checks)
+        if replaced_frame:
+            frame.cache_keys = replaced_frame.cache_keys
+        slot_types = function.body.slot_types
+        for argument, defined_argument, slot in zip(arguments, function.argument_definitions,
+                                                    function.body.argument_slots):
+            if slot is None:
+                context_manager.current_context.add_variable(defined_argument.name, argument)
+            elif slot in slot_types:
+                frame.slots[slot] = argument.value
+            else:
+                frame.slots[slot] = argument
+        return frame
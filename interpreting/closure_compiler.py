@@ -0,0 +1,273 @@
+from errors.error import RunTimeError, OperationError, run_with_exception_safety
+from interpreting.context import ContextManager
+from interpreting.memoization import MISSING, FunctionResultCache
+from interpreting.utils import BINARY_OPERATIONS, check_argument_correctness, check_return_type
+from interpreting.values.basic_values import IntValue, DoubleValue, BoolValue, StringValue, int_value, \
+    bool_value
+from interpreting.values.keyword_values import KeywordValue, ReturnValue, unwrap_return_value
+from interpreting.values.physical_values import UnitValue, PhysValue, PhysArrayValue
+from interpreting.values.function_values import FunctionDefinition, FunctionArgument
+from lexer.token.token_type import TokenType
+from parsing import nodes
+from parsing.nodes import *
+
+COMPILE_METHOD_PREFIX = '_compile_'
+
+STATEMENT_RESULT_TYPES = (IntValue, StringValue, DoubleValue, BoolValue, KeywordValue, UnitValue, PhysValue,
+                          PhysArrayValue)
+
+
+class ClosureCompiler:
+    """
+    Execution engine that compiles every AST node once into a Python closure and then runs the closures.
+    Node types and operators are resolved at compile time, so running the program never inspects them again.
+    Semantics follow Visitator.
+    """
+    def __init__(self, memoize=False):
+        self.context_manager = ContextManager()
+        self.compile_methods = self._build_compile_methods()
+        self.function_cache = FunctionResultCache() if memoize else None
+
+    @run_with_exception_safety
+    def perform_visiting(self, ast_root):
+        if self.function_cache:
+            self.function_cache.analyze(ast_root)
+        program = self._compile(ast_root)
+        return unwrap_return_value(program())
+
+    def _build_compile_methods(self):
+        compile_methods = {}
+        for method_name in dir(type(self)):
+            if method_name.startswith(COMPILE_METHOD_PREFIX):
+                node_type = getattr(nodes, method_name[len(COMPILE_METHOD_PREFIX):], None)
+                if isinstance(node_type, type):
+                    compile_methods[node_type] = getattr(self, method_name)
+        return compile_methods
+
+    def _compile(self, node):
+        return self.compile_methods.get(type(node), self._compile_not_found)(node)
+
+    def _compile_IntNode(self, node: IntNode):
+        return self._compile_constant(int_value, node.token.value, node)
+
+    def _compile_DoubleNode(self, node: DoubleNode):
+        return self._compile_constant(DoubleValue, node.token.value, node)
+
+    def _compile_StringNode(self, node: StringNode):
+        return self._compile_constant(StringValue, node.token.value, node)
+
+    def _compile_BoolNode(self, node: BoolNode):
+        return self._compile_constant(bool_value, node.token.type == TokenType.T_TRUE, node)
+
+    def _compile_constant(self, value_type, value, node):
+        constant_value = value_type(value)
+
+        def constant():
+            return constant_value
+        return constant
+
+    def _compile_StatementsNode(self, node: StatementsNode):
+        statements = [self._compile(statement) for statement in node.statements]
+
+        def run_statements():
+            result = None
+            for statement in statements:
+                result = statement()
+                if isinstance(result, KeywordValue):
+                    return result
+            if isinstance(result, STATEMENT_RESULT_TYPES):
+                return result
+        return run_statements
+
+    def _compile_UnaryOperationNode(self, node: UnaryOperationNode):
+        context_manager = self.context_manager
+        operand = self._compile(node.node)
+        operand_position = node.node.pos_start
+        minus_one = int_value(-1)
+
+        if node.operation.type == TokenType.T_MINUS:
+            def unary_operation():
+                try:
+                    return operand().multiply(minus_one)
+                except OperationError as e:
+                    raise e.at(operand_position, operand_position, context_manager.current_context) from e
+        elif node.operation.type == TokenType.T_NOT:
+            def unary_operation():
+                try:
+                    return operand().not_()
+                except OperationError as e:
+                    raise e.at(operand_position, operand_position, context_manager.current_context) from e
+        else:
+            unary_operation = operand
+        return unary_operation
+
+    def _compile_BinaryOperationNode(self, node: BinaryOperationNode):
+        left = self._compile(node.left)
+        right = self._compile(node.right)
+        context_manager = self.context_manager
+        method_name = BINARY_OPERATIONS[node.operation.type]
+        left_position, right_position = node.left.pos_start, node.right.pos_start
+
+        def binary_operation():
+            left_value = left()
+            try:
+                return getattr(left_value, method_name)(right())
+            except OperationError as e:
+                raise e.at(left_position, right_position, context_manager.current_context) from e
+        return binary_operation
+
+    def _compile_VariableAccessNode(self, node: VariableAccessNode):
+        context_manager = self.context_manager
+        variable_name = node.name
+
+        def variable_access():
+            return context_manager.get_variable(variable_name)
+        return variable_access
+
+    def _compile_VariableAssignmentNode(self, node: VariableAssignmentNode):
+        context_manager = self.context_manager
+        variable_name = node.name
+        variable_type = node.type
+        value = self._compile(node.value)
+        value_position = node.value.pos_start
+
+        def variable_assignment():
+            context_manager.add_variable(variable_name, value(), variable_type, value_position)
+        return variable_assignment
+
+    def _compile_IfNode(self, node: IfNode):
+        cases = [(self._compile(condition), self._compile(statement)) for condition, statement in node.cases]
+        else_case = self._compile(node.else_case) if node.else_case else None
+
+        def if_statement():
+            for condition, statement in cases:
+                if condition().value:
+                    return statement()
+            if else_case:
+                return else_case()
+        return if_statement
+
+    def _compile_WhileNode(self, node: WhileNode):
+        condition = self._compile(node.condition_node)
+        body = self._compile(node.body_node)
+
+        def while_loop():
+            while condition().value:
+                body_result = body()
+                if isinstance(body_result, ReturnValue):
+                    return body_result
+                if isinstance(body_result, KeywordValue) and body_result.value == 'break':
+                    break
+        return while_loop
+
+    def _compile_FunctionDefinitionNode(self, node: FunctionDefinitionNode):
+        context_manager = self.context_manager
+        function_name = node.function_name.value
+        arguments = [self._compile_FunctionArgumentNode(argument) for argument in node.arguments]
+        body = self._compile(node.body)
+        return_type = node.return_type_node
+        pos_start, pos_end = node.pos_start, node.pos_end
+        is_pure = node.is_pure
+
+        def function_definition():
+            function = FunctionDefinition(function_name, arguments, body, return_type, pos_start, pos_end, is_pure)
+            context_manager.add_function(function_name, function)
+        return function_definition
+
+    def _compile_CallFunctionNode(self, node: CallFunctionNode):
+        context_manager = self.context_manager
+        function_name = node.function_name
+        arguments = [self._compile(argument) for argument in node.arguments]
+        pos_start = node.pos_start
+        execute_function = self._execute_function
+
+        def call_function():
+            function = context_manager.get_function(function_name)
+            argument_values = [argument() for argument in arguments]
+            context_manager.current_context.position = pos_start.copy()
+            return execute_function(function, argument_values)
+        return call_function
+
+    def _execute_function(self, function: FunctionDefinition, arguments):
+        check_argument_correctness(function, arguments, self.context_manager.current_context)
+        function_cache = self.function_cache
+        if function_cache and function_cache.is_cacheable(function):
+            cache_key = function_cache.make_key(function, arguments)
+            function_result = function_cache.get(cache_key)
+            if function_result is MISSING:
+                function_result = self._run_function(function, arguments)
+                function_cache.put(cache_key, function_result)
+            return function_result
+        return self._run_function(function, arguments)
+
+    def _run_function(self, function: FunctionDefinition, arguments):
+        context_manager = self.context_manager
+        context_manager.switch_context_to(function)
+        for argument, defined_argument in zip(arguments, function.argument_definitions):
+            context_manager.current_context.add_variable(defined_argument.name, argument)
+        function_result = unwrap_return_value(function.body())
+        check_return_type(function, function_result, context_manager.current_context)
+        context_manager.switch_to_parent_context()
+        return function_result
+
+    def _compile_FunctionArgumentNode(self, node: FunctionArgumentNode):
+        return FunctionArgument(node.name.value, node.type.type)
+
+    def _compile_KeywordNode(self, node: KeywordNode):
+        keyword = KeywordValue(node.value)
+
+        def keyword_statement():
+            return keyword
+        return keyword_statement
+
+    def _compile_ReturnNode(self, node: ReturnNode):
+        value = self._compile(node.node) if node.node else None
+
+        def return_statement():
+            return ReturnValue(value() if value else None)
+        return return_statement
+
+    def _compile_UnitNode(self, node: UnitNode):
+        unit_value = UnitValue(node.fraction)
+
+        def unit():
+            return unit_value
+        return unit
+
+    def _compile_PhysNode(self, node: PhysNode):
+        unit = self._compile(node.unit)
+        value = self._compile(node.value)
+
+        def phys():
+            unit_value = unit()
+            return PhysValue(value(), unit_value)
+        return phys
+
+    def _compile_PhysArrayNode(self, node: PhysArrayNode):
+        context_manager = self.context_manager
+        if all(isinstance(element, (IntNode, DoubleNode)) for element in node.elements):
+            elements = [DoubleValue(element.token.value) for element in node.elements]
+            try:
+                phys_array_value = PhysArrayValue.from_values(elements, UnitValue(node.unit.fraction))
+            except OperationError:
+                # without numpy the literal is left to fail when it is evaluated, like any other phys[]
+                phys_array_value = None
+            if phys_array_value is not None:
+                def constant_phys_array():
+                    return phys_array_value
+                return constant_phys_array
+        elements = [self._compile(element) for element in node.elements]
+        unit = self._compile(node.unit)
+        pos_start = node.pos_start
+
+        def phys_array():
+            values = [element() for element in elements]
+            try:
+                return PhysArrayValue.from_values(values, unit())
+            except OperationError as e:
+                raise e.at(pos_start, pos_start, context_manager.current_context) from e
+        return phys_array
+
+    def _compile_not_found(self, node):
+        raise RunTimeError(node.pos_start, f'Could not find method for node: {type(node).__name__}',
+                           self.context_manager.current_context)
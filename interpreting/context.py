@@ -1,20 +1,36 @@
+from collections import deque
+
 from errors.error import RunTimeError
 from interpreting.values.function_values import FunctionDefinition
 from lexer.token.tokens import ValueToken
 
 
+MAX_POOLED_SYMBOL_TABLES = 256
+MAX_REPLACED_FRAMES = 64
+
+
 class Context:
-    def __init__(self, name, parent=None, position=None, use_parent_symbol_table=False):
+    def __init__(self, name, parent=None, position=None, use_parent_symbol_table=False, symbol_table=None,
+                 global_symbol_table=None):
         self.name = name
         self.parent = parent
         self.position = position
-        self.symbol_table = SymbolTable(parent.symbol_table) if parent and use_parent_symbol_table else SymbolTable()
+        if symbol_table is not None:
+            self.symbol_table = symbol_table
+        else:
+            self.symbol_table = SymbolTable(parent.symbol_table) if parent and use_parent_symbol_table \
+                else SymbolTable()
+        self.global_symbol_table = global_symbol_table
+        # frames between this context and its parent which a tail call replaced, only set by the bytecode VM
+        self.replaced_frames = None
 
     def copy_symbols_from(self, other):
         self.symbol_table.update(other.symbol_table)
 
     def get_variable(self, variable_name: ValueToken):
         variable = self.symbol_table.get(variable_name.value)
+        if variable is None and self.global_symbol_table is not None:
+            variable = self.global_symbol_table.get(variable_name.value)
         if variable is None:
             raise RunTimeError(variable_name.pos_start, f'{variable_name.value} not defined.', self)
         return variable
@@ -23,6 +39,34 @@ class Context:
         self.symbol_table.set(variable_name, value)
 
 
+class ReplacedFrames:
+    """
+    Function contexts dropped by tail calls in the bytecode VM, kept so tracebacks still show the functions
+    which returned through a tail call. Consecutive calls from the same line are counted instead of stored and
+    only the innermost MAX_REPLACED_FRAMES are kept, so deep tail recursion still runs in constant memory.
+    """
+    def __init__(self):
+        self.frames = deque(maxlen=MAX_REPLACED_FRAMES)
+        self.dropped = 0
+
+    def add(self, context: Context):
+        frames = self.frames
+        if frames and frames[-1][0] == context.name and frames[-1][1].row == context.position.row:
+            frames[-1][2] += 1
+            return
+        if len(frames) == frames.maxlen:
+            self.dropped += frames[0][2]
+        frames.append([context.name, context.position, 1])
+
+    def format_traceback(self):
+        lines = [f'[{self.dropped} earlier tail calls not shown]\n'] if self.dropped else []
+        for name, position, calls in self.frames:
+            lines.append(f'Line: {str(position.row)}, in {name}\n')
+            if calls > 1:
+                lines.append(f'[Previous line repeated {calls - 1} more times]\n')
+        return ''.join(lines)
+
+
 class SymbolTable:
     def __init__(self, symbol_table=None):
         self.symbols = dict(symbol_table.symbols) if symbol_table else {}
@@ -39,16 +83,25 @@ class SymbolTable:
     def update(self, other):
         self.symbols.update(other.symbols)
 
+    def clear(self):
+        self.symbols.clear()
+
 
 class ContextManager:
     def __init__(self):
         self.global_context = Context('<global>')
         self.current_context = Context('<main>')
         self.current_context.copy_symbols_from(self.global_context)
+        self.symbol_table_pool = []
 
     def switch_context_to(self, function: FunctionDefinition):
-        function_context = Context(function.name, self.current_context, self.current_context.position)
-        function_context.copy_symbols_from(self.global_context)
+        """
+        Function contexts hold only their locals and fall back to the shared global symbol table,
+        so the cost of a call does not depend on the amount of defined functions.
+        """
+        symbol_table = self.symbol_table_pool.pop() if self.symbol_table_pool else SymbolTable()
+        function_context = Context(function.name, self.current_context, self.current_context.position,
+                                   symbol_table=symbol_table, global_symbol_table=self.global_context.symbol_table)
         self.current_context = function_context
         self.current_context.position = function.pos_start.copy()
 
@@ -56,8 +109,16 @@ class ContextManager:
         if not self.current_context.parent:
             raise RunTimeError(self.current_context.position, f'No parent for context: {self.current_context.name}',
                                self)
+        self._release_symbol_table(self.current_context)
         self.current_context = self.current_context.parent
 
+    def _release_symbol_table(self, context):
+        # the context itself may still be referenced by values for tracebacks, only its symbols are recycled
+        if len(self.symbol_table_pool) < MAX_POOLED_SYMBOL_TABLES:
+            context.symbol_table.clear()
+            self.symbol_table_pool.append(context.symbol_table)
+        context.symbol_table = None
+
     def get_variable(self, variable_name):
         return self.current_context.get_variable(variable_name)
 
@@ -67,11 +128,11 @@ class ContextManager:
     def get_function(self, function_name):
         return self.global_context.get_variable(function_name)
 
-    def add_variable(self, variable_name, value, expected_type):
-        self._verify_assignment(variable_name, value, expected_type)
+    def add_variable(self, variable_name, value, expected_type, value_position=None):
+        self._verify_assignment(variable_name, value, expected_type, value_position)
         self.current_context.add_variable(variable_name.value, value)
 
-    def _verify_assignment(self, variable_name: ValueToken, value, expected_type):
+    def _verify_assignment(self, variable_name: ValueToken, value, expected_type, value_position):
         self._check_type_match(expected_type, value)
         if expected_type is None:
             current_value = self.get_variable(variable_name)
@@ -80,7 +141,7 @@ class ContextManager:
                                    'This variable has not been defined yet. Put a type.', self.current_context)
 
             if current_value.type_ != value.type_:
-                raise RunTimeError(value.pos_start,
+                raise RunTimeError(value_position,
                                    f'Tried to put a value of type {value.type_}'
                                    f' to a variable of type {current_value.type_}', self.current_context)
 
@@ -1,42 +1,182 @@
 from argparse import ArgumentParser
 
+from errors.error import LanguageError, RunTimeError, InternalError, raising_errors
+from interpreting.ast_cache import AstCache, MemoryAstCache
+from interpreting.bytecode.vm import VirtualMachine
+from interpreting.closure_compiler import ClosureCompiler
+from interpreting.context import ContextManager
+from interpreting.optimizer import AstOptimizer
+from interpreting.profiler import ProfilingVisitator
+from interpreting.values.physical_values import UNIT_CACHE
 from interpreting.visitator import Visitator
-from lexer.lexer import StdInLexer, FileLexer
+from lexer.lexer import create_lexer, StringLexer
 from parsing.parser import Parser
 
 
+ENGINES = {
+    'visitor': Visitator,
+    'closure': ClosureCompiler,
+    'bytecode': VirtualMachine,
+}
+
+
 class Interpreter:
-    def __init__(self):
-        self.visitator = Visitator()
+    def __init__(self, engine='visitor', memoize=False, profile=False):
+        if profile and engine != 'visitor':
+            # only the tree walker times every visited node, profiling another engine would measure the wrong one
+            raise ValueError(f'Profiling is only supported by the visitor engine, not {engine}.')
+        self.engine = ProfilingVisitator(memoize=memoize) if profile else ENGINES[engine](memoize=memoize)
 
     def interpret(self, ast):
         if ast:
-            return self.visitator.perform_visiting(ast)
+            return self.engine.perform_visiting(ast)
         else:
             return 'Provide code and try again.'
 
+    def reset_context(self):
+        self.engine.context_manager = ContextManager()
+
+    def statistics(self):
+        statistics = {'unit_cache': UNIT_CACHE.statistics()}
+        if self.engine.function_cache:
+            statistics['function_cache'] = self.engine.function_cache.statistics()
+        return statistics
+
+
+class Result:
+    """
+    Outcome of Evaluator.evaluate_source: the value of the last statement or the error that stopped the program.
+    """
+    def __init__(self, value=None, error: LanguageError = None):
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def to_dict(self):
+        if self.error:
+            return {'ok': False, 'error': self.error.to_dict()}
+        return {'ok': True, 'value': None if self.value is None else str(self.value),
+                'type': getattr(self.value, 'type_', None)}
+
+    def __repr__(self):
+        return self.error.describe() if self.error else str(self.value)
+
 
 class Evaluator:
-    def __init__(self):
-        self.interpreter = Interpreter()
+    def __init__(self, cache_dir=None, engine='visitor', memoize=False, optimize=True, memory_cache_size=0,
+                 profile=False):
+        self.interpreter = Interpreter(engine, memoize, profile)
+        self.ast_cache = None
+        if cache_dir:
+            self.ast_cache = AstCache(cache_dir)
+        elif memory_cache_size:
+            self.ast_cache = MemoryAstCache(memory_cache_size)
+        self.optimizer = AstOptimizer() if optimize else None
 
-    def evaluate(self, source_type, file_path=None):
-        lexer = StdInLexer() if source_type == 'stdin' else FileLexer(file_path)
-        parser = Parser(lexer)
-        ast = parser.parse()
+    def evaluate(self, source_type, file_path=None, streaming=False, use_mmap=False):
+        if source_type == 'file' and self.ast_cache:
+            with open(file_path, 'rb') as source_file:
+                source = source_file.read()
+            ast = self._get_cached_ast(source, lambda: self._parse('file', file_path, streaming, use_mmap))
+        else:
+            ast = self._parse(source_type, file_path, streaming, use_mmap)
+        if self.optimizer:
+            ast = self.optimizer.optimize(ast)
         return self.interpreter.interpret(ast)
 
+    def evaluate_source(self, text) -> Result:
+        """
+        Runs a program given as text in a fresh context. Errors of the program are returned in the Result
+        instead of being printed before exit(), so the evaluator can be reused by a long-lived process.
+        Any other exception is a bug of the interpreter and is returned as an InternalError.
+        """
+        self.interpreter.reset_context()
+        ast = None
+        parser = None
+
+        def parse():
+            nonlocal parser
+            parser = Parser(StringLexer(text))
+            return parser.parse()
+
+        with raising_errors():
+            try:
+                if self.ast_cache:
+                    ast = self._get_cached_ast(text.encode(), parse)
+                else:
+                    ast = parse()
+                if ast is None:
+                    return Result()
+                if self.optimizer:
+                    ast = self.optimizer.optimize(ast)
+                return Result(self.interpreter.interpret(ast))
+            except LanguageError as error:
+                return Result(error=error)
+            except RecursionError:
+                # the parser and the tree walking engines recurse on the Python stack,
+                # report where the program was when it ran out
+                context = self.interpreter.engine.context_manager.current_context
+                if ast is None and parser is not None:
+                    position = parser.current_token.pos_start
+                else:
+                    position = context.position or ast.pos_start
+                return Result(error=RunTimeError(position, 'Maximum recursion depth exceeded.', context))
+            except Exception as error:
+                position = self.interpreter.engine.context_manager.current_context.position
+                return Result(error=InternalError(error, position))
+
+    def _get_cached_ast(self, source, parse):
+        ast = self.ast_cache.load(source)
+        if ast is None:
+            ast = parse()
+            self.ast_cache.store(source, ast)
+        return ast
+
+    @staticmethod
+    def _parse(source_type, file_path, streaming, use_mmap):
+        lexer = create_lexer(source_type, file_path, streaming, use_mmap)
+        parser = Parser(lexer)
+        return parser.parse()
+
 
 def main(args):
-    evaluator = Evaluator()
-    result = evaluator.evaluate(args.source_type, args.file_path)
+    evaluator = Evaluator(args.cache_dir, args.engine, args.memoize, not args.no_optimize,
+                          profile=args.profile or bool(args.profile_stacks))
+    result = evaluator.evaluate(args.source_type, args.file_path, args.streaming, args.mmap)
     if result:
         print(result)
+    if args.stats:
+        for name, statistics in evaluator.interpreter.statistics().items():
+            print(f'{name}: {statistics}')
+    if args.profile:
+        source_lines = None
+        if args.source_type == 'file':
+            with open(args.file_path, encoding='utf-8') as source_file:
+                source_lines = source_file.read().splitlines()
+        print(evaluator.interpreter.engine.profile.format_report(source_lines))
+    if args.profile_stacks:
+        evaluator.interpreter.engine.profile.write_collapsed_stacks(args.profile_stacks)
 
 
 if __name__ == '__main__':
     parser = ArgumentParser()
     parser.add_argument('--file_path', type=str, default='test_files/presentation_test.txt', required=False)
     parser.add_argument('--source_type', type=str, choices=['stdin', 'file'], default='file')
+    parser.add_argument('--streaming', action='store_true')
+    parser.add_argument('--mmap', action='store_true')
+    parser.add_argument('--cache_dir', type=str, default=None, required=False)
+    parser.add_argument('--engine', type=str, choices=list(ENGINES), default='visitor')
+    parser.add_argument('--memoize', action='store_true')
+    parser.add_argument('--no_optimize', action='store_true')
+    parser.add_argument('--stats', action='store_true')
+    parser.add_argument('--profile', action='store_true',
+                        help='print visits and time per line, function and node (visitor engine only)')
+    parser.add_argument('--profile_stacks', type=str, default=None, required=False, metavar='PATH',
+                        help='write collapsed stacks for flamegraph.pl or speedscope (visitor engine only)')
     args = parser.parse_args()
+    if (args.profile or args.profile_stacks) and args.engine != 'visitor':
+        parser.error(f'--profile and --profile_stacks require --engine visitor, not {args.engine}')
     main(args)
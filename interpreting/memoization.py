@@ -0,0 +1,111 @@
+from collections import OrderedDict, defaultdict
+
+from interpreting.values.function_values import FunctionDefinition
+from interpreting.values.physical_values import UnitValue, PhysValue, PhysArrayValue
+from parsing.nodes import FunctionDefinitionNode, CallFunctionNode, iter_child_nodes
+
+DEFAULT_FUNCTION_CACHE_SIZE = 1024
+# returned by FunctionResultCache.get on a miss, since None is the cached result of void functions
+MISSING = object()
+
+
+def mark_pure_functions(ast_root):
+    """
+    Sets is_pure on definitions of functions whose result depends only on their arguments and returns their names.
+    Function bodies can only assign their own locals, so a function is pure when it does not define other functions
+    and calls only pure functions. Names defined more than once are treated as impure since calls resolve at runtime.
+    """
+    definitions = defaultdict(list)
+    nodes_to_visit = [ast_root]
+    while nodes_to_visit:
+        node = nodes_to_visit.pop()
+        if isinstance(node, FunctionDefinitionNode):
+            definitions[node.function_name.value].append(node)
+        nodes_to_visit.extend(iter_child_nodes(node))
+
+    called_functions = {}
+    pure_functions = set()
+    for name, function_definitions in definitions.items():
+        if len(function_definitions) == 1:
+            body_calls = _get_body_calls(function_definitions[0].body)
+            if body_calls is not None:
+                called_functions[name] = body_calls
+                pure_functions.add(name)
+
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure_functions):
+            if not called_functions[name] <= pure_functions:
+                pure_functions.remove(name)
+                changed = True
+    for name, function_definitions in definitions.items():
+        for definition in function_definitions:
+            definition.is_pure = name in pure_functions
+    return frozenset(pure_functions)
+
+
+def _get_body_calls(body):
+    calls = set()
+    nodes_to_visit = [body]
+    while nodes_to_visit:
+        node = nodes_to_visit.pop()
+        if isinstance(node, FunctionDefinitionNode):
+            return None
+        if isinstance(node, CallFunctionNode):
+            calls.add(node.function_name.value)
+        nodes_to_visit.extend(iter_child_nodes(node))
+    return calls
+
+
+def get_value_key(value):
+    if isinstance(value, PhysValue):
+        return 'phys', get_value_key(value.value), get_value_key(value.unit)
+    if isinstance(value, PhysArrayValue):
+        return 'phys[]', value.value.tobytes(), get_value_key(value.unit)
+    if isinstance(value, UnitValue):
+        return 'unit', value.value
+    return value.type_, value.value
+
+
+class FunctionResultCache:
+    """
+    Bounded LRU cache of pure function results keyed on the function and the types and values of its arguments.
+    """
+    def __init__(self, max_size=DEFAULT_FUNCTION_CACHE_SIZE):
+        self.max_size = max_size
+        self.results = OrderedDict()
+        self.pure_functions = frozenset()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, ast_root):
+        # results are keyed on the function definitions, so names analyzed for earlier programs are not kept
+        self.pure_functions = mark_pure_functions(ast_root)
+
+    @staticmethod
+    def is_cacheable(function: FunctionDefinition):
+        return function.is_pure
+
+    @staticmethod
+    def make_key(function: FunctionDefinition, arguments):
+        return function, tuple(get_value_key(argument) for argument in arguments)
+
+    def get(self, key):
+        result = self.results.get(key, MISSING)
+        if result is MISSING:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        self.results.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+    def statistics(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results),
+                'pure_functions': sorted(self.pure_functions)}
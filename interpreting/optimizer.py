@@ -0,0 +1,164 @@
+from collections import defaultdict
+
+from errors.error import OperationError
+from interpreting.utils import BINARY_OPERATIONS
+from interpreting.values.basic_values import IntValue, DoubleValue, BoolValue, StringValue
+from interpreting.values.physical_values import UnitValue, PhysValue
+from lexer.token.token_type import TokenType
+from lexer.token.tokens import BaseToken, ValueToken
+from parsing import nodes
+from parsing.nodes import *
+
+OPTIMIZE_METHOD_PREFIX = '_optimize_'
+MAX_FOLDED_STRING_LENGTH = 1024
+
+
+class AstOptimizer:
+    """
+    Runs after parsing. Folds operations on literals into a single literal computed with the Value arithmetic
+    and removes the cases of IfNodes whose conditions are literals. Folded nodes keep the positions of the
+    expressions they replace. Operations that fail, like division by zero, are left for the interpreter to report.
+    """
+    def __init__(self):
+        self.optimize_methods = self._build_optimize_methods()
+
+    def optimize(self, ast_root):
+        if ast_root is None:
+            return None
+        return self._optimize(ast_root)
+
+    def _build_optimize_methods(self):
+        optimize_methods = {}
+        for method_name in dir(type(self)):
+            if method_name.startswith(OPTIMIZE_METHOD_PREFIX):
+                node_type = getattr(nodes, method_name[len(OPTIMIZE_METHOD_PREFIX):], None)
+                if isinstance(node_type, type):
+                    optimize_methods[node_type] = getattr(self, method_name)
+        return optimize_methods
+
+    def _optimize(self, node):
+        optimize_method = self.optimize_methods.get(type(node))
+        return optimize_method(node) if optimize_method else node
+
+    def _optimize_StatementsNode(self, node: StatementsNode):
+        node.statements = [self._optimize(statement) for statement in node.statements]
+        return node
+
+    def _optimize_BinaryOperationNode(self, node: BinaryOperationNode):
+        node.left = self._optimize(node.left)
+        node.right = self._optimize(node.right)
+        left = self._get_constant(node.left)
+        right = self._get_constant(node.right)
+        if left is None or right is None:
+            return node
+        try:
+            result = getattr(left, BINARY_OPERATIONS[node.operation.type])(right)
+        except (OperationError, AttributeError, TypeError):
+            return node
+        return self._to_node(result, node)
+
+    def _optimize_UnaryOperationNode(self, node: UnaryOperationNode):
+        node.node = self._optimize(node.node)
+        operand = self._get_constant(node.node)
+        if operand is None:
+            return node
+        try:
+            if node.operation.type == TokenType.T_MINUS:
+                operand = operand.multiply(IntValue(-1))
+            elif node.operation.type == TokenType.T_NOT:
+                operand = operand.not_()
+        except (OperationError, AttributeError, TypeError):
+            return node
+        return self._to_node(operand, node)
+
+    def _optimize_PhysNode(self, node: PhysNode):
+        node.value = self._optimize(node.value)
+        return node
+
+    def _optimize_PhysArrayNode(self, node: PhysArrayNode):
+        node.elements = [self._optimize(element) for element in node.elements]
+        return node
+
+    def _optimize_VariableAssignmentNode(self, node: VariableAssignmentNode):
+        node.value = self._optimize(node.value)
+        return node
+
+    def _optimize_IfNode(self, node: IfNode):
+        cases = []
+        else_case = None
+        for condition, statement in node.cases:
+            condition = self._optimize(condition)
+            statement = self._optimize(statement)
+            constant_condition = self._get_constant(condition)
+            if constant_condition is None:
+                cases.append((condition, statement))
+            elif constant_condition.value:
+                else_case = statement
+                break
+        else:
+            if node.else_case:
+                else_case = self._optimize(node.else_case)
+        if cases:
+            node.cases = cases
+            node.else_case = else_case
+            return node
+        if else_case:
+            return else_case
+        return StatementsNode([], node.pos_start, node.pos_end)
+
+    def _optimize_WhileNode(self, node: WhileNode):
+        node.condition_node = self._optimize(node.condition_node)
+        node.body_node = self._optimize(node.body_node)
+        return node
+
+    def _optimize_FunctionDefinitionNode(self, node: FunctionDefinitionNode):
+        node.body = self._optimize(node.body)
+        return node
+
+    def _optimize_CallFunctionNode(self, node: CallFunctionNode):
+        node.arguments = [self._optimize(argument) for argument in node.arguments]
+        return node
+
+    def _optimize_ReturnNode(self, node: ReturnNode):
+        if node.node:
+            node.node = self._optimize(node.node)
+        return node
+
+    def _get_constant(self, node):
+        if isinstance(node, IntNode):
+            return IntValue(node.token.value)
+        if isinstance(node, DoubleNode):
+            return DoubleValue(node.token.value)
+        if isinstance(node, StringNode):
+            return StringValue(node.token.value)
+        if isinstance(node, BoolNode):
+            return BoolValue(node.token.type == TokenType.T_TRUE)
+        if isinstance(node, UnitNode):
+            return UnitValue(node.fraction)
+        if isinstance(node, PhysNode):
+            value = self._get_constant(node.value)
+            if value is not None:
+                return PhysValue(value, self._get_constant(node.unit))
+        return None
+
+    def _to_node(self, value, replaced_node):
+        pos_start, pos_end = replaced_node.pos_start, replaced_node.pos_end
+        if isinstance(value, IntValue):
+            return IntNode(ValueToken(TokenType.VT_INT, value.value, pos_start, pos_end))
+        if isinstance(value, DoubleValue):
+            return DoubleNode(ValueToken(TokenType.VT_DOUBLE, value.value, pos_start, pos_end))
+        if isinstance(value, StringValue) and len(value.value) <= MAX_FOLDED_STRING_LENGTH:
+            return StringNode(ValueToken(TokenType.VT_STRING, value.value, pos_start, pos_end))
+        if isinstance(value, BoolValue):
+            return BoolNode(BaseToken(TokenType.T_TRUE if value.value else TokenType.T_FALSE, pos_start, pos_end))
+        if isinstance(value, UnitValue):
+            unit = UnitNode([], [], pos_start, pos_end)
+            unit.fraction = defaultdict(int, dict(value.value))
+            return unit
+        if isinstance(value, PhysValue):
+            number = self._to_node(value.value, replaced_node)
+            if isinstance(number, (IntNode, DoubleNode)):
+                phys = PhysNode(number, self._to_node(value.unit, replaced_node))
+                phys.pos_start, phys.pos_end = pos_start, pos_end
+                return phys
+        return replaced_node
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from time import perf_counter
+
+from interpreting.values.function_values import FunctionDefinition
+from interpreting.visitator import Visitator
+from parsing.nodes import StatementsNode
+
+MAIN_FRAME = '<main>'
+DEFAULT_REPORT_NODES = 10
+
+
+class ProfileEntry:
+    """
+    Calls, cumulative and self time of one node, line or function.
+    Cumulative time is only added by the outermost active call, so recursion and nested nodes are not counted twice.
+    """
+    __slots__ = ('calls', 'cumulative_time', 'self_time', 'active')
+
+    def __init__(self):
+        self.calls = 0
+        self.cumulative_time = 0.0
+        self.self_time = 0.0
+        self.active = 0
+
+    def enter(self):
+        self.active += 1
+
+    def leave(self, elapsed, self_time):
+        self.calls += 1
+        self.self_time += self_time
+        self.active -= 1
+        if not self.active:
+            self.cumulative_time += elapsed
+
+
+class Profile:
+    """
+    Statistics collected by ProfilingVisitator: entries per AST node, per source row and per user function,
+    and self time per collapsed stack of user functions ending with the source row.
+    """
+    def __init__(self):
+        self.nodes = defaultdict(ProfileEntry)
+        self.lines = defaultdict(ProfileEntry)
+        self.functions = defaultdict(ProfileEntry)
+        self.stacks = defaultdict(float)
+
+    def format_report(self, source_lines=None, max_nodes=DEFAULT_REPORT_NODES):
+        lines = [f'{"line":>6} {"visits":>10} {"cumulative":>12} {"self":>12}  source']
+        for row, entry in sorted(self.lines.items()):
+            source = source_lines[row - 1].strip() if source_lines and row <= len(source_lines) else ''
+            lines.append(f'{row:>6} {entry.calls:>10} {entry.cumulative_time:>12.6f} {entry.self_time:>12.6f}  '
+                         f'{source}')
+        if self.functions:
+            lines.append('')
+            lines.append(f'{"function":<20} {"calls":>10} {"cumulative":>12} {"self":>12}')
+            for name, entry in sorted(self.functions.items(), key=lambda item: -item[1].cumulative_time):
+                lines.append(f'{name:<20} {entry.calls:>10} {entry.cumulative_time:>12.6f} {entry.self_time:>12.6f}')
+        lines.append('')
+        lines.append(f'{"node":<34} {"visits":>10} {"cumulative":>12} {"self":>12}')
+        hottest_nodes = sorted(self.nodes.items(), key=lambda item: -item[1].self_time)[:max_nodes]
+        for node, entry in hottest_nodes:
+            location = f'{type(node).__name__} {node.pos_start.print_location() if node.pos_start else ""}'
+            lines.append(f'{location:<34} {entry.calls:>10} {entry.cumulative_time:>12.6f} {entry.self_time:>12.6f}')
+        return '\n'.join(lines)
+
+    def write_collapsed_stacks(self, file_path):
+        """
+        Writes self time in microseconds per stack in the collapsed format read by flamegraph.pl and speedscope.
+        """
+        with open(file_path, 'w') as stacks_file:
+            for stack, self_time in sorted(self.stacks.items()):
+                microseconds = round(self_time * 1e6)
+                if microseconds:
+                    stacks_file.write(f'{stack} {microseconds}\n')
+
+
+class ProfilingVisitator(Visitator):
+    """
+    Visitator timing every visited node. It is only created for --profile, so Visitator itself stays unchanged
+    and runs without profiling have no overhead.
+    Blocks are not attributed to their first line, their statements are reported on their own lines instead.
+    """
+    def __init__(self, memoize=False):
+        super().__init__(memoize)
+        self.profile = Profile()
+        self.child_times = []
+        self.function_child_times = []
+        self.frames = [MAIN_FRAME]
+
+    def _visit(self, node):
+        profile = self.profile
+        node_entry = profile.nodes[node]
+        row = node.pos_start.row if node.pos_start and not isinstance(node, StatementsNode) else None
+        line_entry = profile.lines[row] if row is not None else None
+        node_entry.enter()
+        if line_entry:
+            line_entry.enter()
+        child_times = self.child_times
+        child_times.append(0.0)
+        start = perf_counter()
+        try:
+            return super()._visit(node)
+        finally:
+            elapsed = perf_counter() - start
+            self_time = elapsed - child_times.pop()
+            if child_times:
+                child_times[-1] += elapsed
+            node_entry.leave(elapsed, self_time)
+            if line_entry:
+                line_entry.leave(elapsed, self_time)
+            profile.stacks[f'{self.frames[-1]};line {row}' if row is not None else self.frames[-1]] += self_time
+
+    def _run_function(self, function: FunctionDefinition, arguments):
+        function_entry = self.profile.functions[function.name]
+        function_entry.enter()
+        self.frames.append(f'{self.frames[-1]};{function.name}')
+        function_child_times = self.function_child_times
+        function_child_times.append(0.0)
+        start = perf_counter()
+        try:
+            return super()._run_function(function, arguments)
+        finally:
+            elapsed = perf_counter() - start
+            self_time = elapsed - function_child_times.pop()
+            if function_child_times:
+                function_child_times[-1] += elapsed
+            function_entry.leave(elapsed, self_time)
+            self.frames.pop()
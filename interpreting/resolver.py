@@ -0,0 +1,183 @@
+from collections import defaultdict
+
+from errors.error import RunTimeError
+from lexer.token.token_type import TokenType
+from parsing.nodes import *
+
+ARITHMETIC_OPERATIONS = (TokenType.T_PLUS, TokenType.T_MINUS, TokenType.T_MUL, TokenType.T_DIV)
+ORDER_OPERATIONS = (TokenType.T_LESS, TokenType.T_LESS_OR_EQ, TokenType.T_GREATER, TokenType.T_GREATER_OR_EQ)
+EQUALITY_OPERATIONS = (TokenType.T_EQ, TokenType.T_NOT_EQ)
+NUMBER_TYPES = ('int', 'double')
+UNBOXED_TYPES = NUMBER_TYPES
+
+LITERAL_TYPES = {
+    IntNode: 'int',
+    DoubleNode: 'double',
+    StringNode: 'string',
+    BoolNode: 'bool',
+    UnitNode: 'unit',
+    PhysNode: 'phys',
+    PhysArrayNode: 'phys[]',
+}
+
+
+class Scope:
+    """
+    Variables of the program body or of one function body, each owning a fixed slot in the frame.
+    """
+    def __init__(self):
+        self.slots = {}
+        self.declared_types = defaultdict(set)
+
+    def get_slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def declare(self, name, type_name):
+        self.declared_types[name].add(type_name)
+        return self.get_slot(name)
+
+    def get_type(self, name):
+        types = self.declared_types.get(name)
+        if types and len(types) == 1:
+            return next(iter(types))
+        return None
+
+    def get_unboxed_slot_types(self):
+        slot_types = {}
+        for name, slot in self.slots.items():
+            slot_type = self.get_type(name)
+            if slot_type in UNBOXED_TYPES:
+                slot_types[slot] = slot_type
+        return slot_types
+
+
+class Resolver:
+    """
+    Runs between parsing and interpreting. Gives every variable and function argument a slot index in the frame
+    of its scope and stores the frame sizes on the program root and on the function definitions.
+    Assignments whose types are known statically are checked here: mismatches are reported right away
+    and matching ones are marked so the interpreter skips the check.
+    Slots of variables declared with a single numeric type are listed in slot_types, letting the bytecode engine
+    keep them as raw Python numbers.
+    """
+    def __init__(self, context=None):
+        self.context = context
+        self.function_return_types = {}
+        self.scope = None
+
+    def resolve(self, ast_root):
+        self._collect_function_return_types(ast_root)
+        ast_root.frame_size, ast_root.slot_types = self._resolve_scope(ast_root, [])
+        return ast_root
+
+    def _collect_function_return_types(self, node):
+        return_types = defaultdict(set)
+        nodes_to_visit = [node]
+        while nodes_to_visit:
+            current = nodes_to_visit.pop()
+            if isinstance(current, FunctionDefinitionNode):
+                return_types[current.function_name.value].add(str(current.return_type_node))
+            nodes_to_visit.extend(iter_child_nodes(current))
+        self.function_return_types = {name: types.pop() for name, types in return_types.items()
+                                      if len(types) == 1 and 'void' not in types}
+
+    def _resolve_scope(self, body, arguments):
+        enclosing_scope, self.scope = self.scope, Scope()
+        for argument in arguments:
+            argument.slot = self.scope.declare(argument.name.value, str(argument.type))
+        self._collect_declarations(body)
+        self._resolve_node(body)
+        frame_size, slot_types = len(self.scope.slots), self.scope.get_unboxed_slot_types()
+        self.scope = enclosing_scope
+        return frame_size, slot_types
+
+    def _collect_declarations(self, node):
+        if isinstance(node, FunctionDefinitionNode):
+            return
+        if isinstance(node, VariableAssignmentNode) and node.type is not None:
+            self.scope.declare(node.name.value, str(node.type))
+        for child in iter_child_nodes(node):
+            self._collect_declarations(child)
+
+    def _resolve_node(self, node):
+        if isinstance(node, FunctionDefinitionNode):
+            node.frame_size, node.slot_types = self._resolve_scope(node.body, node.arguments)
+            return
+        if isinstance(node, VariableAccessNode):
+            node.slot = self.scope.get_slot(node.name.value)
+        elif isinstance(node, VariableAssignmentNode):
+            node.slot = self.scope.get_slot(node.name.value)
+            self._check_assignment(node)
+        for child in iter_child_nodes(node):
+            self._resolve_node(child)
+
+    def _check_assignment(self, node: VariableAssignmentNode):
+        value_type = self._get_static_type(node.value)
+        expected_type = str(node.type) if node.type is not None else self.scope.get_type(node.name.value)
+        if value_type is None or expected_type is None:
+            return
+        if value_type != expected_type:
+            if node.type is not None:
+                raise RunTimeError(node.type.pos_start, f'Expected type: {expected_type} got {value_type} instead.',
+                                   self.context)
+            raise RunTimeError(node.value.pos_start,
+                               f'Tried to put a value of type {value_type} to a variable of type {expected_type}',
+                               self.context)
+        node.check_type = False
+
+    def _get_static_type(self, node):
+        literal_type = LITERAL_TYPES.get(type(node))
+        if literal_type:
+            return literal_type
+        if isinstance(node, VariableAccessNode):
+            return self.scope.get_type(node.name.value)
+        if isinstance(node, CallFunctionNode):
+            return self.function_return_types.get(node.function_name.value)
+        if isinstance(node, UnaryOperationNode):
+            return self._get_unary_operation_type(node.operation.type, self._get_static_type(node.node))
+        if isinstance(node, BinaryOperationNode):
+            left = self._get_static_type(node.left)
+            right = self._get_static_type(node.right)
+            return self._get_binary_operation_type(node.operation.type, left, right)
+        return None
+
+    @staticmethod
+    def _get_unary_operation_type(operation, operand):
+        if operation == TokenType.T_MINUS and operand in ('int', 'double', 'string'):
+            return operand
+        if operation == TokenType.T_NOT and operand == 'bool':
+            return 'bool'
+        if operation == TokenType.T_PLUS:
+            return operand
+        return None
+
+    @staticmethod
+    def _get_binary_operation_type(operation, left, right):
+        if left is None or right is None:
+            return None
+        if operation in ARITHMETIC_OPERATIONS:
+            if left in NUMBER_TYPES and right in NUMBER_TYPES:
+                return 'int' if left == right == 'int' else 'double'
+            if left == right and left in ('unit', 'phys'):
+                return left
+            if 'phys[]' in (left, right) and {left, right} <= {'phys', 'phys[]'}:
+                return 'phys[]'
+            if operation in (TokenType.T_MUL, TokenType.T_DIV) and left == 'phys[]' and right in NUMBER_TYPES:
+                return 'phys[]'
+            if operation == TokenType.T_PLUS and left == right == 'string':
+                return 'string'
+            if operation == TokenType.T_MUL and {left, right} == {'int', 'string'}:
+                return 'string'
+            return None
+        if operation in ORDER_OPERATIONS:
+            return 'bool' if left in NUMBER_TYPES and right in NUMBER_TYPES else None
+        if operation in EQUALITY_OPERATIONS:
+            if (left in NUMBER_TYPES and right in NUMBER_TYPES) or left == right == 'string' \
+                    or left == right == 'phys' or left == 'unit':
+                return 'bool'
+            return None
+        if left == 'bool' and right in NUMBER_TYPES:
+            return 'bool'
+        return None
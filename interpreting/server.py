@@ -0,0 +1,92 @@
+import json
+import os
+import socketserver
+import sys
+from argparse import ArgumentParser
+
+from interpreting.interpreter import ENGINES, Evaluator
+
+DEFAULT_MEMORY_CACHE_SIZE = 256
+
+
+class EvaluationServer:
+    """
+    Evaluates programs sent as JSON lines with one warm Evaluator, so the imports, the compiled lexer regex,
+    the AST cache and the unit registry are reused by all requests. Every program runs in a fresh context.
+    A request is {"id": ..., "source": "<program>"} or {"id": ..., "file_path": "<path>"}, the response
+    is the id together with Result.to_dict(). Requests are served one at a time.
+    """
+    def __init__(self, evaluator: Evaluator):
+        self.evaluator = evaluator
+
+    def handle_line(self, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('Request must be a JSON object.')
+        except ValueError as e:
+            return {'id': None, 'ok': False, 'error': {'kind': 'request', 'message': str(e)}}
+        response = {'id': request.get('id')}
+        try:
+            response.update(self._evaluate(request))
+        except Exception as e:
+            response.update({'ok': False, 'error': {'kind': 'internal', 'message': f'{type(e).__name__}: {e}'}})
+        return response
+
+    def serve(self, lines, write):
+        for line in lines:
+            if line.strip():
+                write(json.dumps(self.handle_line(line)) + '\n')
+
+    def _evaluate(self, request):
+        if 'source' in request:
+            return self.evaluator.evaluate_source(request['source']).to_dict()
+        if 'file_path' in request:
+            with open(request['file_path'], encoding='utf-8') as source_file:
+                return self.evaluator.evaluate_source(source_file.read()).to_dict()
+        return {'ok': False, 'error': {'kind': 'request', 'message': 'Expected source or file_path.'}}
+
+
+def serve_stdio(server: EvaluationServer):
+    def write(response):
+        sys.stdout.write(response)
+        sys.stdout.flush()
+    server.serve(sys.stdin, write)
+
+
+def serve_unix_socket(server: EvaluationServer, socket_path):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def write(response):
+                self.wfile.write(response.encode())
+                self.wfile.flush()
+            server.serve((line.decode() for line in self.rfile), write)
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    with socketserver.UnixStreamServer(socket_path, Handler) as unix_server:
+        try:
+            unix_server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
+def main(args):
+    evaluator = Evaluator(args.cache_dir, args.engine, args.memoize, not args.no_optimize, args.memory_cache_size)
+    server = EvaluationServer(evaluator)
+    if args.socket:
+        serve_unix_socket(server, args.socket)
+    else:
+        serve_stdio(server)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--socket', type=str, default=None, required=False)
+    parser.add_argument('--cache_dir', type=str, default=None, required=False)
+    parser.add_argument('--memory_cache_size', type=int, default=DEFAULT_MEMORY_CACHE_SIZE, required=False)
+    parser.add_argument('--engine', type=str, choices=list(ENGINES), default='visitor')
+    parser.add_argument('--memoize', action='store_true')
+    parser.add_argument('--no_optimize', action='store_true')
+    args = parser.parse_args()
+    main(args)
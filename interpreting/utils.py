@@ -1,5 +1,22 @@
 from errors.error import RunTimeError
 from interpreting.values.function_values import FunctionDefinition
+from lexer.token.token_type import TokenType
+
+# names of the Value methods implementing binary operators, shared by the engines and the optimizer
+BINARY_OPERATIONS = {
+    TokenType.T_PLUS: 'add',
+    TokenType.T_MINUS: 'subtract',
+    TokenType.T_MUL: 'multiply',
+    TokenType.T_DIV: 'divide',
+    TokenType.T_LESS: 'is_less_than',
+    TokenType.T_LESS_OR_EQ: 'is_less_or_eq',
+    TokenType.T_GREATER: 'is_greater_than',
+    TokenType.T_GREATER_OR_EQ: 'is_greater_or_eq',
+    TokenType.T_EQ: 'is_equal',
+    TokenType.T_NOT_EQ: 'is_not_equal',
+    TokenType.T_AND: 'and_',
+    TokenType.T_OR: 'or_',
+}
 
 
 def check_argument_correctness(function: FunctionDefinition, actual_arguments, context):
@@ -23,9 +40,21 @@ def check_argument_types(function: FunctionDefinition, actual_arguments, context
 
 
 def check_return_type(function: FunctionDefinition, result, context):
-    if str(function.return_type) == 'void' and result.type_ is not None:
+    # functions ending without a return value give None, which only matches void
+    result_type = result.type_ if result is not None else 'void'
+    if result_type != str(function.return_type.type):
         raise RunTimeError(function.return_type.pos_start,
-                           f'Expected return type: {str(function.return_type)} got {result.type_}', context)
-    elif result.type_ != str(function.return_type.type):
-        raise RunTimeError(function.return_type.pos_start,
-                           f'Expected return type: {str(function.return_type)} got {result.type_}', context)
+                           f'Expected return type: {str(function.return_type)} got {result_type}', context)
+
+
+def check_slot_assignment(variable_name, current_value, value, value_position, expected_type, check_type, context):
+    if expected_type is None:
+        if current_value is None:
+            raise RunTimeError(variable_name.pos_start, f'{variable_name.value} not defined.', context)
+        if check_type and current_value.type_ != value.type_:
+            raise RunTimeError(value_position,
+                               f'Tried to put a value of type {value.type_}'
+                               f' to a variable of type {current_value.type_}', context)
+    elif check_type and value and not value.type_ == str(expected_type):
+        raise RunTimeError(expected_type.pos_start,
+                           f'Expected type: {str(expected_type)} got {value.type_} instead.', context)
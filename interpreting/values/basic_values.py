@@ -1,251 +1,272 @@
-from errors.error import RunTimeError
+from errors.error import OperationError
+
+SMALL_INT_MIN = -256
+SMALL_INT_MAX = 1024
 
 
 class Value:
+    """
+    Immutable result of an expression. Values carry neither a position nor a context, so a variable read returns
+    the stored object itself. Operations that are not defined raise OperationError, which the interpreters report
+    at the position of the operand.
+    Attributes cannot be assigned after construction, since small ints, TRUE and FALSE are shared by all programs.
+    """
+    __slots__ = ('value',)
     type_ = None
 
-    def __init__(self, value, pos_start=None, pos_end=None, context=None):
-        self.value = value
-        self.pos_start = pos_start
-        self.pos_end = pos_end
-        self.context = context
+    def __init__(self, value):
+        _set_value(self, value)
 
-    def __repr__(self):
-        return str(self.value)
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
 
-    def set_position(self, pos_start, pos_end):
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+    def __reduce__(self):
+        return type(self), (self.value,)
 
-    def set_context(self, context):
-        self.context = context
+    def __repr__(self):
+        return str(self.value)
 
     def add(self, other):
-        self._raise_runtime_error_for_action('+', other)
+        self._raise_operation_error('+', other)
 
     def subtract(self, other):
-        self._raise_runtime_error_for_action('-', other)
+        self._raise_operation_error('-', other)
 
     def multiply(self, other):
-        self._raise_runtime_error_for_action('*', other)
+        self._raise_operation_error('*', other)
 
     def divide(self, other):
-        self._raise_runtime_error_for_action('/', other)
+        self._raise_operation_error('/', other)
 
     def is_equal(self, other):
-        self._raise_runtime_error_for_action('==', other)
+        self._raise_operation_error('==', other)
 
     def is_not_equal(self, other):
-        self._raise_runtime_error_for_action('!=', other)
+        self._raise_operation_error('!=', other)
 
     def is_greater_than(self, other):
-        self._raise_runtime_error_for_action('>', other)
+        self._raise_operation_error('>', other)
 
     def is_less_than(self, other):
-        self._raise_runtime_error_for_action('<', other)
+        self._raise_operation_error('<', other)
 
     def is_greater_or_eq(self, other):
-        self._raise_runtime_error_for_action('>=', other)
+        self._raise_operation_error('>=', other)
 
     def is_less_or_eq(self, other):
-        self._raise_runtime_error_for_action('<=', other)
+        self._raise_operation_error('<=', other)
 
-    def _raise_runtime_error_for_action(self, operator, other):
-        raise RunTimeError(self.pos_start,
-                           f'{operator} not defined for type {self.type_} and {other.type_}', self.context)
+    def _raise_operation_error(self, operator, other):
+        raise OperationError(f'{operator} not defined for type {self.type_} and {other.type_}')
 
     def and_(self, other):
-        self._raise_runtime_error_for_action('and', other)
+        self._raise_operation_error('and', other)
 
     def or_(self, other):
-        self._raise_runtime_error_for_action('or', other)
+        self._raise_operation_error('or', other)
+
+    def apply_reflected(self, operator, other):
+        """
+        Computes other <operator> self for a left operand that does not know the type of self.
+        """
+        other._raise_operation_error(operator, self)
 
     def not_(self):
-        raise RunTimeError(self.pos_start, f"'not' not defined for type: {self.type_}", self.context)
+        raise OperationError(f"'not' not defined for type: {self.type_}")
 
 
 class Number(Value):
-    def __init__(self, value, pos_start=None, pos_end=None, context=None):
-        super().__init__(value, pos_start, pos_end, context)
+    __slots__ = ()
 
     def is_equal(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value == other.value, self.context)
+            return TRUE if self.value == other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('==', other)
+            self._raise_operation_error('==', other)
 
     def is_not_equal(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value != other.value, self.context)
+            return TRUE if self.value != other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('!=', other)
+            self._raise_operation_error('!=', other)
 
     def is_greater_than(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value > other.value, self.pos_start, self.pos_end, self.context)
+            return TRUE if self.value > other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('>', other)
+            self._raise_operation_error('>', other)
 
     def is_less_or_eq(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value <= other.value, self.pos_start, self.pos_end, self.context)
+            return TRUE if self.value <= other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('<=', other)
+            self._raise_operation_error('<=', other)
 
     def is_less_than(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value < other.value, self.pos_start, self.pos_end, self.context)
+            return TRUE if self.value < other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('<', other)
+            self._raise_operation_error('<', other)
 
     def is_greater_or_eq(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value >= other.value, self.pos_start, self.pos_end, self.context)
+            return TRUE if self.value >= other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('>=', other)
+            self._raise_operation_error('>=', other)
 
 
 class IntValue(Number):
+    __slots__ = ()
     type_ = 'int'
 
-    def __init__(self, value, pos_start=None, pos_end=None, context=None):
-        value = int(value) if value else None
-        super().__init__(value, pos_start, pos_end, context)
+    def __init__(self, value):
+        super().__init__(int(value) if value is not None else None)
 
     def add(self, other):
         if isinstance(other, IntValue):
-            return IntValue(self.value + other.value, context=self.context)
+            return int_value(self.value + other.value)
         elif isinstance(other, DoubleValue):
-            return DoubleValue(self.value + other.value, context=self.context)
+            return DoubleValue(self.value + other.value)
         else:
-            raise self._raise_runtime_error_for_action('+', other)
+            raise self._raise_operation_error('+', other)
 
     def subtract(self, other):
         if isinstance(other, IntValue):
-            return IntValue(self.value - other.value, context=self.context)
+            return int_value(self.value - other.value)
         elif isinstance(other, DoubleValue):
-            return DoubleValue(self.value - other.value, context=self.context)
+            return DoubleValue(self.value - other.value)
         else:
-            raise self._raise_runtime_error_for_action('-', other)
+            raise self._raise_operation_error('-', other)
 
     def multiply(self, other):
         if isinstance(other, IntValue):
-            return IntValue(self.value * other.value, context=self.context)
+            return int_value(self.value * other.value)
         elif isinstance(other, DoubleValue):
-            return DoubleValue(self.value * other.value, context=self.context)
+            return DoubleValue(self.value * other.value)
         elif isinstance(other, StringValue):
-            return StringValue(self.value * other.value, context=self.context)
+            return StringValue(self.value * other.value)
         else:
-            raise self._raise_runtime_error_for_action('*', other)
+            return other.apply_reflected('*', self)
 
     def divide(self, other):
         if isinstance(other, IntValue):
             if other.value == 0:
-                raise RunTimeError(other.pos_start, 'Division by zero.', self.context)
-            return IntValue(self.value // other.value, context=self.context)
+                raise OperationError('Division by zero.', on_right=True)
+            return int_value(self.value // other.value)
         elif isinstance(other, DoubleValue):
-            return DoubleValue(self.value / other.value, context=self.context)
+            if other.value == 0:
+                raise OperationError('Division by zero.', on_right=True)
+            return DoubleValue(self.value / other.value)
         else:
-            raise self._raise_runtime_error_for_action('/', other)
-
-    def copy(self):
-        return IntValue(self.value, self.pos_start, self.pos_end, self.context)
+            raise self._raise_operation_error('/', other)
 
 
 class DoubleValue(Number):
+    __slots__ = ()
     type_ = 'double'
 
-    def __init__(self, value, pos_start=None, pos_end=None, context=None):
-        value = float(value) if value else None
-        super().__init__(value, pos_start, pos_end, context)
+    def __init__(self, value):
+        super().__init__(float(value) if value is not None else None)
 
     def add(self, other):
         if isinstance(other, Number):
-            return DoubleValue(self.value + other.value, context=self.context)
+            return DoubleValue(self.value + other.value)
         else:
-            raise self._raise_runtime_error_for_action('+', other)
+            raise self._raise_operation_error('+', other)
 
     def subtract(self, other):
         if isinstance(other, Number):
-            return DoubleValue(self.value - other.value, context=self.context)
+            return DoubleValue(self.value - other.value)
         else:
-            raise self._raise_runtime_error_for_action('-', other)
+            raise self._raise_operation_error('-', other)
 
     def multiply(self, other):
         if isinstance(other, Number):
-            return DoubleValue(self.value * other.value, context=self.context)
+            return DoubleValue(self.value * other.value)
         else:
-            raise self._raise_runtime_error_for_action('*', other)
+            return other.apply_reflected('*', self)
 
     def divide(self, other):
         if isinstance(other, Number):
             if other.value == 0:
-                raise RunTimeError(other.pos_start, 'Division by zero.', self.context)
-            return DoubleValue(self.value / other.value, context=self.context)
+                raise OperationError('Division by zero.', on_right=True)
+            return DoubleValue(self.value / other.value)
         else:
-            raise self._raise_runtime_error_for_action('/', other)
-
-    def copy(self):
-        return DoubleValue(self.value, self.pos_start, self.pos_end, self.context)
+            raise self._raise_operation_error('/', other)
 
 
 class BoolValue(Value):
+    __slots__ = ()
     type_ = 'bool'
 
-    def __init__(self, value, pos_start=None, pos_end=None, context=None):
-        super().__init__(value, pos_start, pos_end, context)
+    def __reduce__(self):
+        return bool_value, (self.value,)
 
     def __repr__(self):
         return 'true' if self.value else 'false'
 
     def and_(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value and other.value, self.pos_start, self.pos_end, self.context)
+            return TRUE if self.value and other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('and', other)
+            self._raise_operation_error('and', other)
 
     def or_(self, other):
         if isinstance(other, Number):
-            return BoolValue(self.value or other.value, self.pos_start, self.pos_end, self.context)
+            return TRUE if self.value or other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('or', other)
+            self._raise_operation_error('or', other)
 
     def not_(self):
-        return BoolValue(not self.value, self.pos_start, self.pos_end, self.context)
-
-    def copy(self):
-        return BoolValue(self.value, self.pos_start, self.pos_end, self.context)
+        return FALSE if self.value else TRUE
 
 
 class StringValue(Value):
+    __slots__ = ()
     type_ = 'string'
 
-    def __init__(self, value, pos_start=None, pos_end=None, context=None):
-        super().__init__(value, pos_start, pos_end, context)
-
     def add(self, other):
         if isinstance(other, StringValue):
-            return StringValue(self.value + other.value, context=self.context)
-        self._raise_runtime_error_for_action('+', other)
+            return StringValue(self.value + other.value)
+        self._raise_operation_error('+', other)
 
     def multiply(self, other):
         if isinstance(other, IntValue):
-            return StringValue(self.value * other.value, context=self.context)
-        self._raise_runtime_error_for_action('*', other)
+            return StringValue(self.value * other.value)
+        self._raise_operation_error('*', other)
 
     def is_equal(self, other):
         if isinstance(other, StringValue):
-            return BoolValue(self.value == other.value, context=self.context)
+            return TRUE if self.value == other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('==', other)
+            self._raise_operation_error('==', other)
 
     def is_not_equal(self, other):
         if isinstance(other, StringValue):
-            return BoolValue(self.value != other.value, context=self.context)
+            return TRUE if self.value != other.value else FALSE
         else:
-            self._raise_runtime_error_for_action('!=', other)
+            self._raise_operation_error('!=', other)
+
+
+def int_value(value):
+    """
+    Returns the shared IntValue for ints from SMALL_INT_MIN to SMALL_INT_MAX and a new one for other ints.
+    """
+    if SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return SMALL_INTS[value - SMALL_INT_MIN]
+    return IntValue(value)
+
+
+def bool_value(condition):
+    return TRUE if condition else FALSE
 
-    def copy(self):
-        return StringValue(self.value, self.pos_start, self.pos_end, self.context)
 
+# writes the slot directly, Value.__setattr__ rejects every assignment
+_set_value = Value.value.__set__
 
+TRUE = BoolValue(True)
+FALSE = BoolValue(False)
+SMALL_INTS = [IntValue(value) for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
@@ -1,6 +1,7 @@
 class FunctionDefinition:
-    def __init__(self, name, arguments, body, return_type_node, pos_start, pos_end):
+    def __init__(self, name, arguments, body, return_type_node, pos_start, pos_end, is_pure=False):
         self.name = name
+        self.is_pure = is_pure
         self.body = body
         self.return_type = return_type_node
         self.pos_start = pos_start
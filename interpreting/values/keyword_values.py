@@ -2,8 +2,7 @@ from interpreting.values.basic_values import Value
 
 
 class KeywordValue(Value):
-    def __init__(self, value, pos_start=None, pos_end=None, context=None):
-        super().__init__(value, pos_start, pos_end, context)
+    __slots__ = ()
 
     def __eq__(self, other):
         if isinstance(other, KeywordValue):
@@ -13,6 +12,12 @@ class KeywordValue(Value):
 
 
 class ReturnValue(KeywordValue):
-    def __init__(self, value, pos_start, pos_end):
-        super().__init__(value, pos_start, pos_end)
-        self.type = value.type_
\ No newline at end of file
+    __slots__ = ('type',)
+
+    def __init__(self, value):
+        super().__init__(value)
+        object.__setattr__(self, 'type', value.type_ if value is not None else None)
+
+
+def unwrap_return_value(value):
+    return value.value if isinstance(value, ReturnValue) else value
@@ -1,141 +1,351 @@
-from collections import defaultdict
+from collections import OrderedDict
+from collections.abc import Mapping
+from weakref import WeakValueDictionary
 
-from errors.error import RunTimeError
-from interpreting.values.basic_values import Value, BoolValue
+from errors.error import OperationError
+from interpreting.values.basic_values import Value, Number, bool_value, _set_value
+
+try:
+    import numpy
+except ImportError:  # phys[] values are only available with numpy installed
+    numpy = None
+
+DEFAULT_UNIT_CACHE_SIZE = 256
+
+
+class UnitOperationCache:
+    """
+    Bounded LRU cache of unit products, quotients and representations. Keys hold the interned units themselves,
+    so a lookup hashes object identities and cached units stay alive while they are in the cache.
+    """
+    def __init__(self, max_size=DEFAULT_UNIT_CACHE_SIZE):
+        self.max_size = max_size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        result = self.results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.results[key] = result
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def statistics(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results),
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+UNIT_CACHE = UnitOperationCache()
 
 
 class UnitValue(Value):
+    """
+    Physical unit stored as a canonical tuple of (base unit, exponent) pairs sorted by base unit, without zero
+    exponents. Units are interned: constructing a unit that is still alive returns the existing object, so equal
+    units are identical and comparing them is an identity check.
+    """
+    __slots__ = ('__weakref__',)
     type_ = 'unit'
+    _interned = WeakValueDictionary()
 
-    def __init__(self, value: defaultdict, pos_start, pos_end, context=None):
-        super().__init__(value, pos_start, pos_end, context)
-        self.reduce()
+    def __new__(cls, fraction=()):
+        exponents = fraction.items() if isinstance(fraction, Mapping) else fraction
+        key = tuple(sorted((base, power) for base, power in exponents if power != 0))
+        unit = cls._interned.get(key)
+        if unit is None:
+            unit = super().__new__(cls)
+            _set_value(unit, key)
+            cls._interned[key] = unit
+        return unit
+
+    def __init__(self, fraction=()):
+        pass
+
+    def __reduce__(self):
+        return UnitValue, (self.value,)
 
     def add(self, other):
         if isinstance(other, UnitValue):
-            return UnitValue(self.value, self.pos_start, other.pos_end, context=self.context)
+            return self
         else:
-            raise self._raise_runtime_error_for_action('+', other)
+            raise self._raise_operation_error('+', other)
 
     def subtract(self, other):
         if isinstance(other, UnitValue):
-            return UnitValue(self.value, self.pos_start, other.pos_end, context=self.context)
+            return self
         else:
-            raise self._raise_runtime_error_for_action('-', other)
+            raise self._raise_operation_error('-', other)
 
     def multiply(self, other):
         if isinstance(other, UnitValue):
-            product = self.value.copy()
-            for key in other.value:
-                product[key] += other.value.get(key, 0)
-            return UnitValue(product, self.pos_start, self.pos_end, context=self.context).reduce()
+            key = ('*', self, other)
+            result = UNIT_CACHE.get(key)
+            if result is None:
+                result = UNIT_CACHE.put(key, UnitValue(_merge_exponents(self.value, other.value, 1)))
+            return result
         else:
-            raise self._raise_runtime_error_for_action('*', other)
+            raise self._raise_operation_error('*', other)
 
     def divide(self, other):
         if isinstance(other, UnitValue):
-            product = self.value.copy()
-            for key in other.value:
-                product[key] -= other.value.get(key, 0)
-            return UnitValue(product, self.pos_start, self.pos_end, context=self.context).reduce()
+            key = ('/', self, other)
+            result = UNIT_CACHE.get(key)
+            if result is None:
+                result = UNIT_CACHE.put(key, UnitValue(_merge_exponents(self.value, other.value, -1)))
+            return result
         else:
-            raise self._raise_runtime_error_for_action('/', other)
-
-    def reduce(self):
-        self.value = defaultdict(int, {key: value for key, value in self.value.items() if self.value[key] != 0})
-        return self
-
-    def copy(self):
-        return UnitValue(self.value, self.pos_start, self.pos_end, self.context)
+            raise self._raise_operation_error('/', other)
 
     def __repr__(self):
-        result = '('
-        nominator = [key for key in self.value if self.value[key] > 0]
-        denominator = [key for key in self.value if self.value[key] < 0]
-        nominator_exists = True if len(nominator) else False
-        denominator_exists = True if len(denominator) else False
-        if nominator_exists and not denominator_exists:
-            for key in nominator:
-                result += f'{key}^{self.value[key]}'
-            return result + ')'
-        elif nominator_exists and denominator_exists:
-            for key in nominator:
-                result += f'{key}^{self.value[key]}'
-            result += '/'
-            for key in denominator:
-                result += f'{key}^{-self.value[key]}'
-            return result + ')'
-        elif denominator_exists and not nominator_exists:
-            result += '1/'
-            for key in denominator:
-                result += f'{key}^{-self.value[key]}'
-            return result + ')'
-        else:
-            return result + ')'
+        key = ('repr', self)
+        result = UNIT_CACHE.get(key)
+        if result is None:
+            result = UNIT_CACHE.put(key, self._format())
+        return result
+
+    def _format(self):
+        nominator = ''.join(f'{base}^{power}' for base, power in self.value if power > 0)
+        denominator = ''.join(f'{base}^{-power}' for base, power in self.value if power < 0)
+        if denominator:
+            return f'({nominator or 1}/{denominator})'
+        return f'({nominator})'
 
     def is_equal(self, other):
-        return BoolValue(self.value == other.value, context=self.context)
+        return bool_value(self is other)
 
     def is_not_equal(self, other):
-        return BoolValue(self.value != other.value, context=self.context)
+        return bool_value(self is not other)
+
+
+def _merge_exponents(left, right, sign):
+    """
+    Merges two sorted exponent tuples in one pass, adding the right exponents multiplied by sign.
+    """
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i][0] < right[j][0]:
+            merged.append(left[i])
+            i += 1
+        elif left[i][0] > right[j][0]:
+            merged.append((right[j][0], sign * right[j][1]))
+            j += 1
+        else:
+            merged.append((left[i][0], left[i][1] + sign * right[j][1]))
+            i += 1
+            j += 1
+    merged.extend(left[i:])
+    merged.extend((base, sign * power) for base, power in right[j:])
+    return merged
 
 
 class PhysValue(Value):
+    __slots__ = ('unit',)
     type_ = 'phys'
 
-    def __init__(self, value, unit: UnitValue, pos_start=None, pos_end=None, context=None):
-        super().__init__(value, pos_start, pos_end, context)
-        self.unit = unit
+    def __init__(self, value, unit: UnitValue):
+        super().__init__(value)
+        object.__setattr__(self, 'unit', unit)
+
+    def __reduce__(self):
+        return type(self), (self.value, self.unit)
 
     def add(self, other):
         if isinstance(other, PhysValue):
-            if self.unit.is_equal(other.unit):
+            if self.unit is other.unit:
                 sum = self.value.add(other.value)
-                return PhysValue(sum, self.unit, self.pos_start, other.pos_end, context=self.context)
+                return PhysValue(sum, self.unit)
             else:
-                raise RunTimeError(self.pos_start, f"Tried to add Phys with units: {self.unit}, {other.unit}",
-                                   self.context)
+                raise OperationError(f"Tried to add Phys with units: {self.unit}, {other.unit}")
+        elif isinstance(other, PhysArrayValue):
+            return other.apply_reflected('+', self)
         else:
-            raise self._raise_runtime_error_for_action('+', other)
+            raise self._raise_operation_error('+', other)
 
     def subtract(self, other):
         if isinstance(other, PhysValue):
-            if self.unit.is_equal(other.unit):
+            if self.unit is other.unit:
                 difference = self.value.subtract(other.value)
-                return PhysValue(difference, self.unit, self.pos_start, other.pos_end, context=self.context)
+                return PhysValue(difference, self.unit)
             else:
-                raise RunTimeError(self.pos_start, f"Tried to subtract Phys with units: {self.unit}, {other.unit}",
-                                   self.context)
+                raise OperationError(f"Tried to subtract Phys with units: {self.unit}, {other.unit}")
+        elif isinstance(other, PhysArrayValue):
+            return other.apply_reflected('-', self)
         else:
-            raise self._raise_runtime_error_for_action('-', other)
+            raise self._raise_operation_error('-', other)
 
     def multiply(self, other):
         if isinstance(other, PhysValue):
             value_product = self.value.multiply(other.value)
             unit_product = self.unit.multiply(other.unit)
-            return PhysValue(value_product, unit_product, self.pos_start, self.pos_end, context=self.context)
+            return PhysValue(value_product, unit_product)
+        elif isinstance(other, PhysArrayValue):
+            return other.apply_reflected('*', self)
         else:
-            raise self._raise_runtime_error_for_action('*', other)
+            raise self._raise_operation_error('*', other)
 
     def divide(self, other):
         if isinstance(other, PhysValue):
             value_quotient = self.value.divide(other.value)
             unit_quotient = self.unit.divide(other.unit)
-            return PhysValue(value_quotient, unit_quotient, self.pos_start, self.pos_end, context=self.context)
+            return PhysValue(value_quotient, unit_quotient)
+        elif isinstance(other, PhysArrayValue):
+            return other.apply_reflected('/', self)
         else:
-            raise self._raise_runtime_error_for_action('/', other)
+            raise self._raise_operation_error('/', other)
+
+    def is_equal(self, other):
+        if isinstance(other, PhysArrayValue):
+            return other.is_equal(self)
+        elif not isinstance(other, PhysValue):
+            self._raise_operation_error('==', other)
+        is_eq = self.value.is_equal(other.value).value and self.unit is other.unit
+        return bool_value(is_eq)
 
-    def copy(self):
-        return PhysValue(self.value, self.unit, self.pos_start, self.pos_end, self.context)
+    def is_not_equal(self, other):
+        if isinstance(other, PhysArrayValue):
+            return other.is_not_equal(self)
+        elif not isinstance(other, PhysValue):
+            self._raise_operation_error('!=', other)
+        is_not_eq = not self.value.is_equal(other.value).value or self.unit is not other.unit
+
+        return bool_value(is_not_eq)
+
+    def __repr__(self):
+        return f'{self.value}*{self.unit}'
+
+
+class PhysArrayValue(Value):
+    """
+    Series of numbers sharing one unit, held in a float64 NumPy buffer. Arithmetic and comparisons run on the whole
+    buffer at once, so the units are checked once per operation instead of once per element. The other operand can
+    be a phys[] of the same length or a single phys, and * and / also take an int or double scale factor.
+    Comparisons are true when they hold for every element. Requires the optional numpy package.
+    """
+    __slots__ = ('unit',)
+    type_ = 'phys[]'
+
+    def __init__(self, value, unit: UnitValue):
+        # the buffer is shared by every variable holding the value, so it is made read-only too
+        value.flags.writeable = False
+        super().__init__(value)
+        object.__setattr__(self, 'unit', unit)
+
+    def __reduce__(self):
+        return type(self), (self.value, self.unit)
+
+    @staticmethod
+    def from_values(values, unit: UnitValue):
+        if numpy is None:
+            raise OperationError('phys[] values require numpy, which is not installed.')
+        for value in values:
+            if not isinstance(value, Number):
+                raise OperationError(f'phys[] elements must be int or double, got {value.type_}')
+        return PhysArrayValue(numpy.array([value.value for value in values], dtype=numpy.float64), unit)
+
+    def add(self, other):
+        return self._add_or_subtract('+', other, reflected=False)
+
+    def subtract(self, other):
+        return self._add_or_subtract('-', other, reflected=False)
+
+    def multiply(self, other):
+        if isinstance(other, Number):
+            return PhysArrayValue(self.value * other.value, self.unit)
+        return self._multiply_or_divide('*', other, reflected=False)
+
+    def divide(self, other):
+        if isinstance(other, Number):
+            if other.value == 0:
+                raise OperationError('Division by zero.', on_right=True)
+            return PhysArrayValue(self.value / other.value, self.unit)
+        return self._multiply_or_divide('/', other, reflected=False)
+
+    def apply_reflected(self, operator, other):
+        """
+        Computes other <operator> self for a phys or a scale factor on the left side.
+        """
+        if operator == '*' and isinstance(other, Number):
+            return self.multiply(other)
+        if operator in ('+', '-'):
+            return self._add_or_subtract(operator, other, reflected=True)
+        return self._multiply_or_divide(operator, other, reflected=True)
 
     def is_equal(self, other):
-        is_eq = self.value.is_equal(other.value).value and self.unit.is_equal(other.unit).value
-        return BoolValue(is_eq, context=self.context)
+        return bool_value(self._equals(other))
 
     def is_not_equal(self, other):
-        is_not_eq = not self.value.is_equal(other.value).value or not self.unit.is_equal(other.unit).value
+        return bool_value(not self._equals(other))
+
+    def is_greater_than(self, other):
+        return self._compare('>', numpy.greater, other)
+
+    def is_less_than(self, other):
+        return self._compare('<', numpy.less, other)
+
+    def is_greater_or_eq(self, other):
+        return self._compare('>=', numpy.greater_equal, other)
 
-        return BoolValue(is_not_eq, context=self.context)
+    def is_less_or_eq(self, other):
+        return self._compare('<=', numpy.less_equal, other)
 
     def __repr__(self):
-        return f'{self.value}*{self.unit}'
\ No newline at end of file
+        return f'[{", ".join(str(element) for element in self.value.tolist())}]*{self.unit}'
+
+    def _add_or_subtract(self, operator, other, reflected):
+        left, right = self._get_buffers(operator, other, reflected)
+        if self.unit is not other.unit:
+            left_unit, right_unit = (other.unit, self.unit) if reflected else (self.unit, other.unit)
+            raise OperationError(f"Tried to {'add' if operator == '+' else 'subtract'} phys[] with units: "
+                                 f"{left_unit}, {right_unit}")
+        return PhysArrayValue(left + right if operator == '+' else left - right, self.unit)
+
+    def _multiply_or_divide(self, operator, other, reflected):
+        left, right = self._get_buffers(operator, other, reflected)
+        left_unit, right_unit = (other.unit, self.unit) if reflected else (self.unit, other.unit)
+        if operator == '*':
+            return PhysArrayValue(left * right, left_unit.multiply(right_unit))
+        if not numpy.all(right):
+            raise OperationError('Division by zero.', on_right=True)
+        return PhysArrayValue(left / right, left_unit.divide(right_unit))
+
+    def _equals(self, other):
+        if isinstance(other, (PhysValue, PhysArrayValue)) and self.unit is not other.unit:
+            return False
+        if isinstance(other, PhysArrayValue) and len(other.value) != len(self.value):
+            return False
+        left, right = self._get_buffers('==', other, reflected=False)
+        return bool(numpy.all(left == right))
+
+    def _compare(self, operator, comparison, other):
+        left, right = self._get_buffers(operator, other, reflected=False)
+        if self.unit is not other.unit:
+            raise OperationError(f'Tried to compare phys[] with units: {self.unit}, {other.unit}')
+        return bool_value(bool(numpy.all(comparison(left, right))))
+
+    def _get_buffers(self, operator, other, reflected):
+        if isinstance(other, PhysArrayValue):
+            if len(other.value) != len(self.value):
+                raise OperationError(f'{operator} needs phys[] values of equal length, '
+                                     f'got {len(self.value)} and {len(other.value)}')
+            other_buffer = other.value
+        elif isinstance(other, PhysValue):
+            other_buffer = other.value.value
+        else:
+            self._raise_operation_error(operator, other)
+        return (other_buffer, self.value) if reflected else (self.value, other_buffer)
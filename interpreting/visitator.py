@@ -1,56 +1,72 @@
-from errors.error import RunTimeError, run_with_exception_safety
+from errors.error import RunTimeError, OperationError, run_with_exception_safety
 from interpreting.context import ContextManager
+from interpreting.memoization import MISSING, FunctionResultCache
 from interpreting.utils import check_argument_correctness, check_return_type
-from interpreting.values.basic_values import IntValue, DoubleValue, BoolValue, StringValue
-from interpreting.values.keyword_values import KeywordValue, ReturnValue
-from interpreting.values.physical_values import UnitValue, PhysValue
+from interpreting.values.basic_values import IntValue, DoubleValue, BoolValue, StringValue, TRUE, FALSE, \
+    int_value
+from interpreting.values.keyword_values import KeywordValue, ReturnValue, unwrap_return_value
+from interpreting.values.physical_values import UnitValue, PhysValue, PhysArrayValue
 from interpreting.values.function_values import FunctionDefinition, FunctionArgument
 from lexer.token.token_type import TokenType
+from parsing import nodes
 from parsing.nodes import *
 
+VISIT_METHOD_PREFIX = '_visit_'
+MINUS_ONE = int_value(-1)
+
 
 class Visitator:
-    def __init__(self):
+    def __init__(self, memoize=False):
         self.context_manager = ContextManager()
+        self.visit_methods = self._build_visit_methods()
+        self.function_cache = FunctionResultCache() if memoize else None
 
+    @run_with_exception_safety
     def perform_visiting(self, ast_root):
-        return self._visit(ast_root)
+        if self.function_cache:
+            self.function_cache.analyze(ast_root)
+        return unwrap_return_value(self._visit(ast_root))
+
+    def _build_visit_methods(self):
+        visit_methods = {}
+        for method_name in dir(type(self)):
+            if method_name.startswith(VISIT_METHOD_PREFIX):
+                node_type = getattr(nodes, method_name[len(VISIT_METHOD_PREFIX):], None)
+                if isinstance(node_type, type):
+                    visit_methods[node_type] = getattr(self, method_name)
+        return visit_methods
 
-    @run_with_exception_safety
     def _visit(self, node):
-        node_name = type(node).__name__
-        visit_method_name = f'_visit_{node_name}'
-        visit_method = getattr(self, visit_method_name, self._visit_not_found)
-        return visit_method(node)
+        return self.visit_methods.get(type(node), self._visit_not_found)(node)
 
     def _visit_IntNode(self, node: IntNode):
-        return IntValue(node.token.value, node.pos_start, node.pos_end, self.context_manager.current_context)
+        return int_value(node.token.value)
 
     def _visit_DoubleNode(self, node: DoubleNode):
-        return DoubleValue(node.token.value, node.pos_start, node.pos_end, self.context_manager.current_context)
+        return DoubleValue(node.token.value)
 
     def _visit_StringNode(self, node: StringNode):
-        return StringValue(node.token.value, node.pos_start, node.pos_end, self.context_manager.current_context)
+        return StringValue(node.token.value)
 
     def _visit_StatementsNode(self, node: StatementsNode):
         result = None
         for statement in node.statements:
             result = self._visit(statement)
-            if isinstance(result, ReturnValue):
-                return result.value
-            elif isinstance(result, KeywordValue):
+            if isinstance(result, KeywordValue):
                 return result
-        if isinstance(result, (IntValue, StringValue, DoubleValue, BoolValue, KeywordValue, UnitValue, PhysValue)):
+        if isinstance(result, (IntValue, StringValue, DoubleValue, BoolValue, KeywordValue, UnitValue, PhysValue,
+                               PhysArrayValue)):
             return result
 
-    def visit_UnaryOperationNode(self, node: UnaryOperationNode):
+    def _visit_UnaryOperationNode(self, node: UnaryOperationNode):
         value = self._visit(node.node)
-
-        if node.operation.type == TokenType.T_MINUS:
-            value = value.multiply(IntValue(-1))
-        elif node.operation.type == TokenType.T_NOT:
-            value = value.not_()
-        value.set_position(node.pos_start, node.pos_end)
+        try:
+            if node.operation.type == TokenType.T_MINUS:
+                value = value.multiply(MINUS_ONE)
+            elif node.operation.type == TokenType.T_NOT:
+                value = value.not_()
+        except OperationError as e:
+            raise e.at(node.node.pos_start, node.node.pos_start, self.context_manager.current_context) from e
         return value
 
     def _visit_BinaryOperationNode(self, node: BinaryOperationNode):
@@ -58,48 +74,45 @@ class Visitator:
         right = self._visit(node.right)
         operation = node.operation
         result = None
-        if operation.type == TokenType.T_PLUS:
-            result = left.add(right)
-        elif operation.type == TokenType.T_MINUS:
-            result = left.subtract(right)
-        elif operation.type == TokenType.T_MUL:
-            result = left.multiply(right)
-        elif operation.type == TokenType.T_DIV:
-            result = left.divide(right)
-        elif operation.type == TokenType.T_LESS:
-            result = left.is_less_than(right)
-        elif operation.type == TokenType.T_LESS_OR_EQ:
-            result = left.is_less_or_eq(right)
-        elif operation.type == TokenType.T_GREATER:
-            result = left.is_greater_than(right)
-        elif operation.type == TokenType.T_GREATER_OR_EQ:
-            result = left.is_greater_or_eq(right)
-        elif operation.type == TokenType.T_EQ:
-            result = left.is_equal(right)
-        elif operation.type == TokenType.T_NOT_EQ:
-            result = left.is_not_equal(right)
-        elif operation.type == TokenType.T_AND:
-            result = left.and_(right)
-        elif operation.type == TokenType.T_OR:
-            result = left.or_(right)
-        result.set_position(node.pos_start, node.pos_end)
+        try:
+            if operation.type == TokenType.T_PLUS:
+                result = left.add(right)
+            elif operation.type == TokenType.T_MINUS:
+                result = left.subtract(right)
+            elif operation.type == TokenType.T_MUL:
+                result = left.multiply(right)
+            elif operation.type == TokenType.T_DIV:
+                result = left.divide(right)
+            elif operation.type == TokenType.T_LESS:
+                result = left.is_less_than(right)
+            elif operation.type == TokenType.T_LESS_OR_EQ:
+                result = left.is_less_or_eq(right)
+            elif operation.type == TokenType.T_GREATER:
+                result = left.is_greater_than(right)
+            elif operation.type == TokenType.T_GREATER_OR_EQ:
+                result = left.is_greater_or_eq(right)
+            elif operation.type == TokenType.T_EQ:
+                result = left.is_equal(right)
+            elif operation.type == TokenType.T_NOT_EQ:
+                result = left.is_not_equal(right)
+            elif operation.type == TokenType.T_AND:
+                result = left.and_(right)
+            elif operation.type == TokenType.T_OR:
+                result = left.or_(right)
+        except OperationError as e:
+            raise e.at(node.left.pos_start, node.right.pos_start, self.context_manager.current_context) from e
         return result
 
     def _visit_VariableAccessNode(self, node: VariableAccessNode):
-        variable_name = node.name
-        value = self.context_manager.get_variable(variable_name)
-        value = value.copy()
-        value.set_position(node.pos_start, node.pos_end)
-        return value
+        return self.context_manager.get_variable(node.name)
 
     def _visit_VariableAssignmentNode(self, node: VariableAssignmentNode):
         variable_name = node.name
         value = self._visit(node.value)
-        self.context_manager.add_variable(variable_name, value, node.type)
+        self.context_manager.add_variable(variable_name, value, node.type, node.value.pos_start)
 
     def _visit_BoolNode(self, node: BoolNode):
-        return BoolValue(True if node.token.type == TokenType.T_TRUE else False, node.pos_start, node.pos_end,
-                         self.context_manager.current_context)
+        return TRUE if node.token.type == TokenType.T_TRUE else FALSE
 
     def _visit_IfNode(self, node: IfNode):
         for condition, statement in node.cases:
@@ -115,6 +128,8 @@ class Visitator:
         condition = self._visit(node.condition_node)
         while condition.value:
             body_result = self._visit(node.body_node)
+            if isinstance(body_result, ReturnValue):
+                return body_result
             if body_result == KeywordValue('break'):
                 break
             condition = self._visit(node.condition_node)
@@ -124,7 +139,8 @@ class Visitator:
         arguments = [self._visit(argument) for argument in node.arguments]
         return_type = node.return_type_node
         body = node.body
-        function = FunctionDefinition(function_name, arguments, body, return_type, node.pos_start, node.pos_end)
+        function = FunctionDefinition(function_name, arguments, body, return_type, node.pos_start, node.pos_end,
+                                      node.is_pure)
         self.context_manager.add_function(function_name, function)
 
     def _visit_CallFunctionNode(self, node: CallFunctionNode):
@@ -137,9 +153,20 @@ class Visitator:
 
     def _execute_function(self, function: FunctionDefinition, arguments):
         check_argument_correctness(function, arguments, self.context_manager.current_context)
+        function_cache = self.function_cache
+        if function_cache and function_cache.is_cacheable(function):
+            cache_key = function_cache.make_key(function, arguments)
+            function_result = function_cache.get(cache_key)
+            if function_result is MISSING:
+                function_result = self._run_function(function, arguments)
+                function_cache.put(cache_key, function_result)
+            return function_result
+        return self._run_function(function, arguments)
+
+    def _run_function(self, function: FunctionDefinition, arguments):
         self.context_manager.switch_context_to(function)
         self._add_arguments_to_function_context(function, arguments)
-        function_result = self._visit(function.body)
+        function_result = unwrap_return_value(self._visit(function.body))
         check_return_type(function, function_result, self.context_manager.current_context)
         self.context_manager.switch_to_parent_context()
         return function_result
@@ -154,19 +181,26 @@ class Visitator:
         return argument
 
     def _visit_KeywordNode(self, node: KeywordNode):
-        return KeywordValue(node.value, node.pos_start, node.pos_end, self.context_manager.current_context)
+        return KeywordValue(node.value)
 
     def _visit_ReturnNode(self, return_node: ReturnNode):
         value = self._visit(return_node.node) if return_node.node else None
-        return ReturnValue(value, return_node.pos_start, return_node.pos_end)
+        return ReturnValue(value)
 
     def _visit_UnitNode(self, node: UnitNode):
-        return UnitValue(node.fraction, node.pos_start, node.pos_end, self.context_manager.current_context)
+        return UnitValue(node.fraction)
 
     def _visit_PhysNode(self, node: PhysNode):
         unit_value = self._visit(node.unit)
         value = self._visit(node.value)
-        return PhysValue(value, unit_value, node.pos_start, node.pos_end, self.context_manager.current_context)
+        return PhysValue(value, unit_value)
+
+    def _visit_PhysArrayNode(self, node: PhysArrayNode):
+        elements = [self._visit(element) for element in node.elements]
+        try:
+            return PhysArrayValue.from_values(elements, self._visit(node.unit))
+        except OperationError as e:
+            raise e.at(node.pos_start, node.pos_start, self.context_manager.current_context) from e
 
     def _visit_not_found(self, node):
         raise RunTimeError(node.pos_start, f'Could not find method for node: {type(node).__name__}',
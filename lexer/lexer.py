@@ -1,17 +1,18 @@
 import argparse
+from collections import deque
 
-from errors.error import LexerError
-from lexer.source import FileSource, StdInSource
-from lexer.token.tokens import BaseToken, Position, create_token
+from errors.error import LexerError, report_error
+from lexer.source import FileSource, MmapSource, StdInSource, StringSource
+from lexer.token.tokens import BaseToken, OffsetPosition, Position, create_token
 from lexer.token.token_type import TokenType
-from lexer.regex2token import compile_regex2token
+from lexer.regex2token import compile_master_regex, classify_identifier
 
 
 class LexerBase:
     def __init__(self, source=None):
         self.source = source
         self.position = Position(row=1, column=0)
-        self.regex2token = compile_regex2token()
+        self.master_regex, self.group2token = compile_master_regex()
         self.all_tokens = None
         self.token_iterator = 0
 
@@ -64,22 +65,64 @@ class LexerBase:
         try:
             return self._find_matching_token(line)
         except LexerError as e:
-            e.print_error_and_exit()
+            report_error(e)
 
     def _find_matching_token(self, line):
-        for regex in self.regex2token:
-            match = regex.match(line, self.position.column)
-            if match:
-                token_type = self.regex2token[regex]
-                value = match.group(0)
-                pos_start = self.position.copy()
-                pos_end = Position(self.position.row, match.end(0))
-                matching_token = create_token(token_type, value, pos_start, pos_end)
-                return matching_token
+        match = self.master_regex.match(line, self.position.column)
+        if match:
+            token_type = self.group2token[match.lastgroup]
+            value = match.group(0)
+            if token_type is TokenType.VT_ID:
+                token_type = classify_identifier(value)
+            pos_start = self.position.copy()
+            pos_end = Position(self.position.row, match.end(0))
+            return create_token(token_type, value, pos_start, pos_end)
 
         raise LexerError(line[self.position.column], self.position)
 
 
+class StreamingLexerBase(LexerBase):
+    """
+    Lexes lazily: tokens are produced only when the parser asks for them, so just the lookahead
+    and the last consumed tokens are kept in memory.
+    """
+    PREV_TOKENS_BUFFER_SIZE = 2
+
+    def __init__(self, source=None):
+        super().__init__(source)
+        self.token_stream = self._generate_tokens()
+        self.lookahead = deque()
+        self.consumed_tokens = deque(maxlen=self.PREV_TOKENS_BUFFER_SIZE)
+
+    def get_next_token(self, move_index=True):
+        if not self._fill_lookahead():
+            return None
+        if not move_index:
+            return self.lookahead[0]
+        token = self.lookahead.popleft()
+        self.consumed_tokens.append(token)
+        return token
+
+    def show_prev_token_location(self):
+        if len(self.consumed_tokens) > 1:
+            return self.consumed_tokens[0].pos_end
+
+    def next_token_exists(self):
+        return self._fill_lookahead()
+
+    def _fill_lookahead(self):
+        if not self.lookahead:
+            token = next(self.token_stream, None)
+            if token is None:
+                return False
+            self.lookahead.append(token)
+        return True
+
+    def _generate_tokens(self):
+        while not self.source.is_end_of_text():
+            yield from self._get_tokens_from_next_line()
+
+
 class FileLexer(LexerBase):
     def __init__(self, file_path):
         super().__init__(source=FileSource(file_path))
@@ -92,8 +135,70 @@ class StdInLexer(LexerBase):
         self.all_tokens = self._get_all_tokens()
 
 
+class StringLexer(LexerBase):
+    def __init__(self, text):
+        super().__init__(source=StringSource(text))
+        self.all_tokens = self._get_all_tokens()
+
+
+class MmapFileLexer(StreamingLexerBase):
+    """
+    Lexes the whole memory-mapped file with offset based matching instead of reading it line by line.
+    Token positions are OffsetPositions resolved to (row, column) only when they are printed.
+    """
+    def __init__(self, file_path):
+        super().__init__(source=MmapSource(file_path))
+        self.master_regex, self.group2token = compile_master_regex(binary=True)
+
+    def _generate_tokens(self):
+        buffer = self.source.buffer
+        line_index = self.source.line_index
+        offset = 0
+        while offset < len(buffer):
+            match = self.master_regex.match(buffer, offset)
+            if not match:
+                self._raise_lexer_error(offset)
+            token_type = self.group2token[match.lastgroup]
+            if token_type is not TokenType.T_IGNORE:
+                value = match.group(0).decode('utf-8')
+                if token_type is TokenType.VT_ID:
+                    token_type = classify_identifier(value)
+                pos_start = OffsetPosition(offset, line_index)
+                pos_end = OffsetPosition(match.end(0), line_index)
+                yield create_token(token_type, value, pos_start, pos_end)
+            offset = match.end(0)
+        pos_end = OffsetPosition(len(buffer), line_index)
+        yield BaseToken(TokenType.T_EOT, pos_end, pos_end)
+
+    def _raise_lexer_error(self, offset):
+        # a multi-byte UTF-8 character is at most 4 bytes long
+        illegal_char = self.source.buffer[offset:offset + 4].decode('utf-8', errors='replace')[0]
+        try:
+            raise LexerError(illegal_char, OffsetPosition(offset, self.source.line_index))
+        except LexerError as e:
+            report_error(e)
+
+
+class StreamingFileLexer(StreamingLexerBase):
+    def __init__(self, file_path):
+        super().__init__(source=FileSource(file_path))
+
+
+class StreamingStdInLexer(StreamingLexerBase):
+    def __init__(self):
+        super().__init__(source=StdInSource())
+
+
+def create_lexer(source_type, file_path=None, streaming=False, use_mmap=False):
+    if source_type == 'stdin':
+        return StreamingStdInLexer() if streaming else StdInLexer()
+    if use_mmap:
+        return MmapFileLexer(file_path)
+    return StreamingFileLexer(file_path) if streaming else FileLexer(file_path)
+
+
 def main(args):
-    lexer = StdInLexer() if args.lexer_type == 'stdin' else FileLexer(args.file_path)
+    lexer = create_lexer(args.lexer_type, args.file_path, args.streaming, args.mmap)
     while lexer.next_token_exists():
         print(lexer.get_next_token())
 
@@ -102,5 +207,7 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--file_path', type=str, default='test_files/presentation_test.txt', required=False)
     parser.add_argument('--lexer_type', type=str, choices=['stdin', 'file'], default='file')
+    parser.add_argument('--streaming', action='store_true')
+    parser.add_argument('--mmap', action='store_true')
     args = parser.parse_args()
     main(args)
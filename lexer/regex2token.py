@@ -1,6 +1,12 @@
-from lexer.token.token_type import TokenType
+from functools import lru_cache
+from types import MappingProxyType
+
+from lexer.source import STDIN_EOT_TEXT
+from lexer.token.token_type import TokenType, token_type_repr
 import re
 
+IDENTIFIER_REGEX = r'[a-zA-Z_][a-zA-Z0-9_]*'
+
 
 def compile_regex2token():
     regex2token_compiled = {}
@@ -10,30 +16,28 @@ def compile_regex2token():
     return regex2token_compiled
 
 
+@lru_cache(maxsize=None)
+def compile_master_regex(binary=False):
+    """
+    Joins all patterns from regex2token into a single alternation with one named group per pattern.
+    Alternatives are tried in dict order, so the first-match semantics of compile_regex2token are kept.
+    With binary=True the pattern is compiled for bytes-like buffers (e.g. mmap).
+    Returns the compiled pattern and a mapping from group name to TokenType. The result is built once per process
+    and shared by all lexers.
+    """
+    group2token = {}
+    alternatives = []
+    for index, regex in enumerate(regex2token):
+        group_name = f'T{index}'
+        group2token[group_name] = regex2token[regex]
+        alternatives.append(f'(?P<{group_name}>{regex})')
+    pattern = '|'.join(alternatives)
+    return re.compile(pattern.encode() if binary else pattern), group2token
+
+
 regex2token = {
     r'\n': TokenType.T_IGNORE,
-    r'[ \t]+': TokenType.T_IGNORE,
-    r'double(?![\w\d])': TokenType.T_DOUBLE,
-    r'int(?![\w\d])': TokenType.T_INT,
-    r'char(?![\w\d])': TokenType.T_CHAR,
-    r'bool(?![\w\d])': TokenType.T_BOOL,
-    r'string(?![\w\d])': TokenType.T_STRING,
-    r'if(?![\w\d])': TokenType.T_IF,
-    r'elseif(?![\w\d])': TokenType.T_ELSEIF,
-    r'else(?![\w\d])': TokenType.T_ELSE,
-    r'true(?![\w\d])': TokenType.T_TRUE,
-    r'false(?![\w\d])': TokenType.T_FALSE,
-    r'function(?![\w\d])': TokenType.T_FUNCTION,
-    r'void(?![\w\d])': TokenType.T_VOID,
-    r'return(?![\w\d])': TokenType.T_RETURN,
-    r'break(?![\w\d])': TokenType.T_BREAK,
-    r'continue(?![\w\d])': TokenType.T_CONTINUE,
-    r'phys(?![\w\d])': TokenType.T_PHYS,
-    r'unit(?![\w\d])': TokenType.T_UNIT,
-    r'while(?![\w\d])': TokenType.T_WHILE,
-    r'or(?![\w\d])': TokenType.T_OR,
-    r'and(?![\w\d])': TokenType.T_AND,
-    r'not(?![\w\d])': TokenType.T_NOT,
+    r'[ \t\r]+': TokenType.T_IGNORE,
     r'->': TokenType.T_ARROW,
     r'\|': TokenType.T_VERTICAL_BAR,
     r'&': TokenType.T_AMPERSAND,
@@ -45,6 +49,8 @@ regex2token = {
     r'=': TokenType.T_ASSIGN,
     r'\(': TokenType.T_LPARENT,
     r'\)': TokenType.T_RPARENT,
+    r'\[': TokenType.T_LSQUARE,
+    r'\]': TokenType.T_RSQUARE,
     r';': TokenType.T_SEMICOLON,
     r'\:': TokenType.T_COLON,
     r'\+': TokenType.T_PLUS,
@@ -56,10 +62,26 @@ regex2token = {
     r'<': TokenType.T_LESS,
     r'>': TokenType.T_GREATER,
     r'!=': TokenType.T_NOT_EQ,
-    r'DONE(?![\w\d])': TokenType.T_EOT,
     r'\d+\.\d+(?![\w])': TokenType.VT_DOUBLE,
     r'(0|[1-9]\d*)(?![\w])': TokenType.VT_INT,
     r'\'.\'(?![\w\d])': TokenType.VT_CHAR,
     r'\".*?\"(?![\w\d])': TokenType.VT_STRING,
-    r'[a-zA-Z_][a-zA-Z0-9_]*': TokenType.VT_ID
+    IDENTIFIER_REGEX: TokenType.VT_ID
 }
+
+
+def _build_keyword2token():
+    keywords = {token_repr: token_type for token_type, token_repr in token_type_repr.items()
+                if not token_type.has_value_field() and re.fullmatch(IDENTIFIER_REGEX, token_repr)}
+    keywords[STDIN_EOT_TEXT] = TokenType.T_EOT
+    return MappingProxyType(keywords)
+
+
+def classify_identifier(value):
+    """
+    Identifiers are matched once by IDENTIFIER_REGEX, keywords are then recognised with a single dict lookup.
+    """
+    return keyword2token.get(value, TokenType.VT_ID)
+
+
+keyword2token = _build_keyword2token()
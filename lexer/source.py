@@ -1,3 +1,8 @@
+import mmap
+import os
+
+from lexer.token.tokens import LineIndex
+
 STDIN_EOT_TEXT = 'DONE'
 
 
@@ -27,6 +32,36 @@ class FileSource(Source):
         self.fs.close()
 
 
+class StringSource(Source):
+    def __init__(self, text):
+        self.lines = text.splitlines(keepends=True)
+        self.line_index = 0
+
+    def read_line(self):
+        if self.line_index < len(self.lines):
+            line = self.lines[self.line_index]
+            self.line_index += 1
+            return line
+        self.line_index += 1
+        return ''
+
+    def is_end_of_text(self):
+        return self.line_index > len(self.lines)
+
+
+class MmapSource(Source):
+    def __init__(self, path):
+        self.fs = open(path, 'rb')
+        size = os.fstat(self.fs.fileno()).st_size
+        self.buffer = mmap.mmap(self.fs.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.line_index = LineIndex(self.buffer)
+
+    def __del__(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.fs.close()
+
+
 class StdInSource(Source):
     def __init__(self):
         self.text = None
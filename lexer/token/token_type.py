@@ -29,6 +29,8 @@ class TokenType(Enum):
     T_RBRACKET = auto()
     T_LPARENT = auto()
     T_RPARENT = auto()
+    T_LSQUARE = auto()
+    T_RSQUARE = auto()
     T_VERTICAL_BAR = auto()
     T_AMPERSAND = auto()
 
@@ -74,6 +76,7 @@ class TokenType(Enum):
     # tokens specific to task
     T_UNIT = auto()
     T_PHYS = auto()
+    T_PHYS_ARRAY = auto()
 
     # const values
     VT_CHAR = auto()
@@ -101,6 +104,8 @@ token_type_repr = {
     TokenType.T_RBRACKET: '}',
     TokenType.T_LPARENT: '(',
     TokenType.T_RPARENT: ')',
+    TokenType.T_LSQUARE: '[',
+    TokenType.T_RSQUARE: ']',
     TokenType.T_VERTICAL_BAR: '|',
     TokenType.T_AMPERSAND: '&',
 
@@ -140,6 +145,7 @@ token_type_repr = {
     TokenType.T_FUNCTION: 'function',
     TokenType.T_UNIT: 'unit',
     TokenType.T_PHYS: 'phys',
+    TokenType.T_PHYS_ARRAY: 'phys[]',
 
     # const values
     TokenType.VT_CHAR: 'char value',
@@ -1,7 +1,15 @@
+import re
+from bisect import bisect_right
+
 from lexer.token.token_type import TokenType
 
 
+NON_ASCII_BYTE = re.compile(rb'[\x80-\xff]')
+
+
 class Position:
+    __slots__ = ('row', 'column')
+
     def __init__(self, row, column):
         self.row = row
         self.column = column
@@ -16,7 +24,67 @@ class Position:
         return Position(self.row, self.column)
 
 
+class LineIndex:
+    """
+    Offsets at which every line of a buffer starts, used to turn an offset into (row, column).
+    Columns count characters like the text lexers do, so lines containing multi-byte UTF-8 characters are kept
+    to convert byte offsets on them.
+    """
+    def __init__(self, buffer):
+        self.line_starts = [0]
+        offset = buffer.find(b'\n')
+        while offset != -1:
+            self.line_starts.append(offset + 1)
+            offset = buffer.find(b'\n', offset + 1)
+        self.non_ascii_lines = {}
+        for match in NON_ASCII_BYTE.finditer(buffer):
+            line = bisect_right(self.line_starts, match.start()) - 1
+            if line not in self.non_ascii_lines:
+                line_end = self.line_starts[line + 1] if line + 1 < len(self.line_starts) else len(buffer)
+                self.non_ascii_lines[line] = bytes(buffer[self.line_starts[line]:line_end])
+
+    def to_row_column(self, offset):
+        line = bisect_right(self.line_starts, offset) - 1
+        column = offset - self.line_starts[line]
+        line_bytes = self.non_ascii_lines.get(line)
+        if line_bytes is not None:
+            column = len(line_bytes[:column].decode('utf-8', errors='replace'))
+        return line + 1, column
+
+
+class OffsetPosition:
+    """
+    Immutable position stored as an offset into the source buffer.
+    Row and column are only computed from the LineIndex when they are asked for.
+    """
+    __slots__ = ('offset', 'line_index')
+
+    def __init__(self, offset, line_index: LineIndex):
+        self.offset = offset
+        self.line_index = line_index
+
+    @property
+    def row(self):
+        return self.line_index.to_row_column(self.offset)[0]
+
+    @property
+    def column(self):
+        return self.line_index.to_row_column(self.offset)[1]
+
+    def __repr__(self):
+        return self.print_location()
+
+    def print_location(self):
+        row, column = self.line_index.to_row_column(self.offset)
+        return f'({row}:{column})'
+
+    def copy(self):
+        return self
+
+
 class BaseToken:
+    __slots__ = ('type', 'pos_start', 'pos_end')
+
     def __init__(self, type_: TokenType, pos_start: Position = None, pos_end: Position = None):
         self.type = type_
         self.pos_start = pos_start
@@ -35,6 +103,8 @@ class BaseToken:
 
 
 class ValueToken(BaseToken):
+    __slots__ = ('value',)
+
     def __init__(self, type_: TokenType, value, pos_start: Position = None, pos_end: Position = None):
         super().__init__(type_, pos_start, pos_end)
         self.value = value
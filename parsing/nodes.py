@@ -76,6 +76,7 @@ class VariableNode:
     def __init__(self, name: ValueToken):
         self.name = name
         self.pos_start = name.pos_start
+        self.slot = None  # set by Resolver
 
 
 class VariableAccessNode(VariableNode):
@@ -92,6 +93,7 @@ class VariableAssignmentNode(VariableNode):
         self.type = type_token
         super().__init__(name)
         self.value = value  # node
+        self.check_type = True  # cleared by Resolver when the types are known to match
 
         self.pos_end = self.value.pos_end
 
@@ -117,6 +119,9 @@ class FunctionDefinitionNode:
         self.arguments = arguments
         self.body = body
         self.return_type_node = return_type_node
+        self.frame_size = None  # set by Resolver
+        self.slot_types = None  # set by Resolver
+        self.is_pure = False  # set by mark_pure_functions
 
         self.pos_start = self.function_name.pos_start
         self.pos_end = self.body.pos_end
@@ -144,6 +149,8 @@ class CallFunctionNode:
 class StatementsNode:
     def __init__(self, statements, pos_start, pos_end):
         self.statements = statements
+        self.frame_size = None  # set by Resolver on the program root
+        self.slot_types = None  # set by Resolver on the program root
 
         self.pos_start = pos_start
         self.pos_end = pos_end
@@ -186,6 +193,7 @@ class FunctionArgumentNode:
     def __init__(self, argument_name: ValueToken, argument_type_node: TypeNode):
         self.name = argument_name
         self.type = argument_type_node
+        self.slot = None  # set by Resolver
 
         self.pos_start = argument_name.pos_start
         self.pos_end = argument_type_node.pos_end
@@ -223,6 +231,18 @@ class PhysNode:
         return f'(Phys: {self.value}*{self.unit})'
 
 
+class PhysArrayNode:
+    def __init__(self, elements, unit: UnitNode, pos_start):
+        self.elements = elements  # nodes
+        self.unit = unit
+
+        self.pos_start = pos_start
+        self.pos_end = unit.pos_end
+
+    def __repr__(self):
+        return f'(PhysArray: {self.elements}*{self.unit})'
+
+
 class KeywordNode:
     def __init__(self, value, pos_start, pos_end):
         self.value = value
@@ -240,3 +260,41 @@ class ContinueNode:
 
     def __repr__(self):
         return 'continue'
+
+
+def iter_child_nodes(node):
+    """
+    Yields the direct child nodes of an AST node.
+    """
+    if isinstance(node, StatementsNode):
+        yield from node.statements
+    elif isinstance(node, BinaryOperationNode):
+        yield node.left
+        yield node.right
+    elif isinstance(node, UnaryOperationNode):
+        yield node.node
+    elif isinstance(node, VariableAssignmentNode):
+        yield node.value
+    elif isinstance(node, WhileNode):
+        yield node.condition_node
+        yield node.body_node
+    elif isinstance(node, IfNode):
+        for condition, statements in node.cases:
+            yield condition
+            yield statements
+        if node.else_case:
+            yield node.else_case
+    elif isinstance(node, FunctionDefinitionNode):
+        yield from node.arguments
+        yield node.body
+    elif isinstance(node, CallFunctionNode):
+        yield from node.arguments
+    elif isinstance(node, ReturnNode):
+        if node.node:
+            yield node.node
+    elif isinstance(node, PhysNode):
+        yield node.value
+        yield node.unit
+    elif isinstance(node, PhysArrayNode):
+        yield from node.elements
+        yield node.unit
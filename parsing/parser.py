@@ -1,7 +1,7 @@
 from argparse import ArgumentParser
 
 from errors.error import InvalidSyntaxError, run_with_exception_safety
-from lexer.lexer import FileLexer, StdInLexer
+from lexer.lexer import create_lexer
 from lexer.token.token_type import TokenType
 from parsing.nodes import *
 
@@ -232,6 +232,9 @@ class Parser:
         elif token.type == TokenType.T_VERTICAL_BAR:
             return self._parse_unit_value()
 
+        elif token.type == TokenType.T_LSQUARE:
+            return self._parse_phys_array_value()
+
         return self._parse_numerical_value()
 
     def _parse_numerical_value(self):
@@ -252,6 +255,19 @@ class Parser:
         unit = self._parse_unit_value()
         return PhysNode(value, unit)
 
+    def _parse_phys_array_value(self):
+        pos_start = self.current_token.pos_start
+        self._check_token_and_next(TokenType.T_LSQUARE)
+        elements = []
+        if not self._is_current_token_type(TokenType.T_RSQUARE):
+            elements.append(self._parse_expression())
+            while self._is_current_token_type(TokenType.T_COMMA):
+                elements.append(self._parse_expression())
+            self._check_token_and_next(TokenType.T_RSQUARE)
+        self._check_token_and_next(TokenType.T_AMPERSAND)
+        unit = self._parse_unit_value()
+        return PhysArrayNode(elements, unit, pos_start)
+
     def _parse_unit_value(self):
         pos_start = self.current_token.pos_start
         pos_end = pos_start
@@ -309,6 +325,10 @@ class Parser:
             raise InvalidSyntaxError(self._get_last_token_location(), 'Expected type.')
         token = self.current_token
         self._next_token()
+        if token.type == TokenType.T_PHYS and self._is_current_token_type(TokenType.T_LSQUARE):
+            pos_end = self.current_token.pos_end
+            self._check_token_and_next(TokenType.T_RSQUARE)
+            token = BaseToken(TokenType.T_PHYS_ARRAY, token.pos_start, pos_end)
         return TypeNode(token)
 
     def _is_current_token_type(self, token_type):
@@ -346,7 +366,7 @@ class Parser:
 
 
 def main(args):
-    lexer = StdInLexer() if args.source_type == 'stdin' else FileLexer(args.file_path)
+    lexer = create_lexer(args.source_type, args.file_path, args.streaming, args.mmap)
     parser = Parser(lexer)
     print(parser.parse())
 
@@ -355,5 +375,7 @@ if __name__ == '__main__':
     parser = ArgumentParser()
     parser.add_argument('--file_path', type=str, default='test_files/presentation_test.txt', required=False)
     parser.add_argument('--source_type', type=str, choices=['stdin', 'file'], default='file')
+    parser.add_argument('--streaming', action='store_true')
+    parser.add_argument('--mmap', action='store_true')
     args = parser.parse_args()
     main(args)
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from interpreting.ast_cache import AstCache, MemoryAstCache
+from interpreting.interpreter import Evaluator
+from parsing.parser import Parser
+from tests.test_utils import TestSource, TestLexer
+
+TEST_FILE = 'test_files/presentation_test.txt'
+
+
+class AstCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = AstCache(self.cache_dir.name)
+
+    def tearDown(self) -> None:
+        self.cache_dir.cleanup()
+
+    def parse(self, text):
+        source = TestSource()
+        lexer = TestLexer(source)
+        source.put_text(text)
+        lexer.lex()
+        return Parser(lexer).parse()
+
+    def test_miss_returns_none(self):
+        self.assertIsNone(self.cache.load(b'1;'))
+
+    def test_stored_ast_is_loaded(self):
+        ast = self.parse('phys v = 3&|m/s|;')
+        self.cache.store(b'phys v = 3&|m/s|;', ast)
+        loaded = self.cache.load(b'phys v = 3&|m/s|;')
+        self.assertEqual(str(ast), str(loaded))
+        self.assertEqual(ast.pos_start.print_location(), loaded.pos_start.print_location())
+
+    def test_ast_that_cannot_be_pickled_is_not_cached(self):
+        with mock.patch('pickle.dump', side_effect=RecursionError):
+            self.cache.store(b'1;', self.parse('1;'))
+
+        self.assertIsNone(self.cache.load(b'1;'))
+        self.assertEqual([], os.listdir(self.cache_dir.name))
+
+    def test_unwritable_cache_directory_is_skipped(self):
+        with mock.patch('tempfile.mkstemp', side_effect=PermissionError):
+            self.cache.store(b'1;', self.parse('1;'))
+        with mock.patch('os.replace', side_effect=PermissionError):
+            self.cache.store(b'1;', self.parse('1;'))
+
+        self.assertIsNone(self.cache.load(b'1;'))
+        self.assertEqual([], os.listdir(self.cache_dir.name))
+
+    def test_interrupt_is_raised_after_cleanup(self):
+        with mock.patch('pickle.dump', side_effect=KeyboardInterrupt), self.assertRaises(KeyboardInterrupt):
+            self.cache.store(b'1;', self.parse('1;'))
+
+        self.assertEqual([], os.listdir(self.cache_dir.name))
+
+    def test_changed_source_is_a_miss(self):
+        self.cache.store(b'1;', self.parse('1;'))
+        self.assertIsNone(self.cache.load(b'2;'))
+
+    def test_corrupted_entry_is_a_miss(self):
+        self.cache.store(b'1;', self.parse('1;'))
+        entry_path = self.cache._entry_path(b'1;')
+        with open(entry_path, 'wb') as entry:
+            entry.write(b'not a pickle')
+        self.assertIsNone(self.cache.load(b'1;'))
+
+    def test_entry_failing_to_unpickle_is_dropped(self):
+        entry_path = self.cache._entry_path(b'1;')
+        for garbage in (b'I1x\n.', b'\x80\x05\x95', b'\x00\xff' * 8):
+            with open(entry_path, 'wb') as entry:
+                entry.write(garbage)
+
+            self.assertIsNone(self.cache.load(b'1;'))
+            self.assertFalse(os.path.exists(entry_path))
+
+    def test_evaluator_uses_cache(self):
+        evaluator = Evaluator(cache_dir=self.cache_dir.name)
+        first = evaluator.evaluate('file', TEST_FILE)
+        self.assertEqual(1, len(os.listdir(self.cache_dir.name)))
+        second = Evaluator(cache_dir=self.cache_dir.name).evaluate('file', TEST_FILE)
+        self.assertEqual(str(first), str(second))
+
+
+class MemoryAstCacheTest(unittest.TestCase):
+    def test_every_load_returns_a_new_copy(self):
+        source = TestSource()
+        lexer = TestLexer(source)
+        source.put_text('int a = 1;')
+        lexer.lex()
+        cache = MemoryAstCache(max_size=1)
+        cache.store(b'int a = 1;', Parser(lexer).parse())
+
+        first, second = cache.load(b'int a = 1;'), cache.load(b'int a = 1;')
+
+        self.assertIsNot(first, second)
+        self.assertEqual(str(first), str(second))
+
+    def test_least_recently_used_source_is_evicted(self):
+        cache = MemoryAstCache(max_size=1)
+        cache.store(b'1;', 'first')
+        cache.store(b'2;', 'second')
+
+        self.assertIsNone(cache.load(b'1;'))
+        self.assertEqual('second', cache.load(b'2;'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+from interpreting.async_evaluation import evaluate
+
+
+class AsyncEvaluateTest(unittest.TestCase):
+    def test_value_of_last_statement_is_returned(self):
+        result = asyncio.run(evaluate('phys v = 3&|m/s|; v * 2&|s|;'))
+
+        self.assertEqual({'ok': True, 'value': '6*(m^1)', 'type': 'phys'}, result.to_dict())
+
+    def test_errors_are_returned(self):
+        syntax_error = asyncio.run(evaluate('int a = ;')).error
+        runtime_error = asyncio.run(evaluate('1 / 0;')).error
+
+        self.assertEqual('Error: invalid syntax at: (1:7) Expected expression.', syntax_error.describe())
+        self.assertEqual('Division by zero.', runtime_error.message)
+
+    def test_infinite_loop_is_stopped_by_step_budget(self):
+        result = asyncio.run(evaluate('int a = 0;\nwhile (true) {\n    a = a + 1;\n}', step_budget=500))
+
+        self.assertEqual({'kind': 'runtime', 'message': 'Step budget of 500 exceeded.', 'row': 2, 'column': 7,
+                          'traceback': 'Traceback (most recent call last): \nLine: 2, in <main>\n'},
+                         result.error.to_dict())
+
+    def test_recursion_is_stopped_by_step_budget(self):
+        result = asyncio.run(evaluate('function f(n:int)->int{ return f(n + 1); }\nf(0);', step_budget=100))
+
+        self.assertEqual('Step budget of 100 exceeded.', result.error.message)
+
+    def test_program_within_step_budget_finishes(self):
+        result = asyncio.run(evaluate('int i = 0; while (i < 100) { i = i + 1; } i;', step_budget=101))
+
+        self.assertEqual(100, result.value.value)
+
+    def test_infinite_loop_is_stopped_by_deadline(self):
+        result = asyncio.run(evaluate('while (true) { 1; }', timeout=0.05))
+
+        self.assertEqual('Deadline of 0.05s exceeded.', result.error.message)
+
+    def test_programs_are_interleaved(self):
+        ticks = []
+
+        async def ticker():
+            for tick in range(3):
+                ticks.append(tick)
+                await asyncio.sleep(0)
+
+        async def run():
+            result, _ = await asyncio.gather(evaluate('while (true) { 1; }', step_budget=5000, slice_steps=100),
+                                             ticker())
+            return result
+
+        result = asyncio.run(run())
+
+        self.assertEqual([0, 1, 2], ticks)
+        self.assertEqual('Step budget of 5000 exceeded.', result.error.message)
+
+    def test_cancellation_stops_the_program(self):
+        async def run():
+            task = asyncio.create_task(evaluate('while (true) { 1; }'))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
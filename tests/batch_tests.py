@@ -0,0 +1,71 @@
+import os
+import signal
+import tempfile
+import unittest
+from unittest import mock
+
+from interpreting.batch import _raise_timeout, collect_paths, evaluate_file, init_worker, run_batch
+
+SCRIPTS = {
+    'sum.txt': 'int a = 1; a + 1;',
+    os.path.join('nested', 'error.txt'): '1 / 0;',
+    os.path.join('nested', 'loop.txt'): 'while (true) { 1; }',
+}
+
+
+def crash_worker(paths, timeout):
+    os._exit(1)
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.directory.name, 'nested'))
+        for name, text in SCRIPTS.items():
+            with open(self.path(name), 'w') as script:
+                script.write(text)
+        init_worker('visitor', False, True)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_directories_are_expanded_recursively(self):
+        self.assertEqual(sorted(self.path(name) for name in SCRIPTS), sorted(collect_paths([self.directory.name])))
+        self.assertEqual([self.path('sum.txt')], collect_paths([self.path('*.txt')]))
+
+    def test_script_is_stopped_after_timeout(self):
+        result = evaluate_file(self.path(os.path.join('nested', 'loop.txt')), timeout=0.2)
+
+        self.assertEqual({'kind': 'timeout', 'message': 'Timed out after 0.2s.'}, result['error'])
+
+    def test_worker_stays_usable_after_timeout(self):
+        evaluate_file(self.path(os.path.join('nested', 'loop.txt')), timeout=0.2)
+        result = evaluate_file(self.path('sum.txt'), timeout=1)
+
+        self.assertEqual('2', result['value'])
+
+    def test_every_script_gets_one_result(self):
+        results = list(run_batch(collect_paths([self.directory.name]), workers=2, timeout=0.5, chunk_size=1))
+        errors = {os.path.basename(result['path']): result.get('error', {}).get('kind') for result in results}
+
+        self.assertEqual({'sum.txt': None, 'error.txt': 'runtime', 'loop.txt': 'timeout'}, errors)
+
+    def test_alarm_after_script_finished_is_ignored(self):
+        evaluate_file(self.path('sum.txt'), timeout=1)
+
+        _raise_timeout(signal.SIGALRM, None)
+
+    def test_crashed_worker_fails_its_scripts(self):
+        paths = collect_paths([self.directory.name])
+        with mock.patch('interpreting.batch.evaluate_files', crash_worker):
+            results = list(run_batch(paths, workers=1, timeout=0.5, chunk_size=1))
+
+        self.assertEqual(sorted(paths), sorted(result['path'] for result in results))
+        self.assertTrue(all(result['error']['kind'] == 'internal' for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from interpreting.context import ContextManager
+from interpreting.values.basic_values import IntValue
+from interpreting.values.function_values import FunctionDefinition
+from lexer.token.token_type import TokenType
+from lexer.token.tokens import Position, ValueToken
+
+
+def identifier(name):
+    return ValueToken(TokenType.VT_ID, name, Position(1, 0), Position(1, len(name)))
+
+
+class ContextManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.context_manager = ContextManager()
+        self.function = FunctionDefinition('f', [], None, None, Position(1, 0), Position(1, 1))
+        self.context_manager.add_function('f', self.function)
+
+    def test_function_context_does_not_copy_globals(self):
+        self.context_manager.switch_context_to(self.function)
+
+        self.assertEqual({}, self.context_manager.current_context.symbol_table.symbols)
+        self.assertIs(self.function, self.context_manager.get_variable(identifier('f')))
+
+    def test_locals_shadow_globals(self):
+        self.context_manager.switch_context_to(self.function)
+        self.context_manager.current_context.add_variable('f', IntValue(3))
+
+        self.assertEqual(3, self.context_manager.get_variable(identifier('f')).value)
+
+    def test_symbol_table_is_reused_after_return(self):
+        self.context_manager.switch_context_to(self.function)
+        self.context_manager.current_context.add_variable('x', IntValue(3))
+        symbol_table = self.context_manager.current_context.symbol_table
+        self.context_manager.switch_to_parent_context()
+        self.context_manager.switch_context_to(self.function)
+
+        self.assertIs(symbol_table, self.context_manager.current_context.symbol_table)
+        self.assertEqual({}, symbol_table.symbols)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from errors.error import RunTimeError, raising_errors
+from interpreting.context import MAX_REPLACED_FRAMES, Context
+from interpreting.interpreter import ENGINES, Evaluator, Interpreter
+from parsing.parser import Parser
+from tests.test_utils import TestSource, TestLexer
+
+
+class EvaluateSourceTest(unittest.TestCase):
+    engine = 'visitor'
+
+    def setUp(self) -> None:
+        self.evaluator = Evaluator(engine=self.engine)
+
+    def test_value_of_last_statement_is_returned(self):
+        result = self.evaluator.evaluate_source('phys v = 3&|m/s|; v * 2&|s|;')
+
+        self.assertTrue(result.ok)
+        self.assertEqual({'ok': True, 'value': '6*(m^1)', 'type': 'phys'}, result.to_dict())
+
+    def test_runtime_error_is_returned_with_traceback(self):
+        statement = 'function divide(a:int, b:int)->int{\n    return a / b;\n}\ndivide(1, 0);'
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = self.evaluator.evaluate_source(statement)
+
+        self.assertFalse(result.ok)
+        self.assertEqual('', output.getvalue())
+        self.assertEqual({'kind': 'runtime', 'message': 'Division by zero.', 'row': 2, 'column': 15,
+                          'traceback': 'Traceback (most recent call last): \nLine: 4, in <main>\nLine: 2, in divide\n'},
+                         result.error.to_dict())
+
+    def test_lexer_and_syntax_errors_are_returned(self):
+        lexer_error = self.evaluator.evaluate_source('int a = 1 $;').error
+        syntax_error = self.evaluator.evaluate_source('int a = ;').error
+
+        self.assertEqual('Error: unexpected character: $ at: (1:10)', lexer_error.describe())
+        self.assertEqual('Error: invalid syntax at: (1:7) Expected expression.', syntax_error.describe())
+
+    def test_programs_do_not_share_variables(self):
+        self.evaluator.evaluate_source('function f()->int{ return 1; } int a = f() / 0;')
+        result = self.evaluator.evaluate_source('a;')
+
+        self.assertEqual('a not defined.', result.error.message)
+        self.assertEqual('Traceback (most recent call last): \nLine: 1, in <main>\n', result.error.get_traceback())
+
+    def test_deep_recursion_is_returned_as_runtime_error(self):
+        result = self.evaluator.evaluate_source('function f(n:int)->int{\n    if (n < 1) { return 0; }\n'
+                                                '    return 1 + f(n - 1);\n}\nf(3000);')
+
+        if self.engine == 'bytecode':
+            self.assertEqual(3000, result.value.value)
+        else:
+            self.assertEqual('runtime', result.error.kind)
+            self.assertEqual('Maximum recursion depth exceeded.', result.error.message)
+            self.assertIsNotNone(result.error.position)
+            self.assertTrue(result.error.get_traceback().startswith(
+                'Traceback (most recent call last): \nLine: 5, in <main>\nLine: 3, in f\n'))
+
+    def test_deep_nesting_is_returned_as_runtime_error_at_parser_position(self):
+        result = self.evaluator.evaluate_source('int a = 1;\n' + '(' * 3000 + '1' + ')' * 3000 + ';')
+
+        self.assertEqual('Maximum recursion depth exceeded.', result.error.message)
+        self.assertEqual(2, result.error.to_dict()['row'])
+        self.assertEqual('Traceback (most recent call last): \nLine: 2, in <main>\n', result.error.get_traceback())
+
+    def test_function_without_return_value_is_returned_as_runtime_error(self):
+        result = self.evaluator.evaluate_source('function f()->int{ int a = 1; }\nf();')
+
+        self.assertEqual({'kind': 'runtime', 'message': 'Expected return type: int got void', 'row': 1, 'column': 14,
+                          'traceback': 'Traceback (most recent call last): \nLine: 2, in <main>\nLine: 1, in f\n'},
+                         result.error.to_dict())
+
+    def test_internal_exception_is_returned_as_internal_error(self):
+        with mock.patch.object(self.evaluator.interpreter, 'interpret', side_effect=KeyError('slot')):
+            result = self.evaluator.evaluate_source('1;')
+
+        self.assertEqual({'kind': 'internal', 'message': "KeyError: 'slot'", 'row': None, 'column': None,
+                          'traceback': None}, result.error.to_dict())
+        self.assertEqual(1, self.evaluator.evaluate_source('1;').value.value)
+
+    def test_empty_program_has_no_value(self):
+        result = self.evaluator.evaluate_source('')
+
+        self.assertTrue(result.ok)
+        self.assertIsNone(result.value)
+
+
+class ClosureEvaluateSourceTest(EvaluateSourceTest):
+    engine = 'closure'
+
+
+class BytecodeEvaluateSourceTest(EvaluateSourceTest):
+    engine = 'bytecode'
+
+    def test_tail_recursion_is_condensed_in_traceback(self):
+        result = self.evaluator.evaluate_source('function loop(n:int)->int{\n    if (n < 1){\n        return 1 / 0;\n'
+                                                '    }\n    return loop(n - 1);\n}\nloop(100000);')
+
+        self.assertEqual('Traceback (most recent call last): \nLine: 7, in <main>\nLine: 5, in loop\n'
+                         '[Previous line repeated 99999 more times]\nLine: 3, in loop\n',
+                         result.error.get_traceback())
+
+    def test_only_innermost_replaced_frames_are_kept(self):
+        result = self.evaluator.evaluate_source('function f(n:int)->int{\n    if (n < 1){\n        return 1 / 0;\n'
+                                                '    }\n    return g(n - 1);\n}\nfunction g(n:int)->int{\n'
+                                                '    return f(n);\n}\nf(100);')
+        traceback = result.error.get_traceback().splitlines()
+
+        self.assertEqual(['Traceback (most recent call last): ', 'Line: 10, in <main>',
+                          f'[{200 - MAX_REPLACED_FRAMES} earlier tail calls not shown]',
+                          'Line: 5, in f', 'Line: 8, in g'], traceback[:5])
+        self.assertEqual(MAX_REPLACED_FRAMES + 4, len(traceback))
+        self.assertEqual(['Line: 8, in g', 'Line: 3, in f'], traceback[-2:])
+
+
+class EngineDifferentialTest(unittest.TestCase):
+    PROGRAMS = [
+        'function g()->double{\n    return 0.5;\n}\nfunction f()->int{\n    return g();\n}\nint x = 1;\nf();',
+        'function g(a:int)->int{\n    return a;\n}\nfunction f()->int{\n    return g(1.0);\n}\nf();',
+        'function g(a:int)->int{\n    return a / 0;\n}\nfunction f()->int{\n    return g(1);\n}\nf();',
+    ]
+
+    def test_engines_report_the_same_errors(self):
+        for program in self.PROGRAMS:
+            expected = Evaluator(engine='visitor').evaluate_source(program).to_dict()
+            for engine in ENGINES:
+                with self.subTest(engine=engine, program=program):
+                    self.assertEqual(expected, Evaluator(engine=engine).evaluate_source(program).to_dict())
+
+
+class RunTimeErrorTest(unittest.TestCase):
+    def test_error_without_position_is_described(self):
+        error = RunTimeError(None, 'Failed.', Context('f', Context('<main>')))
+
+        self.assertEqual({'kind': 'runtime', 'message': 'Failed.', 'row': None, 'column': None,
+                          'traceback': 'Traceback (most recent call last): \nLine: unknown, in <main>\n'
+                                       'Line: unknown, in f\n'},
+                         error.to_dict())
+
+
+class RaisingErrorsTest(unittest.TestCase):
+    def test_interpreter_raises_instead_of_exiting(self):
+        source = TestSource()
+        lexer = TestLexer(source)
+        source.put_text('1 / 0;')
+        lexer.lex()
+        ast = Parser(lexer).parse()
+
+        with raising_errors(), self.assertRaises(RunTimeError) as error:
+            Interpreter().interpret(ast)
+
+        self.assertEqual('Division by zero.', error.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,10 @@
+import contextlib
+import io
 import unittest
+from unittest import mock
 
 from interpreting.interpreter import Interpreter
+from interpreting.values.physical_values import UNIT_CACHE, numpy
 from parsing.parser import Parser
 from tests.test_utils import TestSource, TestLexer
 
@@ -107,3 +111,262 @@ class InterpreterTest(unittest.TestCase):
         result = self.interpret(statement)
 
         self.assertEqual('3', str(result))
+
+    def test_interpreting_unary_minus(self):
+        result = self.interpret('int x = 5; -x;')
+
+        self.assertEqual('-5', str(result))
+
+    def test_interpreting_not(self):
+        result = self.interpret('not (1 < 2);')
+
+        self.assertEqual('false', str(result))
+
+    def test_interpreting_return_inside_if(self):
+        statement = """
+                function fib(n:int)->int{
+                    if (n < 3){
+                        return 1;
+                    }
+                    return fib(n - 1) + fib(n - 2);
+                }
+                fib(10);
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('55', str(result))
+
+    def test_interpreting_zero_value(self):
+        result = self.interpret('int x = 0; x + 1;')
+
+        self.assertEqual('1', str(result))
+
+    def test_interpreting_break_and_continue(self):
+        statement = """
+                int counter = 0; int total = 0;
+                while (counter < 10){
+                    counter = counter + 1;
+                    if (counter == 3){
+                        continue;
+                    }
+                    if (counter > 5){
+                        break;
+                    }
+                    total = total + counter;
+                }
+                total;
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('12', str(result))
+
+    def test_interpreting_phys_sum_in_loop(self):
+        statement = """
+                phys distance = 0.0&|m|; int step = 0;
+                while (step < 4){
+                    distance = distance + 1.5&|m|;
+                    step = step + 1;
+                }
+                distance / 2.0&|s|;
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('3.0*(m^1/s^1)', str(result))
+
+    def test_repeated_unit_arithmetic_hits_unit_cache(self):
+        UNIT_CACHE.clear()
+        statement = """
+                phys distance = 0.0&|m|; int step = 0;
+                while (step < 4){
+                    distance = distance + 1.5&|m/s| * 2.0&|s|;
+                    step = step + 1;
+                }
+                distance;
+                """
+        result = self.interpret(statement)
+        statistics = self.interpreter.statistics()['unit_cache']
+
+        self.assertEqual('12.0*(m^1)', str(result))
+        self.assertEqual(1, statistics['misses'])
+        self.assertEqual(3, statistics['hits'])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_interpreting_phys_array_arithmetic(self):
+        statement = """
+                phys[] distances = [1.0, 2, 3.5]&|m|;
+                phys[] times = [0.5, 1.0, 2.0]&|s|;
+                -(distances / times + 1.0&|m/s|) * 2;
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('[-6.0, -6.0, -5.5]*(m^1/s^1)', str(result))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_phys_array_comparison_holds_for_all_elements(self):
+        statement = """
+                phys[] speeds = [1.5, 2.0]&|m/s|;
+                bool result = false;
+                if (speeds > 1.0&|m/s|) {
+                    result = not (speeds < [1.0, 2.5]&|m/s|);
+                }
+                result;
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('true', str(result))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_number_times_phys_array(self):
+        result = self.interpret('phys[] distances = [1.0, 2.5]&|m|; 2 * distances == distances * 2;')
+
+        self.assertEqual('true', str(result))
+
+    def test_phys_array_literal_without_numpy_fails_only_when_evaluated(self):
+        definition = """
+                function make()->phys[]{
+                    return [1.0, 2.0]&|m|;
+                }
+                """
+        with mock.patch('interpreting.values.physical_values.numpy', None):
+            result = self.interpret(definition + '1;')
+            output = io.StringIO()
+            self.setUp()
+            with self.assertRaises(SystemExit), contextlib.redirect_stdout(output):
+                self.interpret(definition + 'make();')
+
+        self.assertEqual('1', str(result))
+        self.assertIn('Error: phys[] values require numpy, which is not installed. at: (1:69)', output.getvalue())
+        self.assertIn('Line: 1, in make', output.getvalue())
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_phys_array_unit_mismatch_error(self):
+        statement = """
+                phys[] distances = [1.0, 2.0]&|m|;
+                1.0&|s| + distances;
+                """
+        output = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(output):
+            self.interpret(statement)
+
+        self.assertIn('Error: Tried to add phys[] with units: (s^1), (m^1) at: (1:68)', output.getvalue())
+
+    def test_runtime_error_traceback(self):
+        statement = """
+                function divide(a:int, b:int)->int{
+                    return a / b;
+                }
+                divide(1, 0);
+                """
+        output = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(output):
+            self.interpret(statement)
+
+        self.assertIn('Error: Division by zero. at: (1:84)', output.getvalue())
+        self.assertIn('Line: 1, in <main>', output.getvalue())
+
+    def test_tail_call_return_type_is_checked(self):
+        statement = """
+                function half()->double{
+                    return 0.5;
+                }
+                function wrong()->int{
+                    return half();
+                }
+                wrong();
+                """
+        output = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(output):
+            self.interpret(statement)
+
+        self.assertIn('Expected return type: int got double', output.getvalue())
+
+    def test_void_function_may_end_without_return_value(self):
+        result = self.interpret('function f()->void{ int a = 1; } function g()->void{ return; } f(); g(); 1;')
+
+        self.assertEqual('1', str(result))
+
+    def test_missing_return_value_is_reported(self):
+        output = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(output):
+            self.interpret('function f()->int{ int a = 1; } f();')
+
+        self.assertIn('Error: Expected return type: int got void at: (1:14)', output.getvalue())
+
+
+class ClosureInterpreterTest(InterpreterTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.interpreter = Interpreter(engine='closure')
+
+
+class BytecodeInterpreterTest(InterpreterTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.interpreter = Interpreter(engine='bytecode')
+
+    def test_deep_recursion(self):
+        statement = """
+                function sum_to(n:int)->int{
+                    if (n == 0){
+                        return 0;
+                    }
+                    return n + sum_to(n - 1);
+                }
+                sum_to(5000);
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('12502500', str(result))
+
+    def test_tail_call_does_not_grow_frame_stack(self):
+        statement = """
+                function count_down(n:int)->int{
+                    if (n == 0){
+                        return 0;
+                    }
+                    return count_down(n - 1);
+                }
+                count_down(10000);
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('0', str(result))
+        self.assertEqual('<main>', self.interpreter.engine.context_manager.current_context.name)
+
+    def test_unboxed_numeric_variables(self):
+        statement = """
+                int counter = 0;
+                double total = 0.0;
+                while (counter < 10){
+                    total = total + counter * 0.5 - -1;
+                    counter = counter + 1;
+                }
+                total / counter;
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('3.25', str(result))
+
+    def test_unboxed_variable_gets_value_of_unknown_type(self):
+        statement = """
+                function value()->double{
+                    return 1.0;
+                }
+                int x = 1;
+                x = value();
+                function value()->int{
+                    return 1;
+                }
+                """
+        output = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(output):
+            self.interpret(statement)
+
+        self.assertIn('Tried to put a value of type double to a variable of type int', output.getvalue())
+
+    def test_unboxed_variable_used_before_definition(self):
+        output = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stdout(output):
+            self.interpret('x = x + 1; int x = 1;')
+
+        self.assertIn('x not defined.', output.getvalue())
@@ -1,8 +1,12 @@
-from lexer.lexer import LexerBase
+from lexer.lexer import FileLexer, LexerBase, MmapFileLexer, StreamingLexerBase
+import os
+import tempfile
 import unittest
 
+from errors.error import LexerError, raising_errors
 from lexer.token.tokens import BaseToken, ValueToken
 from lexer.token.token_type import TokenType
+from tests.test_utils import TestSource
 
 
 class LexerTest(unittest.TestCase):
@@ -33,6 +37,13 @@ class LexerTest(unittest.TestCase):
                     BaseToken(TokenType.T_RPARENT)]
         self.assertEqual(expected, predicted)
 
+    def test_lex_square_brackets(self):
+        line = "[ ]"
+        predicted = self.lexer._get_tokens_from_line(line)
+        expected = [BaseToken(TokenType.T_LSQUARE),
+                    BaseToken(TokenType.T_RSQUARE)]
+        self.assertEqual(expected, predicted)
+
     def test_lex_math_operations_types(self):
         line = "+ - * /"
         predicted = self.lexer._get_tokens_from_line(line)
@@ -101,6 +112,109 @@ class LexerTest(unittest.TestCase):
                     ValueToken(TokenType.VT_ID, "z")]
         self.assertEqual(expected, predicted)
 
+    def test_id_with_keyword_prefix(self):
+        line = "interval iffy done_ orbit"
+        predicted = self.lexer._get_tokens_from_line(line)
+        expected = [ValueToken(TokenType.VT_ID, "interval"),
+                    ValueToken(TokenType.VT_ID, "iffy"),
+                    ValueToken(TokenType.VT_ID, "done_"),
+                    ValueToken(TokenType.VT_ID, "orbit")]
+        self.assertEqual(expected, predicted)
+
+    def test_token_positions(self):
+        line = "int x = 15;"
+        predicted = self.lexer._get_tokens_from_line(line)
+        columns = [(token.pos_start.column, token.pos_end.column) for token in predicted]
+        self.assertEqual([(0, 3), (4, 5), (6, 7), (8, 10), (10, 11)], columns)
+
+
+class StreamingLexerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.source = TestSource()
+        self.lexer = StreamingLexerBase(self.source)
+
+    def test_tokens_produced_on_demand(self):
+        self.source.put_text("int x = 5;")
+        self.source.put_text("x;")
+        first = self.lexer.get_next_token()
+        self.assertEqual(BaseToken(TokenType.T_INT), first)
+        self.assertEqual(["x;"], self.source.lines)
+
+    def test_upcoming_token_is_not_consumed(self):
+        self.source.put_text("x = 5;")
+        upcoming = self.lexer.get_next_token(move_index=False)
+        current = self.lexer.get_next_token()
+        self.assertEqual(ValueToken(TokenType.VT_ID, "x"), upcoming)
+        self.assertIs(upcoming, current)
+
+    def test_prev_token_location(self):
+        self.source.put_text("int x = 5;")
+        for _ in range(3):
+            self.lexer.get_next_token()
+        self.assertEqual(5, self.lexer.show_prev_token_location().column)
+
+    def test_stream_ends_after_end_of_text(self):
+        self.source.put_text("x;")
+        tokens = []
+        while self.lexer.next_token_exists():
+            tokens.append(self.lexer.get_next_token())
+        self.assertEqual(BaseToken(TokenType.T_EOT), tokens[-1])
+        self.assertIsNone(self.lexer.get_next_token())
+
+
+class MmapLexerTest(unittest.TestCase):
+    TEST_FILE = 'test_files/presentation_test.txt'
+
+    def read_all(self, lexer):
+        tokens = []
+        while lexer.next_token_exists():
+            tokens.append(lexer.get_next_token())
+        return tokens
+
+    def test_same_tokens_as_file_lexer(self):
+        expected = self.read_all(FileLexer(self.TEST_FILE))
+        predicted = self.read_all(MmapFileLexer(self.TEST_FILE))
+        self.assertEqual(expected, predicted)
+
+    def test_offset_positions_resolve_to_rows_and_columns(self):
+        expected = self.read_all(FileLexer(self.TEST_FILE))
+        predicted = self.read_all(MmapFileLexer(self.TEST_FILE))
+        for expected_token, token in zip(expected[:-1], predicted):
+            self.assertEqual(expected_token.pos_start.print_location(), token.pos_start.print_location())
+            self.assertEqual(expected_token.pos_end.print_location(), token.pos_end.print_location())
+
+    def write_test_file(self, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'test.txt')
+        with open(path, 'wb') as test_file:
+            test_file.write(content.encode('utf-8'))
+        return path
+
+    def test_crlf_line_endings(self):
+        path = self.write_test_file('int a = 1;\r\nint b = a;\r\n')
+        expected = self.read_all(FileLexer(path))
+        predicted = self.read_all(MmapFileLexer(path))
+        self.assertEqual(expected, predicted)
+        for expected_token, token in zip(expected[:-1], predicted):
+            self.assertEqual(expected_token.pos_start.print_location(), token.pos_start.print_location())
+
+    def test_columns_count_characters_after_non_ascii_text(self):
+        path = self.write_test_file('string s = "zażółć gęślą"; int a = 1;\nint b = 2;')
+        expected = self.read_all(FileLexer(path))
+        predicted = self.read_all(MmapFileLexer(path))
+        self.assertEqual(expected, predicted)
+        for expected_token, token in zip(expected[:-1], predicted):
+            self.assertEqual(expected_token.pos_start.print_location(), token.pos_start.print_location())
+            self.assertEqual(expected_token.pos_end.print_location(), token.pos_end.print_location())
+
+    def test_error_position_after_non_ascii_text(self):
+        path = self.write_test_file('string s = "zażółć"; int a = 1 €;')
+        with raising_errors(), self.assertRaises(LexerError) as error:
+            self.read_all(MmapFileLexer(path))
+        self.assertEqual('Error: unexpected character: € at: (1:31)', error.exception.describe())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,208 @@
+import unittest
+
+from interpreting.bytecode.vm import MAX_TAIL_CALL_CACHE_KEYS
+from interpreting.interpreter import Evaluator, Interpreter
+from interpreting.memoization import MISSING, mark_pure_functions, FunctionResultCache
+from parsing.parser import Parser
+from tests.test_utils import TestSource, TestLexer
+
+FIBONACCI_PROGRAM = """
+        function add(a:int, b:int)->int{
+            return a + b;
+        }
+        function fib(n:int)->int{
+            if (n < 2){
+                return n;
+            }
+            return add(fib(n - 1), fib(n - 2));
+        }
+        fib(40);
+        """
+
+
+class PurityAnalysisTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.source = TestSource()
+        self.lexer = TestLexer(self.source)
+        self.parser = Parser(self.lexer)
+
+    def parse(self, text):
+        self.source.put_text(text)
+        self.lexer.lex()
+        return self.parser.parse()
+
+    def test_functions_calling_pure_functions_are_pure(self):
+        ast = self.parse(FIBONACCI_PROGRAM)
+
+        self.assertEqual({'add', 'fib'}, mark_pure_functions(ast))
+        self.assertTrue(all(definition.is_pure for definition in ast.statements[:2]))
+
+    def test_function_defining_functions_is_impure(self):
+        ast = self.parse("""
+                function outer()->int{
+                    function inner()->int{
+                        return 1;
+                    }
+                    return inner();
+                }
+                function caller()->int{
+                    return outer();
+                }
+                """)
+
+        self.assertEqual({'inner'}, mark_pure_functions(ast))
+        self.assertFalse(ast.statements[0].is_pure)
+
+    def test_redefined_function_is_impure(self):
+        ast = self.parse("""
+                function f()->int{ return 1; }
+                function f()->int{ return 2; }
+                function g()->int{ return 3; }
+                """)
+
+        self.assertEqual({'g'}, mark_pure_functions(ast))
+
+
+class FunctionResultCacheTest(unittest.TestCase):
+    def test_least_recently_used_result_is_evicted(self):
+        cache = FunctionResultCache(max_size=2)
+        cache.put('first', 'first_result')
+        cache.put('second', 'second_result')
+        cache.results.move_to_end('first')
+        cache.put('third', 'third_result')
+
+        self.assertEqual(['first', 'third'], list(cache.results))
+
+    def test_void_results_are_cached(self):
+        cache = FunctionResultCache()
+        missing = cache.get('void')
+        cache.put('void', None)
+
+        self.assertIs(MISSING, missing)
+        self.assertIsNone(cache.get('void'))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+
+class MemoizedInterpreterTest(unittest.TestCase):
+    engine = 'visitor'
+
+    def setUp(self) -> None:
+        self.source = TestSource()
+        self.lexer = TestLexer(self.source)
+        self.parser = Parser(self.lexer)
+        self.interpreter = Interpreter(engine=self.engine, memoize=True)
+
+    def interpret(self, text):
+        self.source.put_text(text)
+        self.lexer.lex()
+        return self.interpreter.interpret(self.parser.parse())
+
+    def test_pure_function_results_are_reused(self):
+        result = self.interpret(FIBONACCI_PROGRAM)
+        statistics = self.interpreter.statistics()['function_cache']
+
+        self.assertEqual('102334155', str(result))
+        self.assertGreater(statistics['hits'], 0)
+        self.assertEqual(['add', 'fib'], statistics['pure_functions'])
+
+    def test_arguments_of_different_types_are_cached_separately(self):
+        result = self.interpret("""
+                function half(x:double)->double{
+                    return x / 2;
+                }
+                function is_same(a:double, b:double)->bool{
+                    return a == b;
+                }
+                is_same(half(1.0), half(1.0));
+                """)
+        statistics = self.interpreter.statistics()['function_cache']
+
+        self.assertEqual('true', str(result))
+        self.assertEqual(1, statistics['hits'])
+
+    def test_phys_arguments_are_cached_by_value_and_unit(self):
+        result = self.interpret("""
+                function double_it(x:phys)->phys{
+                    return x + x;
+                }
+                double_it(3.0&|m|) + double_it(3.0&|m|);
+                """)
+        statistics = self.interpreter.statistics()['function_cache']
+
+        self.assertEqual('12.0*(m^1)', str(result))
+        self.assertEqual(1, statistics['hits'])
+
+    def test_tail_called_results_are_reused(self):
+        result = self.interpret("""
+                function add(a:int, b:int)->int{
+                    return a + b;
+                }
+                function next(n:int)->int{
+                    return add(n, 1);
+                }
+                add(2, 1) + next(2);
+                """)
+        statistics = self.interpreter.statistics()['function_cache']
+
+        self.assertEqual('6', str(result))
+        self.assertEqual({'hits': 1, 'misses': 2}, {key: statistics[key] for key in ('hits', 'misses')})
+
+    def test_void_function_results_are_reused(self):
+        result = self.interpret("""
+                function check(a:int)->void{
+                    int b = a;
+                }
+                check(1);
+                check(1);
+                1;
+                """)
+        statistics = self.interpreter.statistics()['function_cache']
+
+        self.assertEqual('1', str(result))
+        self.assertEqual({'hits': 1, 'misses': 1}, {key: statistics[key] for key in ('hits', 'misses')})
+
+    def test_function_redefined_by_later_program_is_analyzed_again(self):
+        evaluator = Evaluator(engine=self.engine, memoize=True)
+        evaluator.evaluate_source('function f(a:int)->int{ return a + 1; } f(1) + f(1);')
+        result = evaluator.evaluate_source('function f(a:int)->int{ function g()->int{ return 1; } return a + g(); }'
+                                           'f(1) + f(1);')
+        statistics = evaluator.interpreter.statistics()['function_cache']
+
+        self.assertEqual(4, result.value.value)
+        self.assertEqual(['g'], statistics['pure_functions'])
+        # only the second call of the first f is a hit, the redefined f defines g on every call
+        self.assertEqual(1, statistics['hits'])
+
+    def test_memoization_is_off_by_default(self):
+        interpreter = Interpreter(engine=self.engine)
+
+        self.assertNotIn('function_cache', interpreter.statistics())
+
+
+class MemoizedClosureInterpreterTest(MemoizedInterpreterTest):
+    engine = 'closure'
+
+
+class MemoizedBytecodeInterpreterTest(MemoizedInterpreterTest):
+    engine = 'bytecode'
+
+    def test_tail_recursion_stays_linear_with_bounded_cache_keys(self):
+        result = self.interpret("""
+                function loop(n:int)->int{
+                    if (n < 1){
+                        return 0;
+                    }
+                    return loop(n - 1);
+                }
+                loop(20000) + loop(20000) + loop(19999);
+                """)
+        statistics = self.interpreter.statistics()['function_cache']
+
+        # every call of the chain is looked up once, but only the outermost keys and the innermost one are stored
+        self.assertEqual('0', str(result))
+        self.assertEqual(MAX_TAIL_CALL_CACHE_KEYS, statistics['size'])
+        self.assertEqual({'hits': 2, 'misses': 20001}, {key: statistics[key] for key in ('hits', 'misses')})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import contextlib
+import io
+import unittest
+
+from interpreting.interpreter import Interpreter
+from interpreting.optimizer import AstOptimizer
+from parsing.nodes import IntNode, DoubleNode, BoolNode, StringNode, UnitNode, PhysNode, IfNode, StatementsNode, \
+    BinaryOperationNode, WhileNode
+from parsing.parser import Parser
+from tests.test_utils import TestSource, TestLexer
+
+
+class AstOptimizerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.source = TestSource()
+        self.lexer = TestLexer(self.source)
+        self.parser = Parser(self.lexer)
+        self.optimizer = AstOptimizer()
+
+    def optimize(self, text):
+        self.source.put_text(text)
+        self.lexer.lex()
+        return self.optimizer.optimize(self.parser.parse())
+
+    def test_folding_int_operations(self):
+        ast = self.optimize('2 + 3 * 4;')
+        folded = ast.statements[0]
+
+        self.assertIsInstance(folded, IntNode)
+        self.assertEqual(14, folded.token.value)
+
+    def test_folding_mixed_number_operations(self):
+        ast = self.optimize('7 / 2 + 0.5;')
+        folded = ast.statements[0]
+
+        self.assertIsInstance(folded, DoubleNode)
+        self.assertEqual(3.5, folded.token.value)
+
+    def test_folding_unary_operations(self):
+        ast = self.optimize('-(2 + 3); not (1 < 2);')
+        negated, negation = ast.statements
+
+        self.assertIsInstance(negated, IntNode)
+        self.assertEqual(-5, negated.token.value)
+        self.assertIsInstance(negation, BoolNode)
+        self.assertEqual('false', str(negation))
+
+    def test_folding_string_operations(self):
+        ast = self.optimize('"ab" * 3 + "c";')
+        folded = ast.statements[0]
+
+        self.assertIsInstance(folded, StringNode)
+        self.assertEqual('abababc', folded.token.value)
+
+    def test_folding_phys_value(self):
+        ast = self.optimize('3.5&|m/s| * 2.0&|s|;')
+        folded = ast.statements[0]
+
+        self.assertIsInstance(folded, PhysNode)
+        self.assertEqual(7.0, folded.value.token.value)
+        self.assertIsInstance(folded.unit, UnitNode)
+        self.assertEqual({'m': 1}, dict(folded.unit.fraction))
+
+    def test_folded_node_keeps_position(self):
+        ast = self.optimize('int x = 1; x = (2 + 3) * 4;')
+        assignment = ast.statements[1]
+
+        self.assertIsInstance(assignment.value, IntNode)
+        self.assertEqual(16, assignment.value.pos_start.column)
+        self.assertEqual(26, assignment.value.pos_end.column)
+
+    def test_division_by_zero_is_not_folded(self):
+        ast = self.optimize('1 / (2 - 2);')
+        division = ast.statements[0]
+
+        self.assertIsInstance(division, BinaryOperationNode)
+        self.assertIsInstance(division.right, IntNode)
+
+    def test_variables_are_not_folded(self):
+        ast = self.optimize('int x = 1; x + 2 * 3;')
+        addition = ast.statements[1]
+
+        self.assertIsInstance(addition, BinaryOperationNode)
+        self.assertIsInstance(addition.right, IntNode)
+
+    def test_true_condition_replaces_if(self):
+        ast = self.optimize('int x = 1; if (1 < 2) { x = 2; } else { x = 3; }')
+        body = ast.statements[1]
+
+        self.assertIsInstance(body, StatementsNode)
+        self.assertEqual(2, body.statements[0].value.token.value)
+
+    def test_false_cases_are_removed(self):
+        ast = self.optimize('int x = 1; if (false) { x = 2; } elseif (x > 0) { x = 3; } elseif (true) { x = 4; }'
+                            'else { x = 5; }')
+        if_node = ast.statements[1]
+
+        self.assertIsInstance(if_node, IfNode)
+        self.assertEqual(1, len(if_node.cases))
+        self.assertEqual(4, if_node.else_case.statements[0].value.token.value)
+
+    def test_all_cases_false_without_else(self):
+        ast = self.optimize('int x = 1; if (false) { x = 2; }')
+
+        self.assertIsInstance(ast.statements[1], StatementsNode)
+        self.assertEqual([], ast.statements[1].statements)
+
+    def test_folding_inside_while_body(self):
+        ast = self.optimize('double x = 0.0; while (x < 10) { x = x + 2 * 0.5; }')
+        loop = ast.statements[1]
+
+        self.assertIsInstance(loop, WhileNode)
+        self.assertIsInstance(loop.body_node.statements[0].value.right, DoubleNode)
+
+
+class OptimizedInterpreterTest(unittest.TestCase):
+    engine = 'visitor'
+
+    def setUp(self) -> None:
+        self.source = TestSource()
+        self.lexer = TestLexer(self.source)
+        self.parser = Parser(self.lexer)
+        self.interpreter = Interpreter(engine=self.engine)
+
+    def interpret(self, text):
+        self.source.put_text(text)
+        self.lexer.lex()
+        return self.interpreter.interpret(AstOptimizer().optimize(self.parser.parse()))
+
+    def test_pruned_if_in_function(self):
+        statement = """
+                function pick(a:int)->int{
+                    if (false){
+                        return 0;
+                    }
+                    elseif (true){
+                        return a * (2 + 1);
+                    }
+                    return 1;
+                }
+                pick(3);
+                """
+        result = self.interpret(statement)
+
+        self.assertEqual('9', str(result))
+
+    def test_if_without_remaining_cases(self):
+        result = self.interpret('int x = 1; if (false) { x = 2; } x;')
+
+        self.assertEqual('1', str(result))
+
+    def test_division_by_zero_position(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertRaises(SystemExit):
+            self.interpret('int x = 1; x = x / (2 - 2);')
+
+        self.assertIn('Error: Division by zero. at: (1:20)', output.getvalue())
+
+
+class OptimizedClosureInterpreterTest(OptimizedInterpreterTest):
+    engine = 'closure'
+
+
+class OptimizedBytecodeInterpreterTest(OptimizedInterpreterTest):
+    engine = 'bytecode'
+
+
+if __name__ == '__main__':
+    unittest.main()
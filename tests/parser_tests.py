@@ -39,6 +39,14 @@ class ParserTest(unittest.TestCase):
         result = self.parse('3&|m/s|;')
         self.assertEqual('((Phys: int value:3*(Unit:m^1s^-1)))', str(result))
 
+    def test_parsing_phys_array_value(self):
+        result = self.parse('[1, 2.5]&|m|;')
+        self.assertEqual('((PhysArray: [int value:1, double value:2.5]*(Unit:m^1)))', str(result))
+
+    def test_parsing_empty_phys_array_value(self):
+        result = self.parse('[]&|m/s|;')
+        self.assertEqual('((PhysArray: []*(Unit:m^1s^-1)))', str(result))
+
     def test_parsing_unit_value(self):
         result = self.parse('|m*m/s*n*x|;')
         self.assertEqual('((Unit:m^2s^-1n^-1x^-1))', str(result))
@@ -86,6 +94,10 @@ class ParserTest(unittest.TestCase):
         result = self.parse('phys v = 3&|m/s|;')
         self.assertEqual('((Assignment: phys identifier:v=(Phys: int value:3*(Unit:m^1s^-1))))', str(result))
 
+    def test_parsing_type_phys_array(self):
+        result = self.parse('phys[] v = [3]&|m|;')
+        self.assertEqual('((Assignment: phys[] identifier:v=(PhysArray: [int value:3]*(Unit:m^1))))', str(result))
+
     def test_parsing_type_unit(self):
         result = self.parse('unit u = |a*s*x/c|;')
         self.assertEqual('((Assignment: unit identifier:u=(Unit:a^1s^1x^1c^-1)))', str(result))
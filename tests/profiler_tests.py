@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from interpreting.interpreter import Interpreter
+from interpreting.profiler import ProfilingVisitator
+from lexer.lexer import StringLexer
+from parsing.parser import Parser
+
+LOOP_PROGRAM = """int i = 0;
+while (i < 10) {
+    i = i + 1;
+}
+i;"""
+
+FIBONACCI_PROGRAM = """function fib(n:int)->int{
+    if (n < 2){
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+fib(10);"""
+
+
+class ProfilingVisitatorTest(unittest.TestCase):
+    @staticmethod
+    def profile(text):
+        interpreter = Interpreter(profile=True)
+        result = interpreter.interpret(Parser(StringLexer(text)).parse())
+        return result, interpreter.engine.profile
+
+    def test_profile_selects_profiling_visitator(self):
+        self.assertIsInstance(Interpreter(profile=True).engine, ProfilingVisitator)
+        self.assertNotIsInstance(Interpreter().engine, ProfilingVisitator)
+
+    def test_profile_with_other_engine_fails(self):
+        for engine in ('closure', 'bytecode'):
+            with self.assertRaises(ValueError) as error:
+                Interpreter(engine=engine, profile=True)
+
+            self.assertEqual(f'Profiling is only supported by the visitor engine, not {engine}.',
+                             str(error.exception))
+
+    def test_node_visits_are_counted_per_line(self):
+        result, profile = self.profile(LOOP_PROGRAM)
+
+        self.assertEqual(10, result.value)
+        # while node, then the comparison and its operands for every evaluation of the condition
+        self.assertEqual(1 + 11 * 3, profile.lines[2].calls)
+        # assignment, addition and its two operands per iteration
+        self.assertEqual(10 * 4, profile.lines[3].calls)
+        self.assertEqual({1, 2, 3, 5}, set(profile.lines))
+
+    def test_cumulative_time_is_not_counted_twice_for_nested_nodes(self):
+        _, profile = self.profile(LOOP_PROGRAM)
+
+        while_line, body_line = profile.lines[2], profile.lines[3]
+        self.assertGreaterEqual(while_line.cumulative_time, body_line.cumulative_time)
+        self.assertLessEqual(body_line.self_time, body_line.cumulative_time + 1e-9)
+
+    def test_recursive_function_calls_are_counted(self):
+        result, profile = self.profile(FIBONACCI_PROGRAM)
+
+        self.assertEqual(55, result.value)
+        fib = profile.functions['fib']
+        self.assertEqual(177, fib.calls)
+        self.assertEqual(0, fib.active)
+        self.assertLessEqual(fib.self_time, fib.cumulative_time + 1e-9)
+
+    def test_report_shows_lines_functions_and_nodes(self):
+        _, profile = self.profile(FIBONACCI_PROGRAM)
+
+        report = profile.format_report(FIBONACCI_PROGRAM.splitlines())
+
+        self.assertIn('return fib(n - 1) + fib(n - 2);', report)
+        self.assertIn('fib                         177', report)
+        self.assertIn('CallFunctionNode (5:11)', report)
+
+    def test_collapsed_stacks_are_written(self):
+        _, profile = self.profile(FIBONACCI_PROGRAM)
+
+        with tempfile.TemporaryDirectory() as directory:
+            stacks_path = os.path.join(directory, 'stacks.txt')
+            profile.write_collapsed_stacks(stacks_path)
+            with open(stacks_path) as stacks_file:
+                stacks = dict(line.rsplit(' ', 1) for line in stacks_file.read().splitlines())
+
+        self.assertIn('<main>;line 7', stacks)
+        self.assertIn('<main>;fib;fib;line 5', stacks)
+        self.assertTrue(all(int(microseconds) > 0 for microseconds in stacks.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
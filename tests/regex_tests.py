@@ -1,6 +1,6 @@
 import re
 import unittest
-from lexer.regex2token import regex2token
+from lexer.regex2token import regex2token, classify_identifier
 from lexer.token.tokens import BaseToken, ValueToken
 from lexer.token.token_type import TokenType
 
@@ -30,6 +30,8 @@ class TestRegex(unittest.TestCase):
             if match:
                 token_type = self.regex2token_compiled[regex]
                 value = match.group(0)
+                if token_type == TokenType.VT_ID:
+                    token_type = classify_identifier(value)
                 return token_type, value
         return None
 
@@ -279,6 +281,18 @@ class TestRegex(unittest.TestCase):
         expected = BaseToken(TokenType.T_UNIT)
         self.assertEqual(expected, token)
 
+    def test_eot(self):
+        line = "DONE"
+        token = self.find_token(line)
+        expected = BaseToken(TokenType.T_EOT)
+        self.assertEqual(expected, token)
+
+    def test_id_starting_with_keyword(self):
+        line = "integer"
+        token = self.find_token(line)
+        expected = ValueToken(TokenType.VT_ID, "integer")
+        self.assertEqual(expected, token)
+
     def test_unit_value(self):
         line = "|m/s*s|"
         token = self.find_token(line)
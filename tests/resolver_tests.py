@@ -0,0 +1,75 @@
+import unittest
+
+from errors.error import RunTimeError
+from interpreting.resolver import Resolver
+from parsing.parser import Parser
+from tests.test_utils import TestSource, TestLexer
+
+
+class ResolverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.source = TestSource()
+        self.lexer = TestLexer(self.source)
+        self.parser = Parser(self.lexer)
+        self.resolver = Resolver()
+
+    def resolve(self, text):
+        self.source.put_text(text)
+        self.lexer.lex()
+        return self.resolver.resolve(self.parser.parse())
+
+    def test_slots_in_order_of_declaration(self):
+        ast = self.resolve('int x = 1; double y = 2.0; x = x + 1;')
+        assignment_x, assignment_y, reassignment_x = ast.statements
+
+        self.assertEqual(2, ast.frame_size)
+        self.assertEqual(0, assignment_x.slot)
+        self.assertEqual(1, assignment_y.slot)
+        self.assertEqual(0, reassignment_x.slot)
+        self.assertEqual(0, reassignment_x.value.left.slot)
+
+    def test_function_has_own_frame(self):
+        ast = self.resolve('int x = 1; function f(a:int, b:int)->int{ int c = a + b; return c; }')
+        function = ast.statements[1]
+
+        self.assertEqual(1, ast.frame_size)
+        self.assertEqual(3, function.frame_size)
+        self.assertEqual([0, 1], [argument.slot for argument in function.arguments])
+
+    def test_numeric_slots_are_unboxed(self):
+        ast = self.resolve('int x = 1; double y = 2.0; string z = "a"; function f(a:int, b:phys)->int{ return a; }')
+        function = ast.statements[3]
+
+        self.assertEqual({0: 'int', 1: 'double'}, ast.slot_types)
+        self.assertEqual({0: 'int'}, function.slot_types)
+
+    def test_slot_declared_with_different_types_stays_boxed(self):
+        ast = self.resolve('int x = 1; double x = 2.0;')
+
+        self.assertEqual({}, ast.slot_types)
+
+    def test_matching_types_skip_runtime_check(self):
+        ast = self.resolve('int x = 1; x = x * 2;')
+
+        self.assertEqual([False, False], [statement.check_type for statement in ast.statements])
+
+    def test_unknown_types_keep_runtime_check(self):
+        ast = self.resolve('function f(a:int)->int{ return a; } int x = f(1); int y = g(2);')
+
+        self.assertEqual([False, True], [statement.check_type for statement in ast.statements[1:]])
+
+    def test_wrong_declared_type_is_reported(self):
+        with self.assertRaises(RunTimeError) as error:
+            self.resolve('int x = "text";')
+
+        self.assertEqual('Expected type: int got string instead.', error.exception.message)
+
+    def test_wrong_reassigned_type_is_reported(self):
+        with self.assertRaises(RunTimeError) as error:
+            self.resolve('int x = 1; x = 2.5;')
+
+        self.assertEqual('Tried to put a value of type double to a variable of type int', error.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import io
+import json
+import unittest
+
+from interpreting.interpreter import Evaluator
+from interpreting.server import EvaluationServer
+
+
+class EvaluationServerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = EvaluationServer(Evaluator(memory_cache_size=8))
+
+    def serve(self, *requests):
+        output = io.StringIO()
+        self.server.serve([json.dumps(request) if isinstance(request, dict) else request for request in requests],
+                          output.write)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_responses_keep_request_ids(self):
+        responses = self.serve({'id': 7, 'source': 'int a = 2; a * 3;'}, {'id': 'x', 'source': '1.5;'})
+
+        self.assertEqual([{'id': 7, 'ok': True, 'value': '6', 'type': 'int'},
+                          {'id': 'x', 'ok': True, 'value': '1.5', 'type': 'double'}], responses)
+
+    def test_program_error_does_not_stop_serving(self):
+        responses = self.serve({'id': 1, 'source': 'int a = 1 / 0;'}, {'id': 2, 'source': 'a;'},
+                               {'id': 3, 'source': '2;'})
+
+        self.assertEqual('Division by zero.', responses[0]['error']['message'])
+        self.assertEqual('a not defined.', responses[1]['error']['message'])
+        self.assertEqual('2', responses[2]['value'])
+
+    def test_invalid_requests_are_answered(self):
+        responses = self.serve('not json', {'id': 1}, {'id': 2, 'file_path': 'does/not/exist.txt'})
+
+        self.assertEqual(['request', 'request', 'internal'], [response['error']['kind'] for response in responses])
+        self.assertEqual([None, 1, 2], [response['id'] for response in responses])
+
+    def test_repeated_source_is_parsed_once(self):
+        self.serve({'id': 1, 'source': 'int a = 2; a;'}, {'id': 2, 'source': 'int a = 2; a;'})
+
+        self.assertEqual(1, len(self.server.evaluator.ast_cache.entries))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-from lexer.source import FileSource
+from lexer.source import FileSource, MmapSource, StringSource
 
 import unittest
 
@@ -24,6 +24,18 @@ class TestSource(unittest.TestCase):
         file_source.read_line()
         self.assertEqual(True, file_source.is_end_of_text(), msg='Error when checking EOF')
 
+    def test_mmap_source_line_index(self):
+        mmap_source = MmapSource(TEST_SOURCE_2_LINES)
+        self.assertEqual((1, 0), mmap_source.line_index.to_row_column(0))
+        self.assertEqual((2, 4), mmap_source.line_index.to_row_column(15))
+
+    def test_string_source(self):
+        string_source = StringSource("test text1\ntest text2")
+        self.assertEqual("test text1\n", string_source.read_line(), msg='Error in first line.')
+        self.assertEqual("test text2", string_source.read_line(), msg='Error in second line.')
+        string_source.read_line()
+        self.assertEqual(True, string_source.is_end_of_text(), msg='Error when checking EOF')
+
 
 if __name__ == '__main__':
     unittest.main()
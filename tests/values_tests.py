@@ -0,0 +1,178 @@
+import pickle
+import unittest
+
+from errors.error import OperationError
+from interpreting.values.basic_values import IntValue, DoubleValue, StringValue, BoolValue, TRUE, FALSE, int_value, \
+    SMALL_INT_MAX
+from interpreting.values.physical_values import UnitValue, PhysValue, UnitOperationCache, PhysArrayValue, numpy
+
+
+class ValuesTest(unittest.TestCase):
+    def test_values_have_no_instance_dict(self):
+        for value in (IntValue(1), DoubleValue(1.0), StringValue('a'), BoolValue(True), UnitValue({'m': 1}),
+                      PhysValue(IntValue(1), UnitValue({'m': 1}))):
+            self.assertFalse(hasattr(value, '__dict__'), type(value).__name__)
+
+    def test_operations_return_new_values(self):
+        left = IntValue(2)
+        right = DoubleValue(0.5)
+        result = left.multiply(right)
+
+        self.assertEqual(1.0, result.value)
+        self.assertEqual(2, left.value)
+        self.assertEqual(0.5, right.value)
+
+    def test_undefined_operation_is_reported_on_left_operand(self):
+        with self.assertRaises(OperationError) as error:
+            StringValue('a').subtract(IntValue(1))
+
+        self.assertEqual('- not defined for type string and int', error.exception.message)
+        self.assertFalse(error.exception.on_right)
+
+    def test_division_by_zero_is_reported_on_right_operand(self):
+        for divisor in (IntValue(0), DoubleValue(0.0)):
+            with self.assertRaises(OperationError) as error:
+                IntValue(1).divide(divisor)
+
+            self.assertEqual('Division by zero.', error.exception.message)
+            self.assertTrue(error.exception.on_right)
+
+    def test_comparisons_return_shared_booleans(self):
+        self.assertIs(TRUE, IntValue(1).is_less_than(DoubleValue(1.5)))
+        self.assertIs(FALSE, StringValue('a').is_equal(StringValue('b')))
+        self.assertIs(TRUE, FALSE.not_())
+
+    def test_small_int_results_are_shared(self):
+        self.assertIs(int_value(3), IntValue(1).add(IntValue(2)))
+        self.assertIs(int_value(-256), IntValue(-128).multiply(IntValue(2)))
+
+    def test_large_int_results_are_not_cached(self):
+        result = IntValue(SMALL_INT_MAX).add(IntValue(1))
+
+        self.assertEqual(SMALL_INT_MAX + 1, result.value)
+        self.assertIsNot(result, int_value(SMALL_INT_MAX + 1))
+
+    def test_shared_values_cannot_be_changed(self):
+        for value in (TRUE, int_value(1), PhysValue(IntValue(1), UnitValue({'m': 1}))):
+            with self.assertRaises(AttributeError):
+                value.value = 2
+        with self.assertRaises(AttributeError):
+            del TRUE.value
+
+        self.assertIs(TRUE, IntValue(1).is_equal(IntValue(1)))
+        self.assertEqual(1, int_value(1).value)
+
+    def test_values_survive_pickling(self):
+        speed = PhysValue(DoubleValue(2.5), UnitValue({'m': 1, 's': -1}))
+        copy = pickle.loads(pickle.dumps(speed))
+
+        self.assertEqual('2.5*(m^1/s^1)', str(copy))
+        self.assertIs(speed.unit, copy.unit)
+        self.assertIs(TRUE, pickle.loads(pickle.dumps(TRUE)))
+        self.assertEqual(7, pickle.loads(pickle.dumps(IntValue(7))).value)
+
+    def test_unit_is_reduced(self):
+        unit = UnitValue({'m': 1, 's': 1}).divide(UnitValue({'s': 1}))
+
+        self.assertEqual((('m', 1),), unit.value)
+
+    def test_equal_units_are_the_same_object(self):
+        speed = UnitValue({'s': -1, 'm': 1})
+
+        self.assertIs(speed, UnitValue({'m': 1}).divide(UnitValue({'s': 1})))
+        self.assertIs(speed, pickle.loads(pickle.dumps(speed)))
+        self.assertIs(TRUE, speed.is_equal(UnitValue([('m', 1), ('s', -1)])))
+
+    def test_unit_multiplication_merges_exponents(self):
+        force = UnitValue({'kg': 1, 'm': 1, 's': -2})
+
+        self.assertEqual((('kg', 1), ('m', 2), ('s', -2)), force.multiply(UnitValue({'m': 1})).value)
+        self.assertEqual('(1/s^2)', str(force.divide(UnitValue({'kg': 1, 'm': 1}))))
+
+    def test_comparing_phys_with_number_fails(self):
+        distance = PhysValue(IntValue(3), UnitValue({'m': 1}))
+        for compare, operator in ((distance.is_equal, '=='), (distance.is_not_equal, '!=')):
+            with self.assertRaises(OperationError) as error:
+                compare(IntValue(3))
+
+            self.assertEqual(f'{operator} not defined for type phys and int', error.exception.message)
+
+    def test_adding_phys_with_different_units_fails(self):
+        with self.assertRaises(OperationError):
+            PhysValue(IntValue(1), UnitValue({'m': 1})).add(PhysValue(IntValue(1), UnitValue({'s': 1})))
+
+
+class UnitOperationCacheTest(unittest.TestCase):
+    def test_hit_rate_is_reported(self):
+        cache = UnitOperationCache()
+        unit = UnitValue({'m': 1})
+        cache.put(('*', unit, unit), UnitValue({'m': 2}))
+
+        self.assertIs(UnitValue({'m': 2}), cache.get(('*', unit, unit)))
+        self.assertIsNone(cache.get(('/', unit, unit)))
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1, 'hit_rate': 0.5}, cache.statistics())
+
+    def test_least_recently_used_result_is_evicted(self):
+        cache = UnitOperationCache(max_size=2)
+        cache.put('a', '(a^1)')
+        cache.put('b', '(b^1)')
+        cache.get('a')
+        cache.put('c', '(c^1)')
+
+        self.assertEqual('(a^1)', cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class PhysArrayValueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metres = UnitValue({'m': 1})
+        self.distances = PhysArrayValue.from_values([IntValue(1), DoubleValue(2.5)], self.metres)
+
+    def test_elements_are_stored_as_float64(self):
+        self.assertEqual(numpy.float64, self.distances.value.dtype)
+        self.assertEqual('[1.0, 2.5]*(m^1)', str(self.distances))
+
+    def test_phys_on_left_side_is_broadcast(self):
+        result = PhysValue(IntValue(4), UnitValue({'m': 2})).divide(self.distances)
+
+        self.assertEqual('[4.0, 1.6]*(m^1)', str(result))
+
+    def test_number_on_left_side_scales_the_series(self):
+        self.assertEqual('[2.0, 5.0]*(m^1)', str(IntValue(2).multiply(self.distances)))
+        self.assertEqual('[0.5, 1.25]*(m^1)', str(DoubleValue(0.5).multiply(self.distances)))
+
+    def test_number_on_left_side_of_unsupported_operand_keeps_error_order(self):
+        with self.assertRaises(OperationError) as error:
+            IntValue(2).multiply(TRUE)
+
+        self.assertEqual('* not defined for type int and bool', error.exception.message)
+
+    def test_elements_cannot_be_changed(self):
+        with self.assertRaises(ValueError):
+            self.distances.value[0] = 3.0
+
+        self.assertEqual('[1.0, 2.5]*(m^1)', str(pickle.loads(pickle.dumps(self.distances))))
+
+    def test_equality_with_different_length_is_false(self):
+        longer = PhysArrayValue.from_values([IntValue(1), DoubleValue(2.5), IntValue(3)], self.metres)
+
+        self.assertIs(FALSE, self.distances.is_equal(longer))
+        self.assertIs(TRUE, self.distances.is_equal(self.distances.multiply(IntValue(1))))
+
+    def test_division_by_zero_element_is_reported_on_right_operand(self):
+        divisor = PhysArrayValue.from_values([IntValue(1), IntValue(0)], self.metres)
+
+        with self.assertRaises(OperationError) as error:
+            self.distances.divide(divisor)
+
+        self.assertEqual('Division by zero.', error.exception.message)
+        self.assertTrue(error.exception.on_right)
+
+    def test_non_numeric_element_fails(self):
+        with self.assertRaises(OperationError):
+            PhysArrayValue.from_values([StringValue('a')], self.metres)
+
+
+if __name__ == '__main__':
+    unittest.main()